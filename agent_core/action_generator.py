@@ -5,8 +5,10 @@ from typing import List, Tuple, FrozenSet, Optional, Set
 from dependency_resolver_agent.data_models.requirement import Requirement, Version, PACKAGING_AVAILABLE, SpecifierSet, InvalidVersion, InvalidSpecifier
 from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
 from dependency_resolver_agent.tooling.pypi_service import PyPIService
-from dependency_resolver_agent.utils.logger import log_verbose
-from dependency_resolver_agent.agent_core.state_manager import AStarNode
+from dependency_resolver_agent.utils.logger import get_logger, lazy
+from dependency_resolver_agent.agent_core.state_manager import AStarNode, RequirementState
+
+log = get_logger(__name__)
 
 
 class ActionGenerator:
@@ -32,7 +34,7 @@ class ActionGenerator:
                         return base_cost + 0.25 # Smaller changes (epoch, pre/post release)
                 # Changing from non-exact to exact
                 elif not req_before.is_exact() and req_after.is_exact() and req_before.specifier:
-                    old_spec_set = SpecifierSet(req_before.specifier)
+                    old_spec_set = req_before.get_specifier_set()
                     new_version = req_after.get_version_obj()
                     if new_version and new_version in old_spec_set:
                         return base_cost + 0.1 # Low cost for pinning within allowed range
@@ -58,9 +60,10 @@ class ActionGenerator:
         current_node: AStarNode,
         original_direct_reqs: FrozenSet[Requirement], # Names of original requirements
         conflict_info: ConflictInfo
-        ) -> List[Tuple[FrozenSet[Requirement], str, float]]:
+        ) -> List[Tuple[RequirementState, str, float]]:
 
-        neighbors: List[Tuple[FrozenSet[Requirement], str, float]] = []
+        neighbors: List[Tuple[RequirementState, str, float]] = []
+        current_state = current_node.state
         current_reqs_map = {r.name: r for r in current_node.requirements}
 
         # Determine which packages to focus modifications on
@@ -73,24 +76,24 @@ class ActionGenerator:
             pkgs_to_target_for_modification_names = {
                 r.name for r in current_node.requirements if r.name in original_direct_req_names
             }
-            log_verbose("    [Neighbors] Conflict, but no specific pkgs. Targeting all current original direct dependencies.")
+            log.debug("    [Neighbors] Conflict, but no specific pkgs. Targeting all current original direct dependencies.")
         elif not conflict_info.is_conflict: # Should not happen if called correctly
-            log_verbose("    [Neighbors] No conflict, no neighbors generated via modification.")
+            log.debug("    [Neighbors] No conflict, no neighbors generated via modification.")
             return []
 
 
-        log_verbose(f"    [Neighbors] Packages targeted for modification based on conflict: {pkgs_to_target_for_modification_names or 'None'}")
+        log.debug("    [Neighbors] Packages targeted for modification based on conflict: %s", pkgs_to_target_for_modification_names or 'None')
 
         # Strategy 1: Change version of a direct dependency
-        for pkg_name_to_modify in pkgs_to_target_for_modification_names:
+        for pkg_name_to_modify in sorted(pkgs_to_target_for_modification_names):
             current_req_obj = current_reqs_map.get(pkg_name_to_modify)
             if not current_req_obj:
-                log_verbose(f"    [Neighbors] Warning: Targeted package '{pkg_name_to_modify}' not in current node's requirements. Skipping version change for it.")
+                log.debug("    [Neighbors] Warning: Targeted package '%s' not in current node's requirements. Skipping version change for it.", pkg_name_to_modify)
                 continue
 
-            log_verbose(f"      [Neighbors] Considering version changes for '{pkg_name_to_modify}' (current: {current_req_obj.specifier})")
+            log.debug("      [Neighbors] Considering version changes for '%s' (current: %s)", pkg_name_to_modify, current_req_obj.specifier)
             versions_to_try = self.pypi_service.get_versions_to_try(pkg_name_to_modify, current_req_obj)
-            log_verbose(f"        [Neighbors] Versions to try for '{pkg_name_to_modify}': {versions_to_try[:5]}{'...' if len(versions_to_try)>5 else ''}")
+            log.debug("        [Neighbors] Versions to try for '%s': %s%s", pkg_name_to_modify, versions_to_try[:5], '...' if len(versions_to_try) > 5 else '')
 
             for v_str_to_try in versions_to_try:
                 new_spec = f"=={v_str_to_try}"
@@ -98,19 +101,16 @@ class ActionGenerator:
                     continue
 
                 new_req_for_pkg = Requirement(name=pkg_name_to_modify, specifier=new_spec)
-                
-                temp_new_reqs_list = [r for r in current_node.requirements if r.name != pkg_name_to_modify]
-                temp_new_reqs_list.append(new_req_for_pkg)
-                new_requirements_set = frozenset(temp_new_reqs_list)
+                new_requirements_set = current_state.replace(current_req_obj, new_req_for_pkg) # O(1), materialised lazily
 
                 action_desc = f"Changed {pkg_name_to_modify} from '{current_req_obj.specifier}' to '{new_spec}'"
                 action_cost = self.get_cost_of_action(action_desc, current_req_obj, new_req_for_pkg)
                 neighbors.append((new_requirements_set, action_desc, action_cost))
-                log_verbose(f"          [Neighbors] Generated (Version Change): {action_desc}, cost={action_cost:.2f}")
+                log.debug("          [Neighbors] Generated (Version Change): %s, cost=%.2f", action_desc, action_cost)
 
         # Strategy 2: Loosen constraint (e.g., from ==X.Y.Z to ~=X.Y)
         if PACKAGING_AVAILABLE: # This strategy relies heavily on 'packaging'
-            for pkg_name_to_loosen in pkgs_to_target_for_modification_names:
+            for pkg_name_to_loosen in sorted(pkgs_to_target_for_modification_names):
                 current_req_obj = current_reqs_map.get(pkg_name_to_loosen)
                 if not current_req_obj or not current_req_obj.is_exact():
                     continue # Only loosen exact constraints
@@ -131,47 +131,44 @@ class ActionGenerator:
                 # The main guard is `current_req_obj.is_exact()`
 
                 loosened_req = Requirement(name=pkg_name_to_loosen, specifier=new_loose_spec)
-                
-                temp_new_reqs_list = [r for r in current_node.requirements if r.name != pkg_name_to_loosen]
-                temp_new_reqs_list.append(loosened_req)
-                new_requirements_set = frozenset(temp_new_reqs_list)
+                new_requirements_set = current_state.replace(current_req_obj, loosened_req)
 
                 action_desc = f"Loosened {pkg_name_to_loosen} from '{current_req_obj.specifier}' to '{new_loose_spec}'"
                 action_cost = self.get_cost_of_action(action_desc, current_req_obj, loosened_req)
                 neighbors.append((new_requirements_set, action_desc, action_cost))
-                log_verbose(f"          [Neighbors] Generated (Loosen): {action_desc}, cost={action_cost:.2f}")
+                log.debug("          [Neighbors] Generated (Loosen): %s, cost=%.2f", action_desc, action_cost)
 
         # Strategy 3: Pin problematic transitive dependency
         if conflict_info.sub_dependency_culprit:
             sub_dep_name, sub_dep_spec_hint = conflict_info.sub_dependency_culprit
-            log_verbose(f"      [Neighbors] Considering pinning transitive dependency '{sub_dep_name}' (hint: '{sub_dep_spec_hint}')")
+            log.debug("      [Neighbors] Considering pinning transitive dependency '%s' (hint: '%s')", sub_dep_name, sub_dep_spec_hint)
             
             # Check if this sub_dep is already a direct requirement (pinned)
             if sub_dep_name in current_reqs_map:
-                log_verbose(f"        [Neighbors] Transitive dependency '{sub_dep_name}' is already a direct requirement. Skipping re-pinning for now.")
+                log.debug("        [Neighbors] Transitive dependency '%s' is already a direct requirement. Skipping re-pinning for now.", sub_dep_name)
             else:
                 versions_to_try_for_subdep = self.pypi_service.get_versions_to_try(
                     sub_dep_name,
                     sub_dep_specifier_hint=sub_dep_spec_hint # Pass hint to pypi_service
                 )
-                log_verbose(f"        [Neighbors] Versions to try for pinning '{sub_dep_name}': {versions_to_try_for_subdep[:3]}{'...' if len(versions_to_try_for_subdep)>3 else ''}")
+                log.debug("        [Neighbors] Versions to try for pinning '%s': %s%s", sub_dep_name, versions_to_try_for_subdep[:3], '...' if len(versions_to_try_for_subdep) > 3 else '')
 
                 for v_str_pin in versions_to_try_for_subdep[:2]: # Try pinning to a couple of top suggested versions
                     pinned_spec = f"=={v_str_pin}"
                     pinned_req = Requirement(name=sub_dep_name, specifier=pinned_spec)
                     
-                    new_requirements_set = frozenset(list(current_node.requirements) + [pinned_req])
+                    new_requirements_set = current_state.replace(None, pinned_req)
 
                     action_desc = f"Pinned transitive {sub_dep_name} to '{pinned_spec}'"
                     # req_before is None as we are adding a new req, req_after is the new pinned_req
                     action_cost = self.get_cost_of_action(action_desc, None, pinned_req)
                     neighbors.append((new_requirements_set, action_desc, action_cost))
-                    log_verbose(f"          [Neighbors] Generated (Pin Transitive): {action_desc}, cost={action_cost:.2f}")
+                    log.debug("          [Neighbors] Generated (Pin Transitive): %s, cost=%.2f", action_desc, action_cost)
 
         # Strategy 4: Remove a direct dependency (as a last resort)
         # Only remove dependencies that were part of the original set and are implicated
         original_direct_req_names = {r.name for r in original_direct_reqs}
-        for pkg_name_to_remove in pkgs_to_target_for_modification_names:
+        for pkg_name_to_remove in sorted(pkgs_to_target_for_modification_names):
             if pkg_name_to_remove not in original_direct_req_names:
                 continue # Don't remove something that was pinned transitively earlier
 
@@ -179,24 +176,24 @@ class ActionGenerator:
             if not current_req_obj:
                 continue # Should not happen
 
-            log_verbose(f"      [Neighbors] Considering removing direct dependency '{pkg_name_to_remove}'")
+            log.debug("      [Neighbors] Considering removing direct dependency '%s'", pkg_name_to_remove)
             
-            new_requirements_set = frozenset([r for r in current_node.requirements if r.name != pkg_name_to_remove])
+            new_requirements_set = current_state.replace(current_req_obj, None)
             
             # Ensure we don't generate an empty set of requirements if we remove the last one
-            if not new_requirements_set and len(current_node.requirements) == 1:
-                log_verbose(f"        [Neighbors] Skipping removal of '{pkg_name_to_remove}' as it's the last requirement.")
+            if not len(new_requirements_set) and len(current_state) == 1:
+                log.debug("        [Neighbors] Skipping removal of '%s' as it's the last requirement.", pkg_name_to_remove)
                 continue
 
             action_desc = f"Removed direct {pkg_name_to_remove}"
             # req_before is the removed one, req_after is None
             action_cost = self.get_cost_of_action(action_desc, current_req_obj, None)
             neighbors.append((new_requirements_set, action_desc, action_cost))
-            log_verbose(f"          [Neighbors] Generated (Remove Direct): {action_desc}, cost={action_cost:.2f}")
+            log.debug("          [Neighbors] Generated (Remove Direct): %s, cost=%.2f", action_desc, action_cost)
 
 
         if not neighbors and conflict_info.is_conflict:
-            log_verbose(f"    [Neighbors] WARNING: No neighbors generated for conflicting node with reqs: {self._reqs_to_str_summary(current_node.requirements)}")
+            log.debug("    [Neighbors] WARNING: No neighbors generated for conflicting node with reqs: %s", lazy(self._reqs_to_str_summary, current_node.requirements))
         return neighbors
 
     def _reqs_to_str_summary(self, reqs: FrozenSet[Requirement], limit: int = 3) -> str:
@@ -0,0 +1,124 @@
+# dependency_resolver_agent/agent_core/feasibility_checker.py
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from dependency_resolver_agent.data_models.requirement import Requirement, SpecifierSet, Version, InvalidSpecifier, InvalidVersion, PACKAGING_AVAILABLE
+from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
+from dependency_resolver_agent.tooling.pypi_service import PyPIService
+
+PRECHECK_NOTE = "(Reported by the local metadata pre-check; pip-compile was not run.)"
+
+
+class FeasibilityChecker:
+    """
+    Cheap in-process check of a requirement set against local package metadata, run before pip-compile.
+    It only looks at exact pins, their unconditional Requires-Dist, and the first level of transitive
+    dependencies, and it reports a conflict only when the metadata proves one:
+      - a requirement no known release satisfies
+      - a pinned release whose Requires-Dist excludes another requirement of the set
+      - two pinned releases whose constraints on the same transitive dependency leave no known release
+    Anything it cannot decide (unknown packages or releases, marker-guarded dependencies, deeper
+    transitive constraints) is left to the compiler.
+    """
+
+    def __init__(self, pypi_service: PyPIService):
+        self.pypi_service = pypi_service
+        self.checks = 0
+        self.rejected = 0
+
+    def check(self, requirements_set: FrozenSet[Requirement], direct_reqs: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
+        """A synthetic ConflictInfo if requirements_set is definitely infeasible, else None (unknown)."""
+        if not PACKAGING_AVAILABLE or self.pypi_service.metadata_index is None:
+            return None
+        self.checks += 1
+        conflict_info = self._find_conflict(requirements_set, {r.name.lower(): r.name for r in direct_reqs})
+        if conflict_info is not None:
+            self.rejected += 1
+        return conflict_info
+
+    def would_reject(self, requirements_set: FrozenSet[Requirement], direct_reqs: FrozenSet[Requirement]) -> bool:
+        """Same answer as check(), without counting it (for speculative callers)."""
+        if not PACKAGING_AVAILABLE or self.pypi_service.metadata_index is None:
+            return False
+        return self._find_conflict(requirements_set, {r.name.lower(): r.name for r in direct_reqs}) is not None
+
+    def _find_conflict(self, requirements_set: FrozenSet[Requirement], direct_names: Dict[str, str]) -> Optional[ConflictInfo]:
+        by_name: Dict[str, Requirement] = {r.name.lower(): r for r in requirements_set}
+        for name in sorted(by_name):
+            req = by_name[name]
+            if req.specifier and self.pypi_service.get_available_versions(name) and \
+               self.pypi_service.has_version_matching(name, req.specifier) is False:
+                return self._no_matching_version(req, direct_names)
+
+        # dependency name -> [(requirer, requirer version, specifier)] from the exact pins of the set
+        transitive: Dict[str, List[Tuple[str, str, str]]] = {}
+        for name in sorted(by_name):
+            req = by_name[name]
+            version = req.get_exact_version_str() if req.is_exact() else None
+            if not version:
+                continue
+            constraints = self.pypi_service.get_dependency_constraints(name, version)
+            for dep_name, dep_spec in sorted((constraints or {}).items()):
+                dep_req = by_name.get(dep_name)
+                if dep_req is None:
+                    transitive.setdefault(dep_name, []).append((name, version, dep_spec))
+                elif dep_name != name and not self._can_satisfy(dep_name, dep_req, dep_spec):
+                    return self._direct_clash(requirements_set, (name, version, dep_name, dep_spec), dep_req, direct_names)
+
+        for dep_name in sorted(transitive):
+            demands = transitive[dep_name]
+            if len(demands) < 2 or not self.pypi_service.get_available_versions(dep_name):
+                continue
+            combined = ",".join(spec for _, _, spec in demands)
+            if self.pypi_service.has_version_matching(dep_name, combined) is False:
+                return self._transitive_clash(requirements_set, dep_name, demands, direct_names)
+        return None
+
+    def _can_satisfy(self, dep_name: str, dep_req: Requirement, dep_spec: str) -> bool:
+        if dep_req.is_exact():
+            try:
+                version = Version(dep_req.get_exact_version_str())
+                return SpecifierSet(dep_spec).contains(version, prereleases=True)
+            except (InvalidVersion, InvalidSpecifier, TypeError):
+                return True # Cannot tell
+        if not dep_req.specifier or not self.pypi_service.get_available_versions(dep_name):
+            return True
+        return self.pypi_service.has_version_matching(dep_name, f"{dep_req.specifier},{dep_spec}") is not False
+
+    def _no_matching_version(self, req: Requirement, direct_names: Dict[str, str]) -> ConflictInfo:
+        available = ", ".join(reversed(self.pypi_service.get_available_versions(req.name)))
+        message = (f"ERROR: Could not find a version that satisfies the requirement {req} (from versions: {available})\n"
+                   f"ERROR: No matching distribution found for {req.name}\n{PRECHECK_NOTE}\n")
+        involved = {direct_names[req.name.lower()]} if req.name.lower() in direct_names else set(direct_names.values())
+        return ConflictInfo(is_conflict=True, error_message=message, involved_direct_packages=involved)
+
+    def _direct_clash(self, requirements_set: FrozenSet[Requirement], constraint: Tuple[str, str, str, str],
+                      dep_req: Requirement, direct_names: Dict[str, str]) -> ConflictInfo:
+        requirer, requirer_version, dep_name, dep_spec = constraint
+        cause_lines = [f"    {requirer} {requirer_version} depends on {dep_name}{dep_spec}", f"    The user requested {dep_req}"]
+        involved = {direct_names[n] for n in (requirer, dep_name) if n in direct_names}
+        return ConflictInfo(
+            is_conflict=True,
+            error_message=self._format_conflict(requirements_set, cause_lines),
+            involved_direct_packages=involved or set(direct_names.values()),
+            conflicting_constraints=[constraint]
+        )
+
+    def _transitive_clash(self, requirements_set: FrozenSet[Requirement], dep_name: str,
+                          demands: List[Tuple[str, str, str]], direct_names: Dict[str, str]) -> ConflictInfo:
+        cause_lines = [f"    {requirer} {version} depends on {dep_name}{spec}" for requirer, version, spec in demands]
+        involved = {direct_names[requirer] for requirer, _, _ in demands if requirer in direct_names}
+        culprit = (dep_name, "; ".join(sorted({spec for _, _, spec in demands})))
+        return ConflictInfo(
+            is_conflict=True,
+            error_message=self._format_conflict(requirements_set, cause_lines),
+            involved_direct_packages=involved or set(direct_names.values()),
+            sub_dependency_culprit=culprit,
+            sub_dependency_culprits=[culprit],
+            conflicting_constraints=[(requirer, version, dep_name, spec) for requirer, version, spec in demands]
+        )
+
+    def _format_conflict(self, requirements_set: FrozenSet[Requirement], cause_lines: List[str]) -> str:
+        # Same shape as pip's ResolutionImpossible report, so the output reads (and parses) like a real one
+        requested = " and ".join(str(r) for r in sorted(requirements_set))
+        return (f"ERROR: Cannot install {requested} because these package versions have conflicting dependencies.\n\n"
+                "The conflict is caused by:\n" + "\n".join(cause_lines) + "\n\n" + PRECHECK_NOTE + "\n")
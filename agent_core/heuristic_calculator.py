@@ -1,29 +1,193 @@
 # dependency_resolver_agent/agent_core/heuristic_calculator.py
-from typing import FrozenSet
-from dependency_resolver_agent.data_models.requirement import Requirement
+import math
+import threading
+from functools import lru_cache
+from typing import Collection, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from dependency_resolver_agent.data_models.requirement import Requirement, SpecifierSet, PACKAGING_AVAILABLE, InvalidSpecifier
 from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
+from dependency_resolver_agent.tooling.pypi_service import PyPIService
+from dependency_resolver_agent.utils import config_manager as config
+
+# Every action costs at least ActionGenerator.get_cost_of_action's base cost
+MIN_ACTION_COST = 1.0
+# Extra estimated cost per release a pin has to move to satisfy a violated constraint (informed modes only)
+VERSION_STEP_COST = 0.25
+MAX_VERSION_STEPS = 4
+
+HEURISTIC_MODES = ("legacy", "admissible", "weighted")
+
+
+@lru_cache(maxsize=4096)
+def _parse_constraint_specifier(specifier: str) -> Optional[SpecifierSet]:
+    try:
+        return SpecifierSet(specifier)
+    except InvalidSpecifier:
+        return None
+
 
 class HeuristicCalculator:
+    """
+    h-score for A* over requirement sets.
+      - "legacy":     number of packages the parent's conflict involves (the original heuristic)
+      - "admissible": MIN_ACTION_COST per disjoint violated constraint known to hold in the state;
+                      never overestimates, so A* still returns a cheapest fix
+      - "weighted":   admissible estimate plus version distance to the nearest compatible release and
+                      unresolved sub-dependency hints, multiplied by `weight` (weighted A*: fewer
+                      compiles, solution cost within a factor of `weight` of the optimum); opt-in,
+                      the only mode `weight` applies to
+    Constraints ("X==1.0 requires Y<2") are learned from every evaluated conflict and, when a metadata
+    index is loaded, from the Requires-Dist of pinned releases.
+    """
+
+    def __init__(self, pypi_service: Optional[PyPIService] = None, mode: str = config.HEURISTIC_MODE,
+                 weight: float = config.HEURISTIC_WEIGHT):
+        if mode not in HEURISTIC_MODES:
+            raise ValueError(f"Unknown heuristic mode '{mode}' (expected one of {', '.join(HEURISTIC_MODES)})")
+        self.pypi_service = pypi_service
+        self.mode = mode
+        self.weight = weight if mode == "weighted" else 1.0
+        # (requirer name, requirer version) -> {dependency name: specifier}
+        self._known_requires: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._metadata_checked: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def weight(self) -> float:
+        return self._weight
+
+    @weight.setter
+    def weight(self, value: float):
+        if not (value > 0 and math.isfinite(value)):
+            raise ValueError(f"Heuristic weight must be a positive finite number, got {value!r}")
+        self._weight = value
+
+    def observe_conflict(self, conflict_info: ConflictInfo):
+        """Learns the constraints reported by an evaluated conflict."""
+        if not conflict_info.is_conflict or not conflict_info.conflicting_constraints:
+            return
+        with self._lock:
+            for requirer, requirer_version, dep_name, dep_spec in conflict_info.conflicting_constraints:
+                self._known_requires.setdefault((requirer.lower(), requirer_version), {})[dep_name.lower()] = dep_spec
+
+    def _requires_of(self, name: str, version: str) -> Dict[str, str]:
+        key = (name, version)
+        if self.pypi_service is not None and key not in self._metadata_checked:
+            with self._lock:
+                self._metadata_checked.add(key)
+                # Marker-guarded dependencies are not included, which keeps h admissible
+                metadata_requires = self.pypi_service.get_dependency_constraints(name, version)
+                if metadata_requires:
+                    requires = self._known_requires.setdefault(key, {})
+                    for dep_name, dep_spec in metadata_requires.items():
+                        requires.setdefault(dep_name, dep_spec)
+        return self._known_requires.get(key, {})
+
+    def _violated_constraints(self, current_requirements: Collection[Requirement]) -> List[Tuple[str, str, float]]:
+        """(requirer, dependency, estimated fix cost) for every known constraint the state breaks."""
+        by_name: Dict[str, Requirement] = {r.name.lower(): r for r in current_requirements}
+        violated: List[Tuple[str, str, float]] = []
+        for requirer_name, requirer_req in by_name.items():
+            requirer_version = requirer_req.get_exact_version_str() if requirer_req.is_exact() else None
+            if not requirer_version:
+                continue
+            for dep_name, dep_spec in self._requires_of(requirer_name, requirer_version).items():
+                dep_req = by_name.get(dep_name)
+                if dep_req is None or dep_name == requirer_name:
+                    continue
+                fix_cost = self._constraint_fix_cost(dep_name, dep_req, dep_spec)
+                if fix_cost is not None:
+                    violated.append((requirer_name, dep_name, fix_cost))
+        return violated
+
+    def _constraint_fix_cost(self, dep_name: str, dep_req: Requirement, dep_spec: str) -> Optional[float]:
+        """None if dep_req can satisfy dep_spec, else the estimated cost of fixing it."""
+        if dep_req.is_exact():
+            dep_version = dep_req.get_version_obj()
+            spec_set = _parse_constraint_specifier(dep_spec)
+            # Unparseable specifier from the output: assume it is satisfiable
+            if dep_version is None or spec_set is None or spec_set.contains(dep_version, prereleases=True):
+                return None
+            steps = None
+            if self.pypi_service is not None:
+                steps = self.pypi_service.version_distance(dep_name, dep_req.get_exact_version_str(), dep_spec)
+            if steps is None:
+                return MIN_ACTION_COST
+            return MIN_ACTION_COST + VERSION_STEP_COST * min(max(steps - 1, 0), MAX_VERSION_STEPS)
+        if self.pypi_service is None or not dep_req.specifier:
+            return None
+        # Range requirement: violated only if no known release fits both ranges
+        if self.pypi_service.has_version_matching(dep_name, f"{dep_req.specifier},{dep_spec}") is False:
+            return MIN_ACTION_COST
+        return None
+
     def calculate_h_score(
         self,
-        current_requirements: FrozenSet[Requirement], # pylint: disable=unused-argument
+        current_requirements: Collection[Requirement],
+        conflict_info: ConflictInfo,
+        original_direct_reqs: FrozenSet[Requirement]
+    ) -> float:
+        h_score = self.unweighted_h_score(current_requirements, conflict_info, original_direct_reqs)
+        return self.weight * h_score if self.mode == "weighted" else h_score
+
+    def unweighted_h_score(
+        self,
+        current_requirements: Collection[Requirement],
         conflict_info: ConflictInfo,
-        original_direct_reqs: FrozenSet[Requirement] # pylint: disable=unused-argument
+        original_direct_reqs: FrozenSet[Requirement]
     ) -> float:
+        """The mode's estimate before `weight` is applied."""
         if not conflict_info.is_conflict:
             return 0.0
+        if self.mode == "legacy" or not PACKAGING_AVAILABLE:
+            return self._legacy_h_score(conflict_info, original_direct_reqs)
+
+        violated, used, admissible_h, informed_h = self._match_violations(current_requirements)
+        if self.mode == "admissible":
+            return admissible_h
+
+        if conflict_info.sub_dependency_culprit and not violated:
+            sub_dep_name, sub_dep_hint = conflict_info.sub_dependency_culprit
+            if sub_dep_name.lower() not in used and not any(r.name.lower() == sub_dep_name.lower() for r in current_requirements):
+                hint_specs = [s.strip() for s in sub_dep_hint.split(";") if s.strip()]
+                if hint_specs and self.pypi_service is not None and \
+                   self.pypi_service.has_version_matching(sub_dep_name, ",".join(hint_specs)) is False:
+                    informed_h += MIN_ACTION_COST * 0.5 # The parent's transitive clash is probably still there
+        return informed_h
+
+    def lower_bound(self, current_requirements: Collection[Requirement], conflict_info: ConflictInfo) -> float:
+        """Admissible part of the estimate, whatever the mode: a lower bound on the remaining action cost."""
+        if not conflict_info.is_conflict or not PACKAGING_AVAILABLE:
+            return 0.0
+        return self._match_violations(current_requirements)[2]
 
+    def _match_violations(self, current_requirements: Collection[Requirement]) -> Tuple[List[Tuple[str, str, float]], Set[str], float, float]:
+        """(violated constraints, packages matched, admissible estimate, informed estimate before weighting)."""
+        # Each action changes one requirement, so constraints over disjoint package pairs need separate actions
+        violated = sorted(self._violated_constraints(current_requirements), key=lambda v: (-v[2], v[0], v[1]))
+        used: Set[str] = set()
+        admissible_h = 0.0
+        informed_h = 0.0
+        for requirer_name, dep_name, fix_cost in violated:
+            if requirer_name in used or dep_name in used:
+                continue
+            used.update((requirer_name, dep_name))
+            admissible_h += MIN_ACTION_COST
+            informed_h += fix_cost
+        return violated, used, admissible_h, informed_h
+
+    def _legacy_h_score(self, conflict_info: ConflictInfo, original_direct_reqs: FrozenSet[Requirement]) -> float:
         num_involved = len(conflict_info.involved_direct_packages)
-        
+
         # Base heuristic: number of direct dependencies involved, or 1 if unknown but conflict exists
         h_val = float(num_involved) if num_involved > 0 else 1.0
 
         # Slightly higher heuristic if a specific sub-dependency is identified as a multi-package problem
         if conflict_info.sub_dependency_culprit and num_involved > 1:
             h_val += 0.5
-        
+
         # If all original direct dependencies are involved, it might be a more complex conflict
         if num_involved == len(original_direct_reqs) and num_involved > 1:
             h_val += 0.2 # Small bump if all are involved
 
-        return h_val
\ No newline at end of file
+        return h_val
@@ -1,19 +1,34 @@
 # dependency_resolver_agent/agent_core/orchestrator.py
-import heapq
+import logging
+import math
 import re
-from typing import List, Tuple, Dict, Optional, FrozenSet, Set
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional, FrozenSet, Sequence, Set
 
 from dependency_resolver_agent.data_models.requirement import Requirement
 from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
-from dependency_resolver_agent.agent_core.state_manager import AStarNode, reconstruct_path
+from dependency_resolver_agent.data_models.compiler_output import CompilerOutput
+from dependency_resolver_agent.data_models.search_result import SearchResult
+from dependency_resolver_agent.agent_core.state_manager import AStarNode, ClosedSet, RequirementState, reconstruct_path
 from dependency_resolver_agent.agent_core.action_generator import ActionGenerator
 from dependency_resolver_agent.agent_core.heuristic_calculator import HeuristicCalculator
+from dependency_resolver_agent.agent_core.subsumption_index import SubsumptionIndex
+from dependency_resolver_agent.agent_core.feasibility_checker import FeasibilityChecker
+from dependency_resolver_agent.agent_core.search_strategies import SearchStrategy, create_search_strategy
 from dependency_resolver_agent.tooling.pip_compiler_service import PipCompilerService
 from dependency_resolver_agent.tooling.regex_conflict_parser import RegexConflictParser
-from dependency_resolver_agent.llm_services.conflict_parser_llm import LLMConflictParser # Now for real
-from dependency_resolver_agent.utils.logger import log_verbose
+from dependency_resolver_agent.utils.logger import get_logger, lazy
 from dependency_resolver_agent.utils import cache_manager
+from dependency_resolver_agent.utils import tracing
 from dependency_resolver_agent.utils import config_manager as config
+from dependency_resolver_agent.utils.conflict_signature import ConflictSignatureCache, conflict_signature
+
+if TYPE_CHECKING: # Importing it at runtime would load langchain for every run; see tooling/conflict_parser_factory.py
+    from dependency_resolver_agent.llm_services.conflict_parser_llm import LLMConflictParser
+
+log = get_logger(__name__)
 
 
 class Orchestrator:
@@ -22,18 +37,36 @@ class Orchestrator:
                  heuristic_calc: HeuristicCalculator,
                  pip_compiler: PipCompilerService,
                  regex_conflict_parser: RegexConflictParser, # Fallback
-                 llm_conflict_parser: Optional[LLMConflictParser] = None # Primary if USE_LLM_PARSER
+                 llm_conflict_parser: Optional['LLMConflictParser'] = None, # Primary if USE_LLM_PARSER
+                 feasibility_checker: Optional[FeasibilityChecker] = None, # Rejects states the metadata already rules out
+                 search_strategy: Optional[str] = None # See search_strategies.SEARCH_STRATEGIES; default config.SEARCH_STRATEGY
                  ):
         self.action_generator = action_generator
         self.heuristic_calc = heuristic_calc
         self.pip_compiler = pip_compiler
         self.regex_conflict_parser = regex_conflict_parser
         self.llm_conflict_parser = llm_conflict_parser
+        self.feasibility_checker = feasibility_checker
+        # Outcomes known in the current solve (cleared by solve_anytime); implies results for sub/supersets of evaluated states
+        self.subsumption_index = SubsumptionIndex()
+        # Parses of earlier failures by conflict signature: the process-wide cache unless the caller gives this one its own
+        self.signature_cache: ConflictSignatureCache = cache_manager.SIGNATURE_CACHE
+        # Set when the evaluation cache is shared with solves of other direct requirements (batch mode): their cached
+        # failures were parsed against those requirements, so they are parsed again for this solve's
+        self.reparse_cached_failures = False
+        self.last_iteration_count = 0 # A* iterations used by the most recent solve()
+        self.last_result: Optional[SearchResult] = None # Solution or best partial state of the most recent solve()
+        self.search_strategy = search_strategy or config.SEARCH_STRATEGY
+        create_search_strategy(self.search_strategy) # Fail on an unknown name now rather than mid-solve
+        # Of the most recent solve(): strategy, iterations, expansions, compiles, peak frontier size and dropped nodes
+        self.last_search_stats: Dict[str, object] = {}
+        self._compile_count = 0
+        self._compile_count_lock = threading.Lock()
 
         if config.USE_LLM_PARSER and self.llm_conflict_parser is None:
-            log_verbose("[Orchestrator] Warning: USE_LLM_PARSER is True, but no LLMConflictParser provided. LLM parsing will not be used.")
+            log.warning("[Orchestrator] Warning: USE_LLM_PARSER is True, but no LLMConflictParser provided. LLM parsing will not be used.")
         elif config.USE_LLM_PARSER and self.llm_conflict_parser and self.llm_conflict_parser.llm is None:
-            log_verbose("[Orchestrator] Warning: LLMConflictParser provided, but its LLM is not initialized (e.g. API key issue). LLM parsing may fallback.")
+            log.warning("[Orchestrator] Warning: LLMConflictParser provided, but its LLM is not initialized (e.g. API key issue). LLM parsing may fallback.")
 
 
     def _parse_initial_requirements(self, content: str) -> FrozenSet[Requirement]:
@@ -50,154 +83,523 @@ class Orchestrator:
                 try:
                     parsed.add(Requirement(name=name, specifier=spec))
                 except ValueError as ve:
-                    log_verbose(f"Warning: Skipping malformed initial requirement on line {line_num} ('{line}'): {ve}")
+                    log.warning("Warning: Skipping malformed initial requirement on line %s ('%s'): %s", line_num, line, ve)
             elif line:
-                log_verbose(f"Warning: Skipping malformed initial requirement line {line_num}: '{line}' (no regex match).")
+                log.warning("Warning: Skipping malformed initial requirement line %s: '%s' (no regex match).", line_num, line)
         return frozenset(parsed)
 
-    def _get_conflict_info_for_node(self, requirements_set: FrozenSet[Requirement], direct_reqs_for_parser: FrozenSet[Requirement]) -> ConflictInfo:
-        cached_eval = cache_manager.get_cached_full_eval(requirements_set)
-        if cached_eval:
-            _success, _stdout, _stderr, conflict_info_obj = cached_eval
-            log_verbose(f"  [Orchestrator Cache] Full eval hit for: {self._reqs_to_str_summary(requirements_set)}")
-            return conflict_info_obj
+    def _get_conflict_info_for_node(self, requirements_set: FrozenSet[Requirement], direct_reqs_for_parser: FrozenSet[Requirement],
+                                    cancel_event: Optional[threading.Event] = None,
+                                    seed_pins: Optional[Dict[str, str]] = None) -> ConflictInfo:
+        """
+        Outcome of requirements_set: cached, implied by the subsumption index or the pre-check, or else compiled.
+        Only called from the search loop (in pop order), so the caches and the index grow as in a serial search.
+        """
+        known_conflict_info = self._known_conflict_info(requirements_set, direct_reqs_for_parser)
+        if known_conflict_info is not None:
+            return known_conflict_info
+        return self._evaluate_node(requirements_set, direct_reqs_for_parser, cancel_event, seed_pins)
 
-        success, stdout_str, stderr_str = self.pip_compiler.run_compile(requirements_set)
-        full_pip_output = f"STDOUT:\n{stdout_str}\nSTDERR:\n{stderr_str}" # For regex parser if LLM fails
+    def _evaluate_node(self, requirements_set: FrozenSet[Requirement], direct_reqs_for_parser: FrozenSet[Requirement],
+                       cancel_event: Optional[threading.Event] = None, seed_pins: Optional[Dict[str, str]] = None,
+                       speculative: Optional[Future] = None) -> ConflictInfo:
+        """
+        Compiles a state whose outcome is not known yet, then caches and records the result.
+        `speculative` is a _speculative_compile() future for this state, used instead of compiling again.
+        """
+        compiled = speculative.result() if speculative is not None else None
+        if compiled is None:
+            success, stdout_str, stderr_str = self._run_compile(requirements_set, cancel_event, seed_pins)
+            if cancel_event is not None and cancel_event.is_set():
+                # Search already finished; the result is discarded and must not poison the cache
+                return ConflictInfo(is_conflict=not success, error_message=stderr_str)
+            # Compressed once here; the cache entry and the ConflictInfo both refer to this object
+            compiler_output = cache_manager.intern_compiler_output(stdout_str, stderr_str)
+            parsed_conflict_info = None
+        else:
+            success, compiler_output, parsed_conflict_info = compiled
+            stdout_str, stderr_str = compiler_output.stdout, compiler_output.stderr
 
         conflict_info_obj: Optional[ConflictInfo] = None
 
         if success:
-            conflict_info_obj = ConflictInfo(is_conflict=False, error_message=stdout_str)
+            conflict_info_obj = ConflictInfo(is_conflict=False)
         else:
-            parsed_with_llm = False
-            if config.USE_LLM_PARSER and self.llm_conflict_parser and self.llm_conflict_parser.llm:
-                log_verbose("  [Orchestrator] Attempting conflict parsing with LLM...")
-                try:
-                    conflict_info_obj = self.llm_conflict_parser.parse(stdout_str, stderr_str, direct_reqs_for_parser)
-                    if conflict_info_obj:
-                        log_verbose("  [Orchestrator] LLM parsing successful.")
-                        parsed_with_llm = True
-                    else:
-                        log_verbose("  [Orchestrator] LLM parsing returned None, falling back to regex.")
-                except Exception as e_llm: # Catch any exception from LLM parsing attempt
-                    log_verbose(f"  [Orchestrator] Exception during LLM parsing: {e_llm}. Falling back to regex.")
-            
-            if not parsed_with_llm: # Fallback to regex if LLM not used, not available, or failed
-                log_verbose("  [Orchestrator] Using regex conflict parser.")
-                conflict_info_obj = self.regex_conflict_parser.parse(stdout_str, stderr_str, direct_reqs_for_parser)
-                # Regex parser always sets is_conflict=True if called, ensure error message is set
-                if conflict_info_obj and not conflict_info_obj.error_message:
-                     conflict_info_obj.error_message = full_pip_output
-
+            conflict_info_obj = self._parse_failure(stdout_str, stderr_str, direct_reqs_for_parser, parsed_conflict_info)
 
         if conflict_info_obj is None: # Should not happen if regex parser is a true fallback
-            log_verbose("  [Orchestrator] CRITICAL: No conflict info could be generated. Defaulting to generic conflict.")
+            log.error("  [Orchestrator] CRITICAL: No conflict info could be generated. Defaulting to generic conflict.")
             conflict_info_obj = ConflictInfo(
                 is_conflict=not success, # Base on pip-compile success
-                error_message=full_pip_output,
                 involved_direct_packages={r.name for r in direct_reqs_for_parser} if not success else set(),
                 sub_dependency_culprit=None
             )
-        
-        cache_manager.store_cached_full_eval(requirements_set, (success, stdout_str, stderr_str, conflict_info_obj))
-        # Also update the simpler cache for direct ConflictInfo lookup if needed elsewhere
-        cache_manager.store_pip_compile_result(requirements_set, conflict_info_obj)
+
+        conflict_info_obj.attach_output(compiler_output)
+        cache_manager.store_eval(requirements_set, success, compiler_output, conflict_info_obj)
+        if not cache_manager.is_inconclusive_failure(success, stdout_str, stderr_str):
+            self._record_outcome(requirements_set, conflict_info_obj)
+        return conflict_info_obj
+
+    def _known_conflict_info(self, requirements_set: FrozenSet[Requirement],
+                             direct_reqs_for_parser: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
+        """The outcome without compiling (cache, subsumption index, metadata pre-check), or None."""
+        cached_conflict_info = cache_manager.get_cached_conflict_info(requirements_set)
+        if cached_conflict_info:
+            tracing.count("eval_cache.hits")
+            log.debug("  [Orchestrator Cache] Full eval hit for: %s", lazy(self._reqs_to_str_summary, requirements_set))
+            if cached_conflict_info.is_conflict and self.reparse_cached_failures and cached_conflict_info.output_ref is not None:
+                return self._reparse_cached_failure(requirements_set, cached_conflict_info.output_ref, direct_reqs_for_parser)
+            return cached_conflict_info
+        tracing.count("eval_cache.misses")
+
+        if config.SUBSUMPTION_INDEX_ENABLED:
+            with tracing.span("subsumption"):
+                inferred_conflict_info = self.subsumption_index.infer(requirements_set)
+            if inferred_conflict_info is not None:
+                tracing.count("subsumption.inferred")
+                log.debug("  [Orchestrator Subsumption] Outcome implied (%s) without compiling: %s", 'conflict' if inferred_conflict_info.is_conflict else 'solvable', lazy(self._reqs_to_str_summary, requirements_set))
+                if inferred_conflict_info.is_conflict and inferred_conflict_info.output_ref is not None:
+                    # The subset's failure report, blamed on this solve's direct requirements
+                    inferred_conflict_info = self._conflict_info_from_output(inferred_conflict_info.output_ref, direct_reqs_for_parser)
+                inferred_output = inferred_conflict_info.output_ref or cache_manager.intern_compiler_output("", "")
+                # Derived result: cache it for this process, but only real compiles go to disk
+                cache_manager.store_eval(requirements_set, not inferred_conflict_info.is_conflict, inferred_output,
+                                         inferred_conflict_info, persist=False)
+                return inferred_conflict_info
+
+        if self.feasibility_checker is not None and config.FEASIBILITY_PRECHECK_ENABLED:
+            with tracing.span("precheck"):
+                precheck_conflict_info = self.feasibility_checker.check(requirements_set, direct_reqs_for_parser)
+            if precheck_conflict_info is not None:
+                tracing.count("precheck.rejected")
+                log.debug("  [Orchestrator Pre-check] Infeasible from package metadata, not compiling: %s", lazy(self._reqs_to_str_summary, requirements_set))
+                precheck_output = cache_manager.intern_compiler_output("", precheck_conflict_info.error_message)
+                precheck_conflict_info.attach_output(precheck_output)
+                # Derived from local metadata: cached for this process only, like subsumption results
+                cache_manager.store_eval(requirements_set, False, precheck_output, precheck_conflict_info, persist=False)
+                return precheck_conflict_info
+        return None
+
+    def _parse_failure(self, stdout_str: str, stderr_str: str, direct_reqs_for_parser: FrozenSet[Requirement],
+                       parsed_conflict_info: Optional[ConflictInfo] = None) -> Optional[ConflictInfo]:
+        """ConflictInfo of a failed compile: an earlier parse of the same conflict signature, else parsed now."""
+        signature: Optional[str] = None
+        if config.CONFLICT_SIGNATURE_CACHE_ENABLED and not cache_manager.is_inconclusive_failure(False, stdout_str, stderr_str):
+            with tracing.span("conflict_signature"):
+                signature = conflict_signature(stdout_str, stderr_str, direct_reqs_for_parser)
+            conflict_info_obj = self.signature_cache.get(signature)
+            tracing.count("signature_cache.hits" if conflict_info_obj is not None else "signature_cache.misses")
+            if conflict_info_obj is not None:
+                log.debug("  [Orchestrator] Same conflict signature as an earlier failure; reusing its parse.")
+                return conflict_info_obj
+        conflict_info_obj = parsed_conflict_info or self._parse_conflict(stdout_str, stderr_str, direct_reqs_for_parser)
+        if signature is not None and conflict_info_obj is not None:
+            self.signature_cache.put(signature, conflict_info_obj)
+        return conflict_info_obj
+
+    def _conflict_info_from_output(self, output: CompilerOutput, direct_reqs_for_parser: FrozenSet[Requirement]) -> ConflictInfo:
+        """A stored failure report parsed against direct_reqs_for_parser (usually a signature cache hit)."""
+        conflict_info_obj = self._parse_failure(output.stdout, output.stderr, direct_reqs_for_parser)
+        if conflict_info_obj is None:
+            conflict_info_obj = ConflictInfo(is_conflict=True, involved_direct_packages={r.name for r in direct_reqs_for_parser})
+        conflict_info_obj.attach_output(output)
         return conflict_info_obj
 
+    def _reparse_cached_failure(self, requirements_set: FrozenSet[Requirement], output: CompilerOutput,
+                                direct_reqs_for_parser: FrozenSet[Requirement]) -> ConflictInfo:
+        """A failure another solve cached, parsed against this solve's direct requirements; the shared entry is left alone."""
+        conflict_info_obj = self._conflict_info_from_output(output, direct_reqs_for_parser)
+        if not cache_manager.is_inconclusive_failure(False, output.stdout, output.stderr):
+            self._record_outcome(requirements_set, conflict_info_obj)
+        return conflict_info_obj
+
+    def _run_compile(self, requirements_set: FrozenSet[Requirement], cancel_event: Optional[threading.Event],
+                     seed_pins: Optional[Dict[str, str]]) -> Tuple[bool, str, str]:
+        with self._compile_count_lock:
+            self._compile_count += 1
+        compile_start = tracing.clock()
+        if seed_pins:
+            success, stdout_str, stderr_str = self.pip_compiler.run_compile(requirements_set, cancel_event=cancel_event,
+                                                                            seed_pins=seed_pins)
+        else:
+            success, stdout_str, stderr_str = self.pip_compiler.run_compile(requirements_set, cancel_event=cancel_event)
+        tracing.record("compile", compile_start)
+        tracing.count("compile.succeeded" if success else "compile.failed")
+        return success, stdout_str, stderr_str
+
+    def _speculative_compile(self, requirements_set: FrozenSet[Requirement], direct_reqs_for_parser: FrozenSet[Requirement],
+                             cancel_event: Optional[threading.Event], seed_pins: Optional[Dict[str, str]]) -> \
+            Optional[Tuple[bool, CompilerOutput, Optional[ConflictInfo]]]:
+        """
+        Worker side of a parallel solve: compiles (and parses a new failure) for a state ahead of the search
+        loop, but caches and records nothing; _evaluate_node does that when the state is popped.
+        Returns None, with no compile, when the outcome is already implied or the search was cancelled.
+        """
+        if config.SUBSUMPTION_INDEX_ENABLED and self.subsumption_index.implies(requirements_set):
+            return None
+        if self.feasibility_checker is not None and config.FEASIBILITY_PRECHECK_ENABLED and \
+                self.feasibility_checker.would_reject(requirements_set, direct_reqs_for_parser):
+            return None
+        success, stdout_str, stderr_str = self._run_compile(requirements_set, cancel_event, seed_pins)
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        parsed_conflict_info = None
+        if not success and not cache_manager.is_inconclusive_failure(success, stdout_str, stderr_str):
+            signature = conflict_signature(stdout_str, stderr_str, direct_reqs_for_parser) \
+                if config.CONFLICT_SIGNATURE_CACHE_ENABLED else None
+            if signature is None or signature not in self.signature_cache:
+                parsed_conflict_info = self._parse_conflict(stdout_str, stderr_str, direct_reqs_for_parser)
+        return success, cache_manager.intern_compiler_output(stdout_str, stderr_str), parsed_conflict_info
 
-    def solve(self, initial_requirements_str: str, max_iterations: int = config.MAX_ASTAR_ITERATIONS) -> \
+    def _parse_conflict(self, stdout_str: str, stderr_str: str, direct_reqs_for_parser: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
+        conflict_info_obj: Optional[ConflictInfo] = None
+        parsed_with_llm = False
+        if config.USE_LLM_PARSER and self.llm_conflict_parser and self.llm_conflict_parser.llm:
+            log.debug("  [Orchestrator] Attempting conflict parsing with LLM...")
+            try:
+                with tracing.span("parse.llm"):
+                    conflict_info_obj = self.llm_conflict_parser.parse(stdout_str, stderr_str, direct_reqs_for_parser)
+                if conflict_info_obj:
+                    log.debug("  [Orchestrator] LLM parsing successful.")
+                    parsed_with_llm = True
+                else:
+                    log.debug("  [Orchestrator] LLM parsing returned None, falling back to regex.")
+            except Exception as e_llm: # Catch any exception from LLM parsing attempt
+                log.debug("  [Orchestrator] Exception during LLM parsing: %s. Falling back to regex.", e_llm)
+
+        if not parsed_with_llm: # Fallback to regex if LLM not used, not available, or failed
+            log.debug("  [Orchestrator] Using regex conflict parser.")
+            if config.USE_LLM_PARSER and self.llm_conflict_parser and self.llm_conflict_parser.llm:
+                tracing.count("parse.llm_fallbacks")
+            with tracing.span("parse.regex"):
+                conflict_info_obj = self.regex_conflict_parser.parse(stdout_str, stderr_str, direct_reqs_for_parser)
+        return conflict_info_obj
+
+    def _record_outcome(self, requirements_set: FrozenSet[Requirement], conflict_info: ConflictInfo):
+        if not config.SUBSUMPTION_INDEX_ENABLED:
+            return
+        if conflict_info.is_conflict:
+            self.subsumption_index.add_unsatisfiable(requirements_set, conflict_info)
+        else:
+            self.subsumption_index.add_satisfiable(requirements_set)
+
+
+    def _warm_start_pins(self, node: AStarNode) -> Optional[Dict[str, str]]:
+        """Pins resolved for the closest evaluated ancestor of node: the parent's, unless it was never compiled."""
+        if not config.WARM_START_ENABLED:
+            return None
+        ancestor = node.parent
+        while ancestor is not None:
+            pins = cache_manager.get_resolved_pins(ancestor.requirements)
+            if pins:
+                return pins
+            ancestor = ancestor.parent
+        return None
+
+    def _prefetch_frontier(self,
+                           frontier: SearchStrategy,
+                           closed_set: ClosedSet,
+                           speculative: Dict[FrozenSet[Requirement], Future],
+                           executor: ThreadPoolExecutor,
+                           jobs: int,
+                           original_direct_reqs: FrozenSet[Requirement],
+                           cancel_event: threading.Event):
+        """
+        Speculatively compiles the best open-set nodes on the worker pool so the result is ready by the time
+        the serial loop pops them. Finished results wait in `speculative` until then: only popped states are
+        cached and recorded, so the expansion order, and the solution, are the same as with jobs=1.
+        """
+        free_workers = jobs - sum(1 for future in speculative.values() if not future.done())
+        if free_workers <= 0:
+            return
+        for candidate in frontier.best(jobs):
+            if free_workers <= 0:
+                break
+            if candidate.requirements in speculative or cache_manager.is_evaluated(candidate.requirements):
+                continue
+            closed_g_score = closed_set.get_g_score(candidate.state)
+            if closed_g_score is not None and candidate.g_score >= closed_g_score:
+                continue # Will be skipped when popped
+            speculative[candidate.requirements] = executor.submit(
+                self._speculative_compile, candidate.requirements, original_direct_reqs, cancel_event,
+                self._warm_start_pins(candidate)
+            )
+            free_workers -= 1
+
+    def solve(self, initial_requirements_str: str, max_iterations: int = config.MAX_ASTAR_ITERATIONS,
+              jobs: int = config.DEFAULT_SOLVE_JOBS) -> \
             Optional[Tuple[FrozenSet[Requirement], List[Tuple[str, FrozenSet[Requirement]]]]]:
-        # ... (Initialization of start_node, open_set_pq, processed_node_g_scores is THE SAME)
-        # ... (Main A* loop structure is THE SAME)
-        # The only change is how _get_conflict_info_for_node is called and its internal logic.
-        # All other parts of the solve method remain identical to the previous version.
+        """
+        Runs A* over requirement sets. With jobs > 1, the top open-set nodes are compiled in parallel
+        on a pool of pip-compile workers while nodes are still expanded in serial A* order.
+        Returns (solution, path), or None; self.last_result then holds the closest state reached.
+        """
+        result = self.solve_anytime(initial_requirements_str, max_iterations=max_iterations, jobs=jobs)
+        if result is None or result.partial:
+            return None
+        return result.requirements, result.path
+
+    def solve_anytime(self, initial_requirements_str: str, time_budget_seconds: Optional[float] = None,
+                      max_iterations: int = config.MAX_ASTAR_ITERATIONS, jobs: int = config.DEFAULT_SOLVE_JOBS,
+                      weights: Optional[Sequence[float]] = None) -> Optional[SearchResult]:
+        """
+        Like solve(), but never throws the search away: without a solution it returns the best state reached
+        (lowest heuristic estimate, then fewest involved packages) with partial=True. With time_budget_seconds
+        it stops at that wall-clock deadline, cancelling the compiles still running.
+        `weights` (decreasing, e.g. (3.0, 2.0, 1.0); weighted heuristic only) makes it an anytime search:
+        a first solution comes from the greediest pass, then the search restarts with each smaller weight
+        and keeps only paths cheaper than the best solution so far. Restarts recompile nothing already
+        evaluated, so later passes mostly cost heuristic work.
+        """
+        if weights and not all(weight > 0 and math.isfinite(weight) for weight in weights):
+            raise ValueError(f"Anytime weights must be positive finite numbers, got {list(weights)}")
+        # Recorded conflicts name the involved packages of one solve's direct requirements; start empty for each solve
+        self.subsumption_index.clear()
+        deadline = time.monotonic() + time_budget_seconds if time_budget_seconds is not None else None
+        if jobs <= 1 and deadline is None:
+            with tracing.span("solve"):
+                return self._solve(initial_requirements_str, max_iterations, None, 1, None, None, weights)
+        cancel_event = threading.Event()
+        deadline_timer = None
+        if deadline is not None:
+            # Stops the compile in progress at the deadline instead of waiting for it to finish
+            deadline_timer = threading.Timer(max(0.0, deadline - time.monotonic()), cancel_event.set)
+            deadline_timer.daemon = True
+            deadline_timer.start()
+        executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="pip-compile") if jobs > 1 else None
+        try:
+            with tracing.span("solve"):
+                return self._solve(initial_requirements_str, max_iterations, executor, jobs, cancel_event, deadline, weights)
+        finally:
+            if deadline_timer is not None:
+                deadline_timer.cancel()
+            # Kill any speculative compiles still running; their results are no longer needed
+            cancel_event.set()
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
 
-        log_verbose("Parsing initial requirements...")
-        original_direct_reqs = self._parse_initial_requirements(initial_requirements_str)
+    def _solve(self, initial_requirements_str: str, max_iterations: int,
+               executor: Optional[ThreadPoolExecutor], jobs: int,
+               cancel_event: Optional[threading.Event] = None, deadline: Optional[float] = None,
+               weights: Optional[Sequence[float]] = None) -> Optional[SearchResult]:
+        self.last_iteration_count = 0
+        self.last_result = None
+        self._compile_count = 0
+        self.last_search_stats = {"strategy": self.search_strategy, "iterations": 0, "expansions": 0, "compiles": 0, "peak_frontier": 0, "dropped": 0, "closed_evicted": 0}
+        start_time = time.monotonic()
+        log.debug("Parsing initial requirements...")
+        with tracing.span("parse.requirements"):
+            original_direct_reqs = self._parse_initial_requirements(initial_requirements_str)
         if not original_direct_reqs:
             print("ERROR: No valid requirements parsed from initial input.")
             return None
-        log_verbose(f"Initial direct requirements: {self._reqs_to_str_summary(original_direct_reqs)}")
+        log.debug("Initial direct requirements: %s", lazy(self._reqs_to_str_summary, original_direct_reqs))
 
-        log_verbose("Performing initial evaluation for start_node...")
-        initial_conflict_info = self._get_conflict_info_for_node(original_direct_reqs, original_direct_reqs)
-        initial_h_score = self.heuristic_calc.calculate_h_score(original_direct_reqs, initial_conflict_info, original_direct_reqs)
+        log.debug("Performing initial evaluation for start_node...")
+        initial_conflict_info = self._get_conflict_info_for_node(original_direct_reqs, original_direct_reqs, cancel_event)
+        if cancel_event is not None and cancel_event.is_set():
+            print(f"\n>>> DEADLINE: time budget used up before the initial requirements were evaluated. <<<")
+            return None
+        self.heuristic_calc.observe_conflict(initial_conflict_info)
+
+        schedule: List[Optional[float]] = [None]
+        if weights and self.heuristic_calc.mode == "weighted":
+            schedule = list(weights)
+        elif weights:
+            log.debug("  Heuristic mode '%s' has no weight; running a single search pass.", self.heuristic_calc.mode)
+        original_weight = self.heuristic_calc.weight
+        incumbent: Optional[SearchResult] = None
+        best_partial: Optional[SearchResult] = None
+        try:
+            for pass_index, weight in enumerate(schedule):
+                if weight is not None:
+                    self.heuristic_calc.weight = weight
+                cost_bound = incumbent.cost if incumbent is not None else None
+                frontier = create_search_strategy(self.search_strategy)
+                try:
+                    goal_node, pass_best, stop_reason = self._search_pass(
+                        original_direct_reqs, initial_conflict_info, max_iterations, executor, jobs, cancel_event,
+                        deadline, cost_bound, start_time, frontier
+                    )
+                finally:
+                    self.last_search_stats["peak_frontier"] = max(self.last_search_stats["peak_frontier"], frontier.peak_size)
+                    self.last_search_stats["dropped"] += frontier.dropped
+                    if frontier.closed_set is not None:
+                        self.last_search_stats["closed_evicted"] += frontier.closed_set.evicted
+                if pass_best is not None and (best_partial is None or self._partial_key(pass_best) < self._partial_key(best_partial)):
+                    best_partial = pass_best
+                if goal_node is not None:
+                    incumbent = self._make_result(goal_node, 0.0, 0, False, start_time)
+                    if len(schedule) > 1:
+                        print(f"  Anytime pass {pass_index + 1}/{len(schedule)} (weight {self.heuristic_calc.weight:g}): "
+                              f"solution with cost {incumbent.cost:.2f} after {self.last_iteration_count} iterations")
+                if goal_node is None:
+                    # Deadline or iteration limit, or the bounded pass proved the incumbent optimal
+                    log.debug("  Search stopped: %s.", stop_reason)
+                    break
+        finally:
+            self.heuristic_calc.weight = original_weight
+            self.last_search_stats["iterations"] = self.last_iteration_count
+            self.last_search_stats["compiles"] = self._compile_count
 
+        self.last_result = incumbent or best_partial
+        if incumbent is None and best_partial is not None:
+            print(f"  Best state reached: h={best_partial.h_score:.2f}, {best_partial.involved_count} involved packages, "
+                  f"{len(best_partial.path) - 1} actions (partial result).")
+        return self.last_result
+
+    def _search_pass(self, original_direct_reqs: FrozenSet[Requirement], initial_conflict_info: ConflictInfo,
+                     max_iterations: int, executor: Optional[ThreadPoolExecutor], jobs: int,
+                     cancel_event: Optional[threading.Event], deadline: Optional[float],
+                     cost_bound: Optional[float], start_time: float, frontier: SearchStrategy) -> \
+            Tuple[Optional[AStarNode], Optional[SearchResult], str]:
+        """
+        One search pass from the initial requirements, expanding nodes in the order `frontier` (a fresh
+        search strategy) gives them, and sharing the iteration count with earlier passes.
+        Returns (goal node or None, best conflicting state expanded, stop reason). With cost_bound,
+        paths costing that much or more are pruned.
+        """
+        initial_h_score = self.heuristic_calc.calculate_h_score(original_direct_reqs, initial_conflict_info, original_direct_reqs)
         start_node = AStarNode(
-            requirements=original_direct_reqs,
+            state=RequirementState.from_requirements(original_direct_reqs),
             g_score=0.0,
             h_score=initial_h_score
         )
 
-        open_set_pq: List[AStarNode] = [start_node]
-        processed_node_g_scores: Dict[FrozenSet[Requirement], float] = {}
+        frontier.push(start_node)
+        closed_set = frontier.create_closed_set()
+        speculative: Dict[FrozenSet[Requirement], Future] = {} # Worker compiles of states not popped yet
+        best_partial: Optional[SearchResult] = None
 
-        print(f"Starting A* search. Max iterations: {max_iterations}. Python: {self.pip_compiler.python_executable}")
-        log_verbose(f"Initial node: f={start_node.f_score:.2f} (g=0, h={initial_h_score:.2f}), reqs: {self._reqs_to_str_summary(start_node.requirements)}")
+        if cost_bound is None:
+            print(f"Starting {frontier.name} search. Max iterations: {max_iterations}. Jobs: {jobs}. Python: {self.pip_compiler.python_executable}")
+        log.debug("Initial node: f=%.2f (g=0, h=%.2f), reqs: %s", start_node.f_score, initial_h_score, lazy(self._reqs_to_str_summary, start_node.requirements))
         if initial_conflict_info.is_conflict:
-            log_verbose(f"  Initial conflict involves: {initial_conflict_info.involved_direct_packages or 'unknown'}")
+            log.debug("  Initial conflict involves: %s", initial_conflict_info.involved_direct_packages or 'unknown')
             if initial_conflict_info.sub_dependency_culprit:
-                log_verbose(f"  Sub-dependency hint: {initial_conflict_info.sub_dependency_culprit}")
+                log.debug("  Sub-dependency hint: %s", initial_conflict_info.sub_dependency_culprit)
 
-        iteration_count = 0
-        while open_set_pq and iteration_count < max_iterations:
-            iteration_count += 1
-            current_node = heapq.heappop(open_set_pq)
+        while frontier and self.last_iteration_count < max_iterations:
+            if deadline is not None and (time.monotonic() >= deadline or (cancel_event is not None and cancel_event.is_set())):
+                print(f"\n>>> DEADLINE: time budget reached after {self.last_iteration_count} iterations. <<<")
+                return None, best_partial, "deadline"
+            self.last_iteration_count += 1
+            iteration_count = self.last_iteration_count
+            pop_start = tracing.clock()
+            current_node = frontier.pop()
+            tracing.record("search.pop", pop_start)
 
-            log_verbose(f"\n--- Iteration {iteration_count}/{max_iterations} ---")
-            log_verbose(f"  Expanding node: f={current_node.f_score:.2f} (g={current_node.g_score:.2f}, h={current_node.h_score:.2f})")
-            log_verbose(f"  Action to this node: '{current_node.last_action}'")
-            log_verbose(f"  Node reqs: {self._reqs_to_str_summary(current_node.requirements)}")
+            log.debug("\n--- Iteration %s/%s ---", iteration_count, max_iterations)
+            log.debug("  Expanding node: f=%.2f (g=%.2f, h=%.2f)", current_node.f_score, current_node.g_score, current_node.h_score)
+            log.debug("  Action to this node: '%s'", current_node.last_action)
+            log.debug("  Node reqs: %s", lazy(self._reqs_to_str_summary, current_node.requirements))
 
-            if current_node.requirements in processed_node_g_scores and \
-               current_node.g_score >= processed_node_g_scores[current_node.requirements]:
-                log_verbose("  (Skipping: already processed this state via an equal or better path)")
+            closed_g_score = closed_set.get_g_score(current_node.state)
+            if closed_g_score is not None and current_node.g_score >= closed_g_score and not frontier.reopened(current_node):
+                log.debug("  (Skipping: already processed this state via an equal or better path)")
                 continue
-            processed_node_g_scores[current_node.requirements] = current_node.g_score
+            closed_set.set_g_score(current_node.state, current_node.g_score)
 
-            current_node_conflict_info = self._get_conflict_info_for_node(current_node.requirements, original_direct_reqs)
+            if executor is not None:
+                # Looked up here, as a serial search would; a speculative compile only stands in for the compile
+                current_node_conflict_info = self._known_conflict_info(current_node.requirements, original_direct_reqs)
+                pending = speculative.pop(current_node.requirements, None)
+                if current_node_conflict_info is None and pending is None:
+                    pending = executor.submit(self._speculative_compile, current_node.requirements, original_direct_reqs,
+                                              cancel_event, self._warm_start_pins(current_node))
+                self._prefetch_frontier(frontier, closed_set, speculative, executor, jobs,
+                                        original_direct_reqs, cancel_event)
+                if current_node_conflict_info is None:
+                    current_node_conflict_info = self._evaluate_node(current_node.requirements, original_direct_reqs,
+                                                                     cancel_event, self._warm_start_pins(current_node),
+                                                                     speculative=pending)
+            else:
+                current_node_conflict_info = self._get_conflict_info_for_node(current_node.requirements, original_direct_reqs, cancel_event,
+                                                                              self._warm_start_pins(current_node))
+            if deadline is not None and cancel_event is not None and cancel_event.is_set():
+                # The compile was cut short by the deadline; its result means nothing
+                print(f"\n>>> DEADLINE: time budget reached after {iteration_count} iterations. <<<")
+                return None, best_partial, "deadline"
 
             if not current_node_conflict_info.is_conflict:
                 print(f"\n>>> SUCCESS: Solution Found after {iteration_count} iterations! <<<")
-                solution_path = reconstruct_path(current_node)
-                return current_node.requirements, solution_path
+                return current_node, best_partial, "solved"
 
-            log_verbose(f"  Conflict persists. Involved: {current_node_conflict_info.involved_direct_packages or 'unknown'}. Sub-dep: {current_node_conflict_info.sub_dependency_culprit}")
-            # Limit error message display length
-            error_msg_sample = current_node_conflict_info.error_message.replace('\n', ' ').replace('\r', '')
-            log_verbose(f"  Error sample: {error_msg_sample[:300]}...")
+            with tracing.span("search.heuristic"):
+                self.heuristic_calc.observe_conflict(current_node_conflict_info)
+                # The node's own conflict, not its parent's (which its queued h came from), and no weight
+                partial_h_score = self.heuristic_calc.unweighted_h_score(current_node.requirements, current_node_conflict_info,
+                                                                         original_direct_reqs)
+            candidate = self._make_result(current_node, partial_h_score, len(current_node_conflict_info.involved_direct_packages),
+                                          True, start_time)
+            if best_partial is None or self._partial_key(candidate) < self._partial_key(best_partial):
+                best_partial = candidate
+            self.last_search_stats["expansions"] += 1
+            log.debug("  Conflict persists. Involved: %s. Sub-dep: %s", current_node_conflict_info.involved_direct_packages or 'unknown', current_node_conflict_info.sub_dependency_culprit)
+            if log.isEnabledFor(logging.DEBUG): # Avoid decompressing the output just to drop the message
+                # Limit error message display length
+                error_msg_sample = current_node_conflict_info.get_output_text()[:400].replace('\n', ' ').replace('\r', '')
+                log.debug("  Error sample: %s...", error_msg_sample[:300])
 
 
-            for neighbor_reqs_set, action_desc, action_cost in self.action_generator.get_neighbors(
+            for neighbor_state, action_desc, action_cost in tracing.traced_iter("search.neighbours", self.action_generator.get_neighbors(
                                                                     current_node,
                                                                     original_direct_reqs,
-                                                                    current_node_conflict_info):
+                                                                    current_node_conflict_info)):
                 tentative_g_score = current_node.g_score + action_cost
+                if cost_bound is not None and tentative_g_score + \
+                   self.heuristic_calc.lower_bound(neighbor_state, current_node_conflict_info) >= cost_bound:
+                    continue # Cannot improve on the solution already found
 
-                if neighbor_reqs_set in processed_node_g_scores and \
-                   tentative_g_score >= processed_node_g_scores[neighbor_reqs_set]:
-                    # log_verbose(f"    Skipping neighbor (already processed better): {self._reqs_to_str_summary(neighbor_reqs_set)}")
+                closed_g_score = closed_set.get_g_score(neighbor_state)
+                if closed_g_score is not None and tentative_g_score >= closed_g_score:
+                    # log.debug("    Skipping neighbor (already processed better): %s", lazy(self._reqs_to_str_summary, neighbor_state.requirements))
                     continue
                 
-                neighbor_h_score = self.heuristic_calc.calculate_h_score(neighbor_reqs_set, current_node_conflict_info, original_direct_reqs)
-                
+                heuristic_start = tracing.clock()
+                neighbor_h_score = self.heuristic_calc.calculate_h_score(neighbor_state, current_node_conflict_info, original_direct_reqs)
+                tracing.record("search.heuristic", heuristic_start)
+
                 neighbor_node = AStarNode(
-                    requirements=neighbor_reqs_set,
+                    state=neighbor_state,
                     g_score=tentative_g_score,
                     h_score=neighbor_h_score,
                     parent=current_node,
                     last_action=action_desc
                 )
-                heapq.heappush(open_set_pq, neighbor_node)
-                log_verbose(f"    Added neighbor to OPEN: f={neighbor_node.f_score:.2f}, g={neighbor_node.g_score:.2f}, h={neighbor_node.h_score:.2f} | Action: '{action_desc}' | Reqs: {self._reqs_to_str_summary(neighbor_node.requirements)}")
+                push_start = tracing.clock()
+                frontier.push(neighbor_node)
+                tracing.record("search.push", push_start)
+                if log.isEnabledFor(logging.DEBUG): # Summarising would materialise the queued state
+                    log.debug("    Added neighbor to OPEN: f=%.2f, g=%.2f, h=%.2f | Action: '%s' | Reqs: %s", neighbor_node.f_score, neighbor_node.g_score, neighbor_node.h_score, action_desc, lazy(self._reqs_to_str_summary, neighbor_node.requirements))
 
-        print(f"\n>>> FAILURE: No solution found after {iteration_count} iterations (max: {max_iterations}). <<<")
-        if open_set_pq:
-            log_verbose(f"  Open set still has {len(open_set_pq)} nodes. Lowest f_score: {open_set_pq[0].f_score:.2f}")
-        else:
-            log_verbose("  Open set is empty.")
-        return None
+        if cost_bound is not None:
+            log.debug("  Anytime pass finished without a solution cheaper than %.2f.", cost_bound)
+            return None, best_partial, "exhausted" if not frontier else "iterations"
+        print(f"\n>>> FAILURE: No solution found after {self.last_iteration_count} iterations (max: {max_iterations}). <<<")
+        if frontier:
+            log.debug("  Open set still has %s nodes. Lowest f_score: %.2f", len(frontier), frontier.best(1)[0].f_score)
+            return None, best_partial, "iterations"
+        log.debug("  Open set is empty.")
+        return None, best_partial, "exhausted"
+
+    @staticmethod
+    def _partial_key(result: SearchResult) -> Tuple[float, int, float]:
+        return result.h_score, result.involved_count, result.cost
+
+    def _make_result(self, node: AStarNode, h_score: float, involved_count: int, partial: bool, start_time: float) -> SearchResult:
+        return SearchResult(
+            requirements=node.requirements,
+            path=reconstruct_path(node),
+            partial=partial,
+            h_score=h_score,
+            involved_count=involved_count,
+            cost=node.g_score,
+            iterations=self.last_iteration_count,
+            elapsed_seconds=time.monotonic() - start_time,
+            weight=self.heuristic_calc.weight
+        )
 
     def _reqs_to_str_summary(self, reqs: FrozenSet[Requirement], limit: int = 5) -> str:
         sorted_reqs = sorted(str(r) for r in reqs)
@@ -0,0 +1,408 @@
+# dependency_resolver_agent/agent_core/search_strategies.py
+"""
+Frontier (open list) policies for the Orchestrator's best-first search. Actions, heuristic, evaluation,
+closed set and goal test stay in the Orchestrator; a strategy only decides which queued node is expanded
+next and which queued nodes are kept at all.
+
+  astar          : f = g + h (weighted A* when HEURISTIC_MODE is "weighted": h already carries the weight)
+  greedy         : h only, g breaks ties (greedy best-first)
+  beam           : level by level, keeping the `beam_width` best nodes (by f) of each level
+  memory-bounded : A* with at most `max_nodes` queued nodes; when full, the worst node is dropped and its
+                   f backed up into its parent, which is re-queued once all its queued children are gone
+                   (SMA*-style), so a forgotten branch can be regenerated later. Its closed set remembers
+                   at most `max_closed` expanded states (least recently used ones are forgotten)
+
+astar, greedy and memory-bounded queue each state at most once (IndexedOpenSet): reaching a queued state
+again only replaces its entry when the new path is cheaper.
+"""
+import heapq
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from dependency_resolver_agent.agent_core.state_manager import AStarNode, ClosedSet, RequirementState
+from dependency_resolver_agent.utils import config_manager as config
+
+# (priority, g, state size, insertion sequence, node): the sequence number is unique, so comparisons are
+# plain tuple comparisons that never reach the node
+HeapEntry = Tuple[float, float, int, int, AStarNode]
+
+
+class IndexedOpenSet:
+    """
+    Binary min-heap of precomputed HeapEntries with a state -> position index, so each state has at most
+    one entry and its priority can be changed in place (decrease-key) or the entry removed.
+    States are indexed by their 64-bit fingerprint; a state whose fingerprint collides with a different
+    queued state is indexed by the state itself.
+    """
+    __slots__ = ("_entries", "_index_keys", "_positions", "_seq")
+
+    def __init__(self):
+        self._entries: List[HeapEntry] = []
+        self._index_keys: List[Union[int, RequirementState]] = []
+        self._positions: Dict[Union[int, RequirementState], int] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _find(self, state: RequirementState) -> Tuple[Union[int, RequirementState], Optional[int]]:
+        index_key: Union[int, RequirementState] = state.fingerprint
+        position = self._positions.get(index_key)
+        if position is not None and self._entries[position][-1].state != state:
+            index_key = state # Fingerprint collision
+            position = self._positions.get(index_key)
+        return index_key, position
+
+    def push(self, node: AStarNode, priority: float) -> Tuple[bool, Optional[AStarNode]]:
+        """
+        Queues node at `priority`. If its state is queued already, the entry is replaced only when node
+        has a lower g. Returns (queued, node it replaced).
+        """
+        index_key, position = self._find(node.state)
+        self._seq += 1
+        entry = (priority, node.g_score, len(node.state), self._seq, node)
+        if position is None:
+            self._entries.append(entry)
+            self._index_keys.append(index_key)
+            self._sift_up(len(self._entries) - 1)
+            return True, None
+        old_entry = self._entries[position]
+        if node.g_score >= old_entry[1]:
+            return False, None
+        self._entries[position] = entry
+        if entry < old_entry:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+        return True, old_entry[-1]
+
+    def pop(self) -> AStarNode:
+        return self.remove_at(0)
+
+    def remove_at(self, position: int) -> AStarNode:
+        entries, index_keys = self._entries, self._index_keys
+        node = entries[position][-1]
+        del self._positions[index_keys[position]]
+        last_entry, last_index_key = entries.pop(), index_keys.pop()
+        if position < len(entries):
+            entries[position], index_keys[position] = last_entry, last_index_key
+            if position > 0 and last_entry < entries[(position - 1) >> 1]:
+                self._sift_up(position)
+            else:
+                self._sift_down(position)
+        return node
+
+    def entry_at(self, position: int) -> HeapEntry:
+        return self._entries[position]
+
+    def entry_of(self, state: RequirementState) -> Optional[HeapEntry]:
+        _index_key, position = self._find(state)
+        return self._entries[position] if position is not None else None
+
+    def position_of(self, entry: HeapEntry) -> Optional[int]:
+        """Where entry sits in the heap, or None once it was popped, removed or replaced."""
+        _index_key, position = self._find(entry[-1].state)
+        if position is None or self._entries[position] is not entry:
+            return None
+        return position
+
+    def smallest(self, count: int) -> List[AStarNode]:
+        return [entry[-1] for entry in heapq.nsmallest(count, self._entries)]
+
+    def _sift_up(self, position: int):
+        entries, index_keys, positions = self._entries, self._index_keys, self._positions
+        entry, index_key = entries[position], index_keys[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry < entries[parent]:
+                break
+            entries[position] = entries[parent]
+            moved_key = index_keys[position] = index_keys[parent]
+            positions[moved_key] = position
+            position = parent
+        entries[position], index_keys[position] = entry, index_key
+        positions[index_key] = position
+
+    def _sift_down(self, position: int):
+        entries, index_keys, positions = self._entries, self._index_keys, self._positions
+        size = len(entries)
+        entry, index_key = entries[position], index_keys[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and entries[child + 1] < entries[child]:
+                child += 1
+            if not entries[child] < entry:
+                break
+            entries[position] = entries[child]
+            moved_key = index_keys[position] = index_keys[child]
+            positions[moved_key] = position
+            position = child
+        entries[position], index_keys[position] = entry, index_key
+        positions[index_key] = position
+
+
+class SearchStrategy(ABC):
+    name = ""
+
+    def __init__(self):
+        self.peak_size = 0 # Most nodes queued at once
+        self.dropped = 0   # Nodes discarded by the strategy (beam cut, memory cap)
+        self.merged = 0    # Pushes of an already queued state (the cheaper path is kept)
+        self.closed_set: Optional[ClosedSet] = None # The pass's closed set, once create_closed_set() made it
+        self._seq = 0
+
+    def priority(self, node: AStarNode) -> float:
+        return node.f_score
+
+    def _entry(self, node: AStarNode) -> HeapEntry:
+        self._seq += 1
+        return self.priority(node), node.g_score, len(node.state), self._seq, node
+
+    @abstractmethod
+    def push(self, node: AStarNode):
+        """Queues node (or drops it, or keeps a cheaper queued path to its state)."""
+
+    @abstractmethod
+    def pop(self) -> AStarNode:
+        """Removes and returns the node to expand next."""
+
+    @abstractmethod
+    def best(self, count: int) -> List[AStarNode]:
+        """The next `count` nodes pop() would return, as far as known now (speculative prefetch)."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Nodes queued."""
+
+    def reopened(self, node: AStarNode) -> bool:
+        """True if node is an already expanded state queued again on purpose (skips the closed-set check)."""
+        return False
+
+    def create_closed_set(self) -> ClosedSet:
+        """The closed set for a search pass with this frontier (unbounded unless the strategy bounds memory)."""
+        self.closed_set = ClosedSet()
+        return self.closed_set
+
+    def _track_size(self):
+        size = len(self)
+        if size > self.peak_size:
+            self.peak_size = size
+
+
+class AStarStrategy(SearchStrategy):
+    name = "astar"
+
+    def __init__(self):
+        super().__init__()
+        self._open = IndexedOpenSet()
+
+    def push(self, node: AStarNode):
+        queued, replaced = self._open.push(node, self.priority(node))
+        if not queued or replaced is not None:
+            self.merged += 1
+        self._track_size()
+
+    def pop(self) -> AStarNode:
+        return self._open.pop()
+
+    def best(self, count: int) -> List[AStarNode]:
+        return self._open.smallest(count)
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+
+class GreedyBestFirstStrategy(AStarStrategy):
+    name = "greedy"
+
+    def priority(self, node: AStarNode) -> float:
+        return node.h_score
+
+
+class BeamStrategy(SearchStrategy):
+    name = "beam"
+
+    def __init__(self, beam_width: int = config.SEARCH_BEAM_WIDTH):
+        super().__init__()
+        if beam_width < 1:
+            raise ValueError(f"Beam width must be at least 1 (got {beam_width})")
+        self.beam_width = beam_width
+        self._level: List[HeapEntry] = []      # Entries of the current level, a heap
+        self._next_level: List[HeapEntry] = [] # Children generated while expanding it
+
+    def push(self, node: AStarNode):
+        self._next_level.append(self._entry(node))
+        self._track_size()
+
+    def _advance(self):
+        if len(self._next_level) > self.beam_width:
+            self.dropped += len(self._next_level) - self.beam_width
+            self._next_level = heapq.nsmallest(self.beam_width, self._next_level)
+        self._level = self._next_level
+        heapq.heapify(self._level)
+        self._next_level = []
+
+    def pop(self) -> AStarNode:
+        if not self._level:
+            self._advance()
+        return heapq.heappop(self._level)[-1]
+
+    def best(self, count: int) -> List[AStarNode]:
+        nodes = [entry[-1] for entry in heapq.nsmallest(count, self._level)]
+        if len(nodes) < count:
+            nodes.extend(entry[-1] for entry in heapq.nsmallest(min(count - len(nodes), self.beam_width), self._next_level))
+        return nodes
+
+    def __len__(self) -> int:
+        return len(self._level) + len(self._next_level)
+
+
+class MemoryBoundedStrategy(SearchStrategy):
+    name = "memory-bounded"
+
+    def __init__(self, max_nodes: int = config.SEARCH_MAX_NODES, max_closed: int = config.SEARCH_MAX_CLOSED):
+        super().__init__()
+        if max_nodes < 2:
+            raise ValueError(f"The node cap must be at least 2 (got {max_nodes})")
+        if max_closed < 1:
+            raise ValueError(f"The closed set cap must be at least 1 (got {max_closed})")
+        self.max_nodes = max_nodes
+        self.max_closed = max_closed
+        self._open = IndexedOpenSet()
+        # Max-heap of the queued entries by negated key, for dropping the worst in O(log n); entries that
+        # left the open set are skipped lazily and the heap is rebuilt when they dominate
+        self._worst: List[Tuple[float, float, int, int, HeapEntry]] = []
+        self._queued_children: Dict[int, int] = {}       # id(parent) -> children still queued
+        self._forgotten_f: Dict[int, float] = {}         # id(parent) -> best f among its dropped children
+        self._reopened: Dict[int, AStarNode] = {}        # Re-queued parents, by id
+        self._popped_reopened: Optional[AStarNode] = None # The last node popped, if it was a re-queued parent
+        # id(re-queued copy) -> parent it copies; holding the parent keeps its id from being reused while the copy is queued
+        self._revived_from: Dict[int, AStarNode] = {}
+        self._revived_parents: Set[int] = set()          # ids of the parents in _revived_from
+
+    def push(self, node: AStarNode):
+        if self._queue(node):
+            while len(self._open) > self.max_nodes:
+                self._drop_worst()
+        self._track_size()
+
+    def _queue(self, node: AStarNode) -> bool:
+        queued, replaced = self._open.push(node, self.priority(node))
+        if not queued or replaced is not None:
+            self.merged += 1
+        if not queued:
+            return False
+        entry = self._open.entry_of(node.state)
+        heapq.heappush(self._worst, (-entry[0], -entry[1], -entry[2], -entry[3], entry))
+        if len(self._worst) > 2 * len(self._open) + 64:
+            self._rebuild_worst()
+        if node.parent is not None:
+            self._queued_children[id(node.parent)] = self._queued_children.get(id(node.parent), 0) + 1
+        if replaced is not None:
+            # Superseded by a cheaper path to the same state: it leaves the queue without being forgotten
+            self._forget_entry(replaced)
+            if replaced.parent is not None:
+                self._child_left(replaced.parent)
+        return True
+
+    def _forget_entry(self, node: AStarNode):
+        self._reopened.pop(id(node), None)
+        self._forget_revival(node)
+
+    def _forget_revival(self, node: AStarNode):
+        parent = self._revived_from.pop(id(node), None)
+        if parent is not None:
+            self._revived_parents.discard(id(parent))
+
+    def _rebuild_worst(self):
+        entries = [self._open.entry_at(i) for i in range(len(self._open))]
+        self._worst = [(-entry[0], -entry[1], -entry[2], -entry[3], entry) for entry in entries]
+        heapq.heapify(self._worst)
+
+    def _drop_worst(self):
+        # The start node is never dropped (a revived parent can be the worst node at once; dropping it
+        # moves the backed-up f one level up)
+        kept = []
+        position = None
+        while self._worst:
+            item = heapq.heappop(self._worst)
+            position = self._open.position_of(item[-1])
+            if position is None:
+                continue # Popped or replaced since it was queued
+            if item[-1][-1].parent is None:
+                kept.append(item)
+                position = None
+                continue
+            break
+        for item in kept:
+            heapq.heappush(self._worst, item)
+        if position is None: # Only start nodes queued
+            item = heapq.heappop(self._worst)
+            position = self._open.position_of(item[-1])
+        worst = self._open.remove_at(position)
+        self.dropped += 1
+        self._forget_entry(worst)
+        if worst.parent is not None:
+            parent_id = id(worst.parent)
+            self._forgotten_f[parent_id] = min(self._forgotten_f.get(parent_id, float("inf")), worst.f_score)
+            self._child_left(worst.parent)
+
+    def _child_left(self, parent: AStarNode):
+        parent_id = id(parent)
+        remaining = self._queued_children.get(parent_id, 1) - 1
+        if remaining > 0:
+            self._queued_children[parent_id] = remaining
+            return
+        self._queued_children.pop(parent_id, None)
+        backed_up_f = self._forgotten_f.pop(parent_id, None)
+        if backed_up_f is None or parent_id in self._revived_parents:
+            return # Nothing forgotten, or a copy of the parent is queued already
+        # No child of the parent is queued any more, but some were dropped: queue the parent again at the
+        # best f it has forgotten, so expanding it regenerates them
+        revived = AStarNode(state=parent.state, g_score=parent.g_score, h_score=max(parent.h_score, backed_up_f - parent.g_score),
+                            parent=parent.parent, last_action=parent.last_action)
+        self._reopened[id(revived)] = revived
+        self._revived_from[id(revived)] = parent
+        self._revived_parents.add(parent_id)
+        if not self._queue(revived):
+            self._forget_entry(revived) # The state is queued already, via a path at least as cheap
+
+    def pop(self) -> AStarNode:
+        node = self._open.pop()
+        self._popped_reopened = self._reopened.pop(id(node), None)
+        self._forget_revival(node)
+        if node.parent is not None:
+            self._child_left(node.parent)
+        return node
+
+    def reopened(self, node: AStarNode) -> bool:
+        return node is self._popped_reopened
+
+    def best(self, count: int) -> List[AStarNode]:
+        return self._open.smallest(count)
+
+    def create_closed_set(self) -> ClosedSet:
+        self.closed_set = ClosedSet(max_entries=self.max_closed)
+        return self.closed_set
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+
+SEARCH_STRATEGIES = {
+    AStarStrategy.name: AStarStrategy,
+    GreedyBestFirstStrategy.name: GreedyBestFirstStrategy,
+    BeamStrategy.name: BeamStrategy,
+    MemoryBoundedStrategy.name: MemoryBoundedStrategy,
+}
+
+
+def create_search_strategy(name: Optional[str] = None) -> SearchStrategy:
+    """A fresh frontier for one search pass; parameters come from config (SEARCH_BEAM_WIDTH, SEARCH_MAX_NODES, SEARCH_MAX_CLOSED)."""
+    name = name or config.SEARCH_STRATEGY
+    strategy_class = SEARCH_STRATEGIES.get(name)
+    if strategy_class is None:
+        raise ValueError(f"Unknown search strategy '{name}'. Expected one of: {', '.join(SEARCH_STRATEGIES)}")
+    return strategy_class()
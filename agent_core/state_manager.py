@@ -1,39 +1,195 @@
 # dependency_resolver_agent/agent_core/state_manager.py
-from dataclasses import dataclass, field
-from typing import FrozenSet, Optional, List, Tuple
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, List, Tuple
 
 from dependency_resolver_agent.data_models.requirement import Requirement
 
-@dataclass
+# Zobrist keys: two fixed pseudo-random 64-bit values per Requirement, one for the fingerprint and an
+# independent one for its check word. Cached on the interned Requirement, so they live exactly as long as it does.
+def zobrist_keys(req: Requirement) -> Tuple[int, int]:
+    return req.zobrist_keys()
+
+def zobrist_key(req: Requirement) -> int:
+    return zobrist_keys(req)[0]
+
+
+class RequirementState:
+    """
+    A set of requirements with an incrementally maintained 64-bit Zobrist fingerprint (XOR of the
+    members' keys) and a second, independent 64-bit check word, which tells apart states whose
+    fingerprints collide without keeping the states themselves. replace() derives a one-package change in O(1) by recording only
+    the delta against its base; the full frozenset is built lazily, the first time it is needed
+    (i.e. when the node is actually evaluated or expanded, not when it is merely queued).
+    """
+    __slots__ = ("fingerprint", "check", "_size", "_requirements", "_base", "_removed", "_added")
+
+    def __init__(self, fingerprint: int, check: int, size: int, requirements: Optional[FrozenSet[Requirement]] = None,
+                 base: Optional['RequirementState'] = None, removed: Optional[Requirement] = None,
+                 added: Optional[Requirement] = None):
+        self.fingerprint = fingerprint
+        self.check = check
+        self._size = size
+        self._requirements = requirements
+        self._base = base
+        self._removed = removed
+        self._added = added
+
+    @classmethod
+    def from_requirements(cls, requirements: Iterable[Requirement]) -> 'RequirementState':
+        reqs = frozenset(requirements)
+        fingerprint = check = 0
+        for req in reqs:
+            key, check_key = req.zobrist_keys()
+            fingerprint ^= key
+            check ^= check_key
+        return cls(fingerprint, check, len(reqs), requirements=reqs)
+
+    def replace(self, old_req: Optional[Requirement], new_req: Optional[Requirement]) -> 'RequirementState':
+        """New state with old_req removed and/or new_req added (either may be None). O(1)."""
+        fingerprint = self.fingerprint
+        check = self.check
+        size = self._size
+        if old_req is not None:
+            key, check_key = old_req.zobrist_keys()
+            fingerprint ^= key
+            check ^= check_key
+            size -= 1
+        if new_req is not None:
+            key, check_key = new_req.zobrist_keys()
+            fingerprint ^= key
+            check ^= check_key
+            size += 1
+        return RequirementState(fingerprint, check, size, base=self, removed=old_req, added=new_req)
+
+    @property
+    def requirements(self) -> FrozenSet[Requirement]:
+        if self._requirements is None:
+            base_reqs = self._base.requirements
+            if self._removed is not None:
+                base_reqs = base_reqs - {self._removed}
+            if self._added is not None:
+                base_reqs = base_reqs | {self._added}
+            self._requirements = base_reqs
+            self._base = self._removed = self._added = None # Drop the delta chain once materialised
+        return self._requirements
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Requirement]:
+        return iter(self.requirements)
+
+    def __contains__(self, req: Requirement) -> bool:
+        if self._requirements is not None:
+            return req in self._requirements
+        if req == self._added:
+            return True
+        if req == self._removed:
+            return False
+        return req in self._base
+
+    def __hash__(self):
+        return self.fingerprint
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, RequirementState):
+            return NotImplemented
+        # Fingerprints differ for almost every unequal pair; the full compare guards against collisions
+        return (self.fingerprint == other.fingerprint and self.check == other.check and self._size == other._size
+                and self.requirements == other.requirements)
+
+
+class ClosedSet:
+    """
+    Best g-score per processed state, keyed by 64-bit fingerprint and holding only (check word, g-score),
+    not the state. A fingerprint hit whose check word differs is a genuine collision: such states are
+    kept, exactly, in a small frozenset-keyed table. (Two different states agreeing on both 64-bit
+    words, a 2^-128 event, would be taken for the same state.)
+    With max_entries, the least recently used states are forgotten beyond that many; the search then
+    treats a forgotten state as new and expands it again if it is reached again.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(f"The closed set cap must be at least 1 (got {max_entries})")
+        self.max_entries = max_entries
+        self._by_fingerprint: Dict[int, Tuple[int, float]] = OrderedDict() if max_entries is not None else {}
+        self._collided: Dict[FrozenSet[Requirement], float] = {}
+        self.collisions = 0
+        self.evicted = 0
+
+    def get_g_score(self, state: RequirementState) -> Optional[float]:
+        hit = self._by_fingerprint.get(state.fingerprint)
+        if hit is None:
+            return None
+        check, g_score = hit
+        if check == state.check:
+            if self.max_entries is not None:
+                self._by_fingerprint.move_to_end(state.fingerprint)
+            return g_score
+        return self._collided.get(state.requirements) if self._collided else None
+
+    def set_g_score(self, state: RequirementState, g_score: float):
+        hit = self._by_fingerprint.get(state.fingerprint)
+        if hit is None or hit[0] == state.check:
+            self._by_fingerprint[state.fingerprint] = (state.check, g_score)
+            if self.max_entries is not None:
+                self._by_fingerprint.move_to_end(state.fingerprint)
+                while len(self._by_fingerprint) > self.max_entries:
+                    self._by_fingerprint.popitem(last=False)
+                    self.evicted += 1
+        else:
+            if state.requirements not in self._collided:
+                self.collisions += 1
+            self._collided[state.requirements] = g_score
+
+    def __contains__(self, state: RequirementState) -> bool:
+        return self.get_g_score(state) is not None
+
+    def __len__(self) -> int:
+        return len(self._by_fingerprint) + len(self._collided)
+
+
 class AStarNode:
-    requirements: FrozenSet[Requirement]
-    g_score: float = float('inf')
-    h_score: float = float('inf')
-    parent: Optional['AStarNode'] = None
-    last_action: str = "Initial state" # Description of the action that led to this node
+    """
+    Search node. Scores are fixed at construction (a better path makes a new node), so f is stored rather
+    than recomputed on every heap comparison; __slots__ keeps large frontiers small.
+    """
+    __slots__ = ("state", "g_score", "h_score", "f_score", "parent", "last_action")
+
+    def __init__(self, state: RequirementState, g_score: float = float('inf'), h_score: float = float('inf'),
+                 parent: Optional['AStarNode'] = None, last_action: str = "Initial state"):
+        self.state = state
+        self.g_score = g_score
+        self.h_score = h_score
+        self.f_score = g_score + h_score
+        self.parent = parent
+        self.last_action = last_action # Description of the action that led to this node
 
     @property
-    def f_score(self) -> float:
-        return self.g_score + self.h_score
+    def requirements(self) -> FrozenSet[Requirement]:
+        return self.state.requirements
+
+    def sort_key(self) -> Tuple[float, float, int]:
+        """(f, g, state size): lower f first, then lower g (closer to start), then the simpler state."""
+        return self.f_score, self.g_score, len(self.state)
 
-    # For heapq priority queue
     def __lt__(self, other: 'AStarNode'):
-        if self.f_score != other.f_score:
-            return self.f_score < other.f_score
-        # Tie-breaking: prefer lower g_score (closer to start with same f_score)
-        if self.g_score != other.g_score:
-            return self.g_score < other.g_score
-        # Further tie-breaking: prefer fewer requirements (simpler state)
-        return len(self.requirements) < len(other.requirements)
+        return self.sort_key() < other.sort_key()
 
     # For using in sets/dictionary keys (processed_node_g_scores)
     def __hash__(self):
-        return hash(self.requirements)
+        return hash(self.state)
 
     def __eq__(self, other):
         if not isinstance(other, AStarNode):
             return False
-        return self.requirements == other.requirements
+        return self.state == other.state
+
+    def __repr__(self):
+        return f"AStarNode(f={self.f_score:.2f}, g={self.g_score:.2f}, h={self.h_score:.2f}, action={self.last_action!r})"
 
 def reconstruct_path(node: AStarNode) -> List[Tuple[str, FrozenSet[Requirement]]]:
     path = []
@@ -41,4 +197,4 @@ def reconstruct_path(node: AStarNode) -> List[Tuple[str, FrozenSet[Requirement]]
     while current:
         path.append((current.last_action, current.requirements))
         current = current.parent
-    return path[::-1] # Return from start to goal
\ No newline at end of file
+    return path[::-1] # Return from start to goal
@@ -0,0 +1,117 @@
+# dependency_resolver_agent/agent_core/subsumption_index.py
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from dependency_resolver_agent.data_models.requirement import Requirement
+from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
+
+
+class SubsumptionIndex:
+    """
+    Remembers requirement sets with a known outcome and answers implication queries:
+      - any superset of an unsatisfiable set is unsatisfiable (adding requirements only adds constraints)
+      - any subset of a satisfiable set is satisfiable (the same pins still work)
+    Sets are stored as ids in inverted lists keyed by Requirement, so a query only touches
+    the known sets that share at least one requirement with the queried one.
+    """
+
+    def __init__(self):
+        self._unsat_sets: List[Tuple[FrozenSet[Requirement], ConflictInfo]] = []
+        self._unsat_postings: Dict[Requirement, List[int]] = {}
+        self._sat_sets: List[FrozenSet[Requirement]] = []
+        self._sat_postings: Dict[Requirement, List[int]] = {}
+        self._lock = threading.Lock()
+        self.inferred_unsat = 0
+        self.inferred_sat = 0
+
+    def add_unsatisfiable(self, requirements_set: FrozenSet[Requirement], conflict_info: ConflictInfo):
+        with self._lock:
+            if self._find_unsat_subset(requirements_set) is not None:
+                return # Already implied by a smaller set
+            set_id = len(self._unsat_sets)
+            self._unsat_sets.append((requirements_set, conflict_info))
+            for req in requirements_set:
+                self._unsat_postings.setdefault(req, []).append(set_id)
+
+    def add_satisfiable(self, requirements_set: FrozenSet[Requirement]):
+        with self._lock:
+            if self._find_sat_superset(requirements_set) is not None:
+                return # Already implied by a larger set
+            set_id = len(self._sat_sets)
+            self._sat_sets.append(requirements_set)
+            for req in requirements_set:
+                self._sat_postings.setdefault(req, []).append(set_id)
+
+    def _find_unsat_subset(self, requirements_set: FrozenSet[Requirement]) -> Optional[int]:
+        # A known set U is a subset of the query iff every one of U's requirements is hit
+        hits: Dict[int, int] = {}
+        for req in requirements_set:
+            for set_id in self._unsat_postings.get(req, ()):
+                count = hits.get(set_id, 0) + 1
+                if count == len(self._unsat_sets[set_id][0]):
+                    return set_id
+                hits[set_id] = count
+        return None
+
+    def _find_sat_superset(self, requirements_set: FrozenSet[Requirement]) -> Optional[int]:
+        if not requirements_set:
+            return 0 if self._sat_sets else None
+        # Only sets containing the rarest requirement of the query can be supersets
+        postings = [self._sat_postings.get(req) for req in requirements_set]
+        if any(p is None for p in postings):
+            return None
+        for set_id in min(postings, key=len):
+            if requirements_set <= self._sat_sets[set_id]:
+                return set_id
+        return None
+
+    def infer(self, requirements_set: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
+        """Returns the implied outcome for requirements_set, or None if it has to be compiled."""
+        with self._lock:
+            unsat_id = self._find_unsat_subset(requirements_set)
+            if unsat_id is not None:
+                self.inferred_unsat += 1
+                core, core_info = self._unsat_sets[unsat_id]
+                inferred = ConflictInfo(
+                    is_conflict=True,
+                    error_message=core_info.error_message,
+                    involved_direct_packages=set(core_info.involved_direct_packages),
+                    sub_dependency_culprit=core_info.sub_dependency_culprit,
+                    sub_dependency_culprits=list(core_info.sub_dependency_culprits),
+                    conflicting_constraints=list(core_info.conflicting_constraints)
+                )
+                inferred.output_ref = core_info.output_ref # Same failure report as the subset it came from
+                return inferred
+            if self._find_sat_superset(requirements_set) is not None:
+                self.inferred_sat += 1
+                return ConflictInfo(is_conflict=False)
+        return None
+
+    def implies(self, requirements_set: FrozenSet[Requirement]) -> bool:
+        """Whether infer() would answer, without building the result or counting it."""
+        with self._lock:
+            return self._find_unsat_subset(requirements_set) is not None or \
+                self._find_sat_superset(requirements_set) is not None
+
+    @property
+    def compiles_avoided(self) -> int:
+        return self.inferred_unsat + self.inferred_sat
+
+    def clear(self):
+        with self._lock:
+            self._unsat_sets.clear()
+            self._unsat_postings.clear()
+            self._sat_sets.clear()
+            self._sat_postings.clear()
+            self.inferred_unsat = 0
+            self.inferred_sat = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "known_unsatisfiable": len(self._unsat_sets),
+                "known_satisfiable": len(self._sat_sets),
+                "inferred_unsatisfiable": self.inferred_unsat,
+                "inferred_satisfiable": self.inferred_sat,
+                "compiles_avoided": self.inferred_unsat + self.inferred_sat,
+            }
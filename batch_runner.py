@@ -0,0 +1,221 @@
+# dependency_resolver_agent/batch_runner.py
+"""
+Batch mode: solves every requirements file of a directory (or listed in a manifest) in one process.
+Solves run concurrently and share the evaluation cache and the PyPIService metadata; each keeps its own
+conflict-signature cache and subsumption index, whose entries carry the involved packages of its direct
+requirements. The number of compiles running at any time is capped by a global worker budget.
+One JSON line per input is streamed to the output as soon as that input finishes.
+
+Run: python -m dependency_resolver_agent.batch_runner <dir-or-manifest> --output results.jsonl --workers 8
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, FrozenSet, IO, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from dependency_resolver_agent.data_models.requirement import Requirement
+from dependency_resolver_agent.agent_core.search_strategies import SEARCH_STRATEGIES
+from dependency_resolver_agent.tooling.pypi_service import PyPIService
+from dependency_resolver_agent.tooling.compiler_factory import create_compiler_service
+from dependency_resolver_agent.tooling.conflict_parser_factory import create_configured_llm_parser
+from dependency_resolver_agent.utils.conflict_signature import ConflictSignatureCache
+from dependency_resolver_agent.utils import config_manager as config
+from dependency_resolver_agent.main import build_orchestrator, enable_configured_persistent_cache, open_configured_metadata_index
+
+REQUIREMENTS_FILE_SUFFIXES = (".txt", ".in")
+# How often a compile queued for a worker slot checks its solve's cancel event and deadline
+BUDGET_POLL_SECONDS = 0.05
+
+
+def discover_inputs(source: str) -> List[str]:
+    """
+    Requirements files to solve. A directory is searched recursively for requirements*.txt / requirements*.in;
+    any other path is read as a manifest with one file path per line (relative to the manifest, '#' comments).
+    """
+    if os.path.isdir(source):
+        found = []
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(".")) # Skip .git, .venv, ...
+            for filename in filenames:
+                if filename.startswith("requirements") and filename.endswith(REQUIREMENTS_FILE_SUFFIXES):
+                    found.append(os.path.join(dirpath, filename))
+        return sorted(found)
+    base_dir = os.path.dirname(os.path.abspath(source))
+    inputs = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                inputs.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return inputs
+
+
+class BudgetedCompilerService:
+    """
+    Per-solve view of the shared compiler: waits for a slot of the global worker budget before compiling
+    and accounts the compiles and compile time of its own solve. The wait ends early, without compiling,
+    when the solve is cancelled or its deadline (time.monotonic() value) passes.
+    """
+
+    def __init__(self, compiler, budget: threading.Semaphore, deadline: Optional[float] = None):
+        self.compiler = compiler
+        self.python_executable = compiler.python_executable
+        self.budget = budget
+        self.deadline = deadline
+        self.compiles = 0
+        self.compile_seconds = 0.0
+        self.budget_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def run_compile(self, requirements_set: FrozenSet[Requirement], cancel_event: Optional[threading.Event] = None,
+                    seed_pins: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str]:
+        wait_start = time.perf_counter()
+        if not self._acquire_slot(cancel_event):
+            with self._lock:
+                self.budget_wait_seconds += time.perf_counter() - wait_start
+            return False, "", "Error: pip-compile cancelled." # Cancelled or out of time while queued for a slot
+        start = time.perf_counter()
+        try:
+            return self.compiler.run_compile(requirements_set, cancel_event=cancel_event, seed_pins=seed_pins)
+        finally:
+            self.budget.release()
+            end = time.perf_counter()
+            with self._lock:
+                self.compiles += 1
+                self.compile_seconds += end - start
+                self.budget_wait_seconds += start - wait_start
+
+    def _acquire_slot(self, cancel_event: Optional[threading.Event]) -> bool:
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+            timeout = BUDGET_POLL_SECONDS
+            if self.deadline is not None:
+                remaining = self.deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                timeout = min(timeout, remaining)
+            if self.budget.acquire(timeout=timeout):
+                return True
+
+
+class BatchRunner:
+    def __init__(self, pypi_service: PyPIService, compiler, workers: int = config.BATCH_WORKERS,
+                 concurrent_solves: Optional[int] = None, jobs_per_solve: int = 1,
+                 max_iterations: int = config.MAX_ASTAR_ITERATIONS, llm_parser=None,
+                 time_budget_seconds: float = config.SOLVE_TIME_BUDGET_SECONDS,
+                 anytime_weights: Tuple[float, ...] = config.ANYTIME_WEIGHTS,
+                 search_strategy: str = config.SEARCH_STRATEGY):
+        self.pypi_service = pypi_service
+        self.compiler = compiler
+        self.workers = max(1, workers)
+        self.concurrent_solves = max(1, concurrent_solves or self.workers)
+        self.jobs_per_solve = max(1, jobs_per_solve)
+        self.max_iterations = max_iterations
+        self.llm_parser = llm_parser
+        self.time_budget_seconds = time_budget_seconds or None # Per input
+        self.anytime_weights = anytime_weights
+        self.search_strategy = search_strategy
+        self.budget = threading.BoundedSemaphore(self.workers)
+        self._output_lock = threading.Lock()
+
+    def solve_file(self, path: str, submitted_at: float) -> Dict[str, Any]:
+        started_at = time.perf_counter()
+        result: Dict[str, Any] = {"input": path, "queued_seconds": round(started_at - submitted_at, 4)}
+        deadline = time.monotonic() + self.time_budget_seconds if self.time_budget_seconds is not None else None
+        compiler = BudgetedCompilerService(self.compiler, self.budget, deadline)
+        try:
+            with open(path, encoding="utf-8") as f:
+                requirements_text = f.read()
+            orchestrator = build_orchestrator(self.pypi_service, compiler, self.llm_parser, self.search_strategy)
+            # Compile outcomes are shared through the evaluation cache, but parses name the involved direct
+            # requirements, so the signature cache and the subsumption index (a fresh one) stay per solve
+            orchestrator.signature_cache = ConflictSignatureCache(max_entries=config.CONFLICT_SIGNATURE_CACHE_MAX_ENTRIES)
+            orchestrator.reparse_cached_failures = True
+            search_result = orchestrator.solve_anytime(requirements_text, time_budget_seconds=self.time_budget_seconds,
+                                                       max_iterations=self.max_iterations, jobs=self.jobs_per_solve,
+                                                       weights=self.anytime_weights)
+            if search_result is None:
+                result["status"] = "no_solution"
+            else:
+                result["status"] = "partial" if search_result.partial else "solved"
+                # For a partial result: the closest state reached, which still conflicts
+                result["solution"] = sorted(str(r) for r in search_result.requirements)
+                result["path"] = [action for action, _ in search_result.path[1:]]
+                result["cost"] = round(search_result.cost, 4)
+                if search_result.partial:
+                    result["involved_packages"] = search_result.involved_count
+            result["iterations"] = orchestrator.last_iteration_count
+            result["expansions"] = orchestrator.last_search_stats["expansions"]
+            result["peak_frontier"] = orchestrator.last_search_stats["peak_frontier"]
+        except Exception as e: # One bad input must not stop the batch
+            result["status"] = "error"
+            result["error"] = f"{type(e).__name__}: {e}"
+            result["traceback"] = traceback.format_exc()
+        result["compiles"] = compiler.compiles
+        result["compile_seconds"] = round(compiler.compile_seconds, 4)
+        result["budget_wait_seconds"] = round(compiler.budget_wait_seconds, 4)
+        result["wall_seconds"] = round(time.perf_counter() - started_at, 4)
+        return result
+
+    def run(self, inputs: List[str], output: IO[str]) -> Dict[str, int]:
+        """Solves all inputs; writes one JSON line per input to `output` in completion order."""
+        counts = {"solved": 0, "partial": 0, "no_solution": 0, "error": 0}
+        submitted_at = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrent_solves, thread_name_prefix="batch-solve") as executor:
+            futures = [executor.submit(self.solve_file, path, submitted_at) for path in inputs]
+            for future in as_completed(futures):
+                result = future.result()
+                counts[result["status"]] += 1
+                with self._output_lock:
+                    output.write(json.dumps(result) + "\n")
+                    output.flush()
+        return counts
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Solve many requirements files in one process.")
+    arg_parser.add_argument("source", help="Directory to search for requirements*.txt/.in, or a manifest file listing paths")
+    arg_parser.add_argument("--output", default="-", help="JSONL results file ('-' for stdout)")
+    arg_parser.add_argument("--workers", type=int, default=config.BATCH_WORKERS, help="Global cap on concurrent compiles")
+    arg_parser.add_argument("--concurrent-solves", type=int, default=None, help="Inputs solved at the same time (default: --workers)")
+    arg_parser.add_argument("--jobs", type=int, default=1, help="Speculative compile workers per solve")
+    arg_parser.add_argument("--max-iterations", type=int, default=config.MAX_ASTAR_ITERATIONS)
+    arg_parser.add_argument("--time-budget", type=float, default=config.SOLVE_TIME_BUDGET_SECONDS,
+                            help="Seconds per input; at the deadline the best state so far is reported as 'partial' (0 = no limit)")
+    arg_parser.add_argument("--anytime-weights", default=",".join(f"{w:g}" for w in config.ANYTIME_WEIGHTS),
+                            help="Decreasing heuristic weights for anytime search, e.g. 3,2,1.5,1")
+    arg_parser.add_argument("--strategy", default=config.SEARCH_STRATEGY, choices=sorted(SEARCH_STRATEGIES),
+                            help="Search strategy (beam width and node caps come from SEARCH_* settings)")
+    args = arg_parser.parse_args()
+
+    batch_inputs = discover_inputs(args.source)
+    # solve() reports progress on stdout; keep stdout for the JSONL stream only
+    result_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    with contextlib.redirect_stdout(sys.stderr):
+        enable_configured_persistent_cache(config.DEFAULT_PYTHON_EXECUTABLE)
+        batch_pypi_service = PyPIService(metadata_index=open_configured_metadata_index())
+        batch_llm_parser = create_configured_llm_parser()
+        runner = BatchRunner(batch_pypi_service, create_compiler_service(config.COMPILER_BACKEND),
+                             workers=args.workers, concurrent_solves=args.concurrent_solves,
+                             jobs_per_solve=args.jobs, max_iterations=args.max_iterations, llm_parser=batch_llm_parser,
+                             time_budget_seconds=args.time_budget,
+                             anytime_weights=tuple(float(w) for w in args.anytime_weights.split(",") if w.strip()),
+                             search_strategy=args.strategy)
+        print(f"Batch: {len(batch_inputs)} inputs, {runner.workers} compile workers, {runner.concurrent_solves} concurrent solves")
+        batch_start = time.perf_counter()
+        batch_counts = runner.run(batch_inputs, result_stream)
+        print(f"Batch finished in {time.perf_counter() - batch_start:.1f}s: {batch_counts['solved']} solved, "
+              f"{batch_counts['partial']} partial, {batch_counts['no_solution']} without solution, {batch_counts['error']} errors")
+    if result_stream is not sys.stdout:
+        result_stream.close()
@@ -0,0 +1 @@
+# dependency_resolver_agent/benchmarks/__init__.py
@@ -0,0 +1,251 @@
+# dependency_resolver_agent/benchmarks/end_to_end.py
+"""
+End-to-end benchmark: Orchestrator.solve over a synthetic conflict corpus, compiled offline by
+the in-process resolver against a generated metadata index (no pip-compile, no network).
+Per case it records wall time (also split by phase, see utils/tracing.py), A* iterations, compiles,
+evaluation-cache hit rate and peak traced memory, writes them as JSON and optionally compares them
+with a stored baseline.
+
+Run: python -m dependency_resolver_agent.benchmarks.end_to_end --baseline benchmarks/end_to_end_baseline.json
+Compiles, iterations and solutions are deterministic and compared exactly; time and memory are
+compared with --tolerance because they depend on the machine.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from dependency_resolver_agent.benchmarks.synthetic_universe import ConflictCase, generate_conflict_cases, generate_universe
+from dependency_resolver_agent.data_models.requirement import Requirement
+from dependency_resolver_agent.agent_core.action_generator import ActionGenerator
+from dependency_resolver_agent.agent_core.heuristic_calculator import HeuristicCalculator
+from dependency_resolver_agent.agent_core.feasibility_checker import FeasibilityChecker
+from dependency_resolver_agent.agent_core.orchestrator import Orchestrator
+from dependency_resolver_agent.agent_core.search_strategies import SEARCH_STRATEGIES
+from dependency_resolver_agent.tooling.inprocess_resolver_service import InProcessResolverService
+from dependency_resolver_agent.tooling.pypi_service import PyPIService
+from dependency_resolver_agent.tooling.regex_conflict_parser import RegexConflictParser
+from dependency_resolver_agent.utils import cache_manager, tracing
+from dependency_resolver_agent.utils import config_manager as config
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "end_to_end_baseline.json")
+# Differences below these are noise, whatever the relative tolerance says
+MIN_SECONDS_REGRESSION = 0.05
+MIN_BYTES_REGRESSION = 256 * 1024
+
+
+class CountingCompilerService:
+    """Wraps a compiler service and counts run_compile calls (i.e. cache misses that really compiled)."""
+
+    def __init__(self, compiler):
+        self.compiler = compiler
+        self.python_executable = compiler.python_executable
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def run_compile(self, requirements_set: FrozenSet[Requirement], cancel_event: Optional[threading.Event] = None,
+                    seed_pins: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str]:
+        with self._lock:
+            self.calls += 1
+        return self.compiler.run_compile(requirements_set, cancel_event=cancel_event, seed_pins=seed_pins)
+
+
+def _solve_case(case: ConflictCase, index_path: str, metadata_index, heuristic_mode: str, jobs: int,
+                max_iterations: int, search_strategy: str = config.SEARCH_STRATEGY,
+                trace_dir: Optional[str] = None) -> Dict[str, Any]:
+    cache_manager.clear_pip_compile_cache()
+    pypi_service = PyPIService(metadata_index=metadata_index)
+    compiler = CountingCompilerService(InProcessResolverService(index_path))
+    orchestrator = Orchestrator(
+        action_generator=ActionGenerator(pypi_service=pypi_service),
+        heuristic_calc=HeuristicCalculator(pypi_service=pypi_service, mode=heuristic_mode),
+        pip_compiler=compiler,
+        regex_conflict_parser=RegexConflictParser(),
+        llm_conflict_parser=None,
+        feasibility_checker=FeasibilityChecker(pypi_service),
+        search_strategy=search_strategy
+    )
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), tracing.capture(record_events=trace_dir is not None) as trace: # solve() prints progress
+        result = orchestrator.solve(case.requirements_text, max_iterations=max_iterations, jobs=jobs)
+    elapsed = time.perf_counter() - start
+    if trace_dir is not None:
+        trace.write_chrome_trace(os.path.join(trace_dir, f"{case.name}-trace.json"))
+    trace_summary = trace.summary()
+    cache_stats = cache_manager.get_cache_stats()
+    return {
+        "name": case.name,
+        "requirements": case.requirements_text.strip().splitlines(),
+        "solved": result is not None,
+        "solution": sorted(str(r) for r in result[0]) if result else None,
+        "path_length": len(result[1]) - 1 if result else None,
+        "iterations": orchestrator.last_iteration_count,
+        "compiles": compiler.calls,
+        "compiles_avoided_by_subsumption": orchestrator.subsumption_index.compiles_avoided,
+        "rejected_by_precheck": orchestrator.feasibility_checker.rejected,
+        "cache_hits": cache_stats["hits"],
+        "cache_misses": cache_stats["misses"],
+        "cache_hit_rate": round(cache_stats["hit_rate"], 4),
+        "parses_reused_by_signature": cache_stats["signature_hits"],
+        "expansions": orchestrator.last_search_stats["expansions"],
+        "peak_frontier": orchestrator.last_search_stats["peak_frontier"],
+        "dropped_nodes": orchestrator.last_search_stats["dropped"],
+        "phase_ms": {phase: round(stat["total_ms"], 3) for phase, stat in trace_summary["phases"].items()},
+        "wall_seconds": elapsed,
+    }
+
+
+def run_suite(num_packages: int = 40, versions_per_package: int = 8, deps_per_release: int = 2, num_cases: int = 12,
+              conflicts_per_case: int = 2, extra_requirements: int = 3, seed: int = 0,
+              heuristic_mode: str = config.HEURISTIC_MODE, jobs: int = 1,
+              max_iterations: int = config.MAX_ASTAR_ITERATIONS, measure_memory: bool = True,
+              search_strategy: str = config.SEARCH_STRATEGY, trace_dir: Optional[str] = None) -> Dict[str, Any]:
+    suite_config = {
+        "num_packages": num_packages, "versions_per_package": versions_per_package,
+        "deps_per_release": deps_per_release, "num_cases": num_cases, "conflicts_per_case": conflicts_per_case,
+        "extra_requirements": extra_requirements, "seed": seed, "heuristic_mode": heuristic_mode,
+        "jobs": jobs, "max_iterations": max_iterations, "search_strategy": search_strategy,
+    }
+    universe = generate_universe(num_packages, versions_per_package, deps_per_release, seed=seed)
+    cases = generate_conflict_cases(universe, num_cases, conflicts_per_case, extra_requirements, seed=seed)
+    # Results must not come from (or leak into) the user's persistent cache
+    persistent_cache = cache_manager.PERSISTENT_CACHE
+    cache_manager.PERSISTENT_CACHE = None
+    case_results: List[Dict[str, Any]] = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="resolver_bench_") as temp_dir:
+            index_path = os.path.join(temp_dir, "universe.idx")
+            metadata_index = universe.write_metadata_index(index_path)
+            for case in cases:
+                case_result = _solve_case(case, index_path, metadata_index, heuristic_mode, jobs, max_iterations, search_strategy, trace_dir)
+                if measure_memory:
+                    # Separate traced run: tracemalloc slows allocation-heavy code too much to time it
+                    gc.collect()
+                    tracemalloc.start()
+                    _solve_case(case, index_path, metadata_index, heuristic_mode, jobs, max_iterations, search_strategy)
+                    case_result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                case_results.append(case_result)
+            metadata_index.close()
+    finally:
+        cache_manager.PERSISTENT_CACHE = persistent_cache
+        cache_manager.clear_pip_compile_cache()
+
+    totals = {
+        "cases": len(case_results),
+        "solved": sum(1 for c in case_results if c["solved"]),
+        "iterations": sum(c["iterations"] for c in case_results),
+        "compiles": sum(c["compiles"] for c in case_results),
+        "max_peak_frontier": max((c["peak_frontier"] for c in case_results), default=0),
+        "wall_seconds": sum(c["wall_seconds"] for c in case_results),
+        "phase_ms": {},
+    }
+    for c in case_results:
+        for phase, total_ms in c["phase_ms"].items():
+            totals["phase_ms"][phase] = round(totals["phase_ms"].get(phase, 0.0) + total_ms, 3)
+    lookups = sum(c["cache_hits"] + c["cache_misses"] for c in case_results)
+    totals["cache_hit_rate"] = round(sum(c["cache_hits"] for c in case_results) / lookups, 4) if lookups else 0.0
+    if measure_memory:
+        totals["max_peak_bytes"] = max((c["peak_bytes"] for c in case_results), default=0)
+    return {
+        "config": suite_config,
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "cases": case_results,
+        "totals": totals,
+    }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.5) -> List[str]:
+    """Human-readable regressions of `results` against `baseline` (empty list if none)."""
+    if results["config"] != baseline["config"]:
+        return [f"Baseline was recorded with a different configuration: {baseline['config']}"]
+    regressions = []
+    baseline_cases = {c["name"]: c for c in baseline["cases"]}
+    for case in results["cases"]:
+        before = baseline_cases.get(case["name"])
+        if before is None:
+            continue
+        name = case["name"]
+        if before["solved"] and not case["solved"]:
+            regressions.append(f"{name}: no longer solved")
+        elif case["solved"] and before["solved"] and case["path_length"] > before["path_length"]:
+            regressions.append(f"{name}: solution path grew {before['path_length']} -> {case['path_length']} actions")
+        for metric in ("compiles", "iterations"):
+            if case[metric] > before[metric]:
+                regressions.append(f"{name}: {metric} {before[metric]} -> {case[metric]}")
+        if case["wall_seconds"] > before["wall_seconds"] * (1 + tolerance) and \
+           case["wall_seconds"] - before["wall_seconds"] > MIN_SECONDS_REGRESSION:
+            regressions.append(f"{name}: wall time {before['wall_seconds']:.3f}s -> {case['wall_seconds']:.3f}s")
+        if "peak_bytes" in case and "peak_bytes" in before and \
+           case["peak_bytes"] > before["peak_bytes"] * (1 + tolerance) and \
+           case["peak_bytes"] - before["peak_bytes"] > MIN_BYTES_REGRESSION:
+            regressions.append(f"{name}: peak memory {before['peak_bytes']} -> {case['peak_bytes']} bytes")
+    return regressions
+
+
+def _print_summary(results: Dict[str, Any]):
+    for case in results["cases"]:
+        peak = f"  peak={case['peak_bytes'] / 1024:7.0f} KiB" if "peak_bytes" in case else ""
+        print(f"{case['name']}  solved={str(case['solved']):5s}  iterations={case['iterations']:3d}  "
+              f"compiles={case['compiles']:3d}  frontier={case['peak_frontier']:4d}  hit_rate={case['cache_hit_rate']:.2f}  "
+              f"time={case['wall_seconds'] * 1000:7.1f} ms{peak}")
+    totals = results["totals"]
+    print(f"TOTAL  solved={totals['solved']}/{totals['cases']}  iterations={totals['iterations']}  "
+          f"compiles={totals['compiles']}  hit_rate={totals['cache_hit_rate']:.2f}  time={totals['wall_seconds']:.3f}s")
+    phases = sorted(totals.get("phase_ms", {}).items(), key=lambda item: -item[1])
+    if phases:
+        print("TIME BY PHASE  " + "  ".join(f"{phase}={total_ms:.1f}ms" for phase, total_ms in phases))
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="End-to-end resolver benchmark on a synthetic conflict corpus")
+    arg_parser.add_argument("--packages", type=int, default=40)
+    arg_parser.add_argument("--versions", type=int, default=8)
+    arg_parser.add_argument("--deps", type=int, default=2, help="Dependencies per release")
+    arg_parser.add_argument("--cases", type=int, default=12)
+    arg_parser.add_argument("--conflicts", type=int, default=2, help="Independent conflicts per case")
+    arg_parser.add_argument("--extras", type=int, default=3, help="Unpinned extra requirements per case")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--heuristic", default=config.HEURISTIC_MODE)
+    arg_parser.add_argument("--jobs", type=int, default=1)
+    arg_parser.add_argument("--strategy", default=config.SEARCH_STRATEGY, choices=sorted(SEARCH_STRATEGIES))
+    arg_parser.add_argument("--max-iterations", type=int, default=config.MAX_ASTAR_ITERATIONS)
+    arg_parser.add_argument("--no-memory", action="store_true", help="Skip the traced run that measures peak memory")
+    arg_parser.add_argument("--output", help="Write the results as JSON to this file")
+    arg_parser.add_argument("--baseline", help=f"Compare with this results file (e.g. {DEFAULT_BASELINE_PATH})")
+    arg_parser.add_argument("--write-baseline", action="store_true", help="Store the results as the new --baseline")
+    arg_parser.add_argument("--trace-dir", help="Write a Chrome trace (also readable by speedscope) of every case here")
+    arg_parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative growth of time and memory")
+    args = arg_parser.parse_args()
+
+    config.USE_LLM_PARSER = False # Parsing goes through the regex parser only, so runs are reproducible
+    if args.trace_dir:
+        os.makedirs(args.trace_dir, exist_ok=True)
+    bench_results = run_suite(args.packages, args.versions, args.deps, args.cases, args.conflicts, args.extras,
+                              args.seed, args.heuristic, args.jobs, args.max_iterations, not args.no_memory, args.strategy,
+                              args.trace_dir)
+    _print_summary(bench_results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(bench_results, f, indent=1)
+    if args.baseline and args.write_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(bench_results, f, indent=1)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = compare_to_baseline(bench_results, json.load(f), args.tolerance)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        if found:
+            sys.exit(1)
+        print("No regressions against the baseline.")
@@ -0,0 +1,128 @@
+# dependency_resolver_agent/benchmarks/fake_llm_server.py
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint, for exercising LLMConflictParser
+without network access or API costs. It answers POST /v1/chat/completions with an LLMConflictAnalysis
+JSON derived from the prompt by the regex parser, after an optional artificial latency, and records
+prompt sizes and peak concurrency (GET /stats).
+
+Run: python -m dependency_resolver_agent.benchmarks.fake_llm_server --port 8765 --latency 0.5
+then: LLM_BASE_URL=http://127.0.0.1:8765/v1 OPENROUTER_API_KEY=test python main.py
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+from dependency_resolver_agent.data_models.requirement import Requirement
+from dependency_resolver_agent.tooling.regex_conflict_parser import RegexConflictParser
+
+_DIRECT_DEPS_LINE = re.compile(r"original direct dependencies were:\s*\n(.*)\n")
+_EXCERPT = re.compile(r"---OUTPUT---\n(.*?)\n---END OUTPUT---", re.DOTALL)
+
+
+class FakeLLMState:
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.requests = 0
+        self.prompt_chars = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "prompt_chars": self.prompt_chars,
+                "avg_prompt_chars": (self.prompt_chars / self.requests) if self.requests else 0.0,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+def _analyse_prompt(prompt: str) -> Dict[str, Any]:
+    direct_match = _DIRECT_DEPS_LINE.search(prompt)
+    direct_names = [n.strip() for n in direct_match.group(1).split(",") if n.strip()] if direct_match else []
+    excerpt_match = _EXCERPT.search(prompt)
+    excerpt = excerpt_match.group(1) if excerpt_match else prompt
+    info = RegexConflictParser().parse("", excerpt, frozenset(Requirement(name) for name in direct_names))
+    culprit = info.sub_dependency_culprit
+    return {
+        "involved_direct_packages": sorted(info.involved_direct_packages),
+        "sub_dependency_culprit_name": culprit[0] if culprit else None,
+        "sub_dependency_culprit_specs": culprit[1] if culprit else None,
+    }
+
+
+def _make_handler(state: FakeLLMState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                self._send_json(200, state.stats())
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            with state.lock:
+                state.requests += 1
+                state.prompt_chars += len(prompt)
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                if state.latency_seconds:
+                    time.sleep(state.latency_seconds)
+                content = json.dumps(_analyse_prompt(prompt))
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+            self._send_json(200, {
+                "id": f"chatcmpl-fake-{state.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                          "total_tokens": (len(prompt) + len(content)) // 4},
+            })
+
+        def log_message(self, format, *args): # pylint: disable=redefined-builtin
+            pass # Keep test output quiet
+
+    return Handler
+
+
+def start_fake_llm_server(port: int = 0, latency_seconds: float = 0.0) -> Tuple[ThreadingHTTPServer, FakeLLMState, str]:
+    """Starts the server on a daemon thread; returns (server, state, base_url). Stop it with server.shutdown()."""
+    state = FakeLLMState(latency_seconds)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-llm-server", daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Fake OpenAI-compatible server for LLMConflictParser tests")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each answer")
+    args = arg_parser.parse_args()
+    fake_server, _state, url = start_fake_llm_server(args.port, args.latency)
+    print(f"Fake LLM server listening on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake_server.shutdown()
@@ -0,0 +1,111 @@
+# dependency_resolver_agent/benchmarks/import_time.py
+"""
+Startup benchmark: how long a fresh interpreter takes to import the CLI entry points and to run a
+regex-only solve, and which heavy modules each of them pulled in. The LLM stack (langchain, pydantic,
+the OpenAI client) must only be imported when the LLM parser is actually created, so the check fails
+(exit code 1) if any probe other than "llm_parser" loads one of FORBIDDEN_MODULES.
+Every probe runs in its own subprocess with USE_LLM_PARSER=0; times are medians over --repeat runs.
+Run: python -m dependency_resolver_agent.benchmarks.import_time --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Top-level packages that belong to the LLM parser only
+FORBIDDEN_MODULES = ("langchain", "langchain_core", "langchain_openai", "openai", "pydantic", "tiktoken")
+
+_PROBE_TEMPLATE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+loaded = sorted({{name.split(".", 1)[0] for name in sys.modules}} & set({forbidden!r}))
+print("\\n" + json.dumps({{"seconds": elapsed, "modules": len(sys.modules), "forbidden": loaded}}))
+"""
+
+PROBES: Dict[str, str] = {
+    "import_main": "import dependency_resolver_agent.main",
+    "import_batch_runner": "import dependency_resolver_agent.batch_runner",
+    "regex_solve": (
+        "from dependency_resolver_agent.main import build_orchestrator\n"
+        "from dependency_resolver_agent.tooling.conflict_parser_factory import create_configured_llm_parser\n"
+        "from dependency_resolver_agent.benchmarks.end_to_end import run_suite\n"
+        "assert create_configured_llm_parser() is None\n"
+        "assert run_suite(num_cases=2, measure_memory=False)['totals']['solved'] > 0"
+    ),
+    # For scale: what the lazy import saves (expected to load the forbidden modules)
+    "llm_parser": "from dependency_resolver_agent.tooling.conflict_parser_factory import get_conflict_parser_class\n"
+                  "get_conflict_parser_class('llm')",
+}
+ALLOWED_TO_LOAD_LLM = {"llm_parser"}
+
+
+def run_probe(code: str) -> Dict[str, Any]:
+    env = dict(os.environ, USE_LLM_PARSER="0", PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+    script = _PROBE_TEMPLATE.format(code=code, forbidden=FORBIDDEN_MODULES)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+    process_seconds = time.perf_counter() - start
+    if completed.returncode != 0:
+        return {"error": (completed.stderr.strip().splitlines() or ["exit code %d" % completed.returncode])[-1]}
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_seconds"] = process_seconds
+    return result
+
+
+def run_benchmark(repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for label, code in PROBES.items():
+        runs: List[Dict[str, Any]] = [run_probe(code) for _ in range(repeat)]
+        if "error" in runs[0]:
+            results[label] = runs[0]
+            continue
+        results[label] = {
+            "import_seconds": statistics.median(run["seconds"] for run in runs),
+            "process_seconds": statistics.median(run["process_seconds"] for run in runs),
+            "modules": runs[0]["modules"],
+            "forbidden": runs[0]["forbidden"],
+        }
+    return results
+
+
+def violations(results: Dict[str, Dict[str, Any]]) -> List[str]:
+    found = []
+    for label, stats in results.items():
+        if label in ALLOWED_TO_LOAD_LLM:
+            continue
+        if "error" in stats:
+            found.append(f"{label}: probe failed ({stats['error']})")
+        elif stats["forbidden"]:
+            found.append(f"{label}: imported {', '.join(stats['forbidden'])} with USE_LLM_PARSER=0")
+    return found
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Import-time benchmark; fails if a regex-only run imports the LLM stack")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per probe (the median is reported)")
+    arg_parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = arg_parser.parse_args()
+
+    bench_results = run_benchmark(max(1, args.repeat))
+    for label, stats in bench_results.items():
+        if "error" in stats:
+            print(f"{label:20s} ERROR {stats['error']}")
+            continue
+        print(f"{label:20s} import={stats['import_seconds'] * 1000:8.1f} ms  process={stats['process_seconds'] * 1000:8.1f} ms  "
+              f"modules={stats['modules']:5d}  llm_stack={','.join(stats['forbidden']) or '-'}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(bench_results, f, indent=1)
+    found = violations(bench_results)
+    for violation in found:
+        print(f"VIOLATION {violation}")
+    if found:
+        sys.exit(1)
+    print("No LLM-stack imports outside the LLM parser.")
@@ -0,0 +1,139 @@
+# dependency_resolver_agent/benchmarks/open_set.py
+"""
+Microbenchmark: the A* open set as AStarStrategy keeps it (IndexedOpenSet: one entry per state,
+decrease-key, precomputed tuple keys, slotted nodes) versus the previous heapq of dataclass nodes
+compared through their __lt__, where every re-discovered state is pushed again and stale copies are
+skipped on pop (reproduced below as the baseline). With every push queued before the first pop, both must
+expand the same states at the same g (with interleaved pops, equal keys may be popped in another order).
+Run: python -m dependency_resolver_agent.benchmarks.open_set --nodes 100000 --states 40000
+"""
+import argparse
+import gc
+import heapq
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from dependency_resolver_agent.data_models.requirement import Requirement
+from dependency_resolver_agent.agent_core.search_strategies import AStarStrategy
+from dependency_resolver_agent.agent_core.state_manager import AStarNode, RequirementState
+
+
+@dataclass
+class LegacyAStarNode:
+    state: RequirementState
+    g_score: float = float('inf')
+    h_score: float = float('inf')
+    parent: Optional['LegacyAStarNode'] = None
+    last_action: str = "Initial state"
+
+    @property
+    def f_score(self) -> float:
+        return self.g_score + self.h_score
+
+    def __lt__(self, other: 'LegacyAStarNode'):
+        if self.f_score != other.f_score:
+            return self.f_score < other.f_score
+        if self.g_score != other.g_score:
+            return self.g_score < other.g_score
+        return len(self.state) < len(other.state)
+
+
+class LegacyOpenSet:
+    def __init__(self):
+        self._heap: List[LegacyAStarNode] = []
+
+    def push(self, node: LegacyAStarNode):
+        heapq.heappush(self._heap, node)
+
+    def pop(self) -> LegacyAStarNode:
+        return heapq.heappop(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+def generate_pushes(num_nodes: int, num_states: int, seed: int = 0) -> Tuple[List[RequirementState], List[Tuple[int, float]]]:
+    """num_nodes (state index, g) pushes over num_states distinct one-change neighbours of a 30-requirement state."""
+    rng = random.Random(seed)
+    base = RequirementState.from_requirements(Requirement(name=f"pkg{i}", specifier=f"=={i % 7}.0.0") for i in range(30))
+    states = [base.replace(None, Requirement(name=f"extra{i % 997}", specifier=f"=={i // 997}.{i % 5}.0")) for i in range(num_states)]
+    pushes = [(rng.randrange(num_states), float(rng.randint(1, 40))) for _ in range(num_nodes)]
+    return states, pushes
+
+
+def _run(node_cls, open_set, states: List[RequirementState], pushes: List[Tuple[int, float]],
+         pops_per_push: float) -> Tuple[Dict[int, float], int]:
+    """Pushes in order, popping every 1/pops_per_push pushes, then drains. Returns ({state: g at expansion}, peak size)."""
+    h_scores = [float(i % 13) for i in range(len(states))] # Fixed per state, as the heuristic is
+    expanded: Dict[int, float] = {}
+    index_of = {id(state): i for i, state in enumerate(states)}
+    peak = 0
+    credit = 0.0
+
+    def pop_one():
+        node = open_set.pop()
+        i = index_of[id(node.state)]
+        if i not in expanded: # Stale duplicate otherwise (legacy only)
+            expanded[i] = node.g_score
+
+    for i, g in pushes:
+        if i not in expanded:
+            open_set.push(node_cls(state=states[i], g_score=g, h_score=h_scores[i]))
+        peak = max(peak, len(open_set))
+        credit += pops_per_push
+        while credit >= 1 and len(open_set):
+            credit -= 1
+            pop_one()
+    while len(open_set):
+        pop_one()
+    return expanded, peak
+
+
+def _fill(node_cls, open_set, states: List[RequirementState], pushes: List[Tuple[int, float]]):
+    for i, g in pushes:
+        open_set.push(node_cls(state=states[i], g_score=g, h_score=float(i % 13)))
+    return open_set
+
+
+def run_benchmark(num_nodes: int = 100_000, num_states: int = 40_000, pops_per_push: float = 0.2,
+                  seed: int = 0) -> Dict[str, Dict[str, float]]:
+    states, pushes = generate_pushes(num_nodes, num_states, seed)
+    variants = (("legacy_heapq", LegacyAStarNode, LegacyOpenSet), ("indexed_open_set", AStarNode, AStarStrategy))
+    results = {}
+    expansions = {}
+    for label, node_cls, open_set_cls in variants:
+        gc.collect()
+        start = time.perf_counter()
+        expanded, peak = _run(node_cls, open_set_cls(), states, pushes, pops_per_push)
+        elapsed = time.perf_counter() - start
+        # Frontier memory: every push queued, nothing popped yet
+        gc.collect()
+        tracemalloc.start()
+        fill_start = time.perf_counter()
+        filled = _fill(node_cls, open_set_cls(), states, pushes)
+        fill_seconds = time.perf_counter() - fill_start
+        frontier_bytes, _peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = {"seconds": elapsed, "peak_frontier": peak, "filled_frontier": len(filled),
+                          "frontier_bytes": frontier_bytes, "fill_seconds_traced": fill_seconds,
+                          "expanded": len(expanded)}
+        del filled
+        expansions[label] = _run(node_cls, open_set_cls(), states, pushes, 0.0)[0]
+    results["indexed_open_set"]["agrees_with_legacy"] = float(expansions["legacy_heapq"] == expansions["indexed_open_set"])
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="A* open set microbenchmark")
+    arg_parser.add_argument("--nodes", type=int, default=100_000, help="Pushes")
+    arg_parser.add_argument("--states", type=int, default=40_000, help="Distinct states among the pushes")
+    arg_parser.add_argument("--pops-per-push", type=float, default=0.2)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+    for label, stats in run_benchmark(args.nodes, args.states, args.pops_per_push, args.seed).items():
+        print(f"{label:18s} time={stats['seconds'] * 1000:8.1f} ms  peak_frontier={stats['peak_frontier']:7d}  "
+              f"filled_frontier={stats['filled_frontier']:7d} ({stats['frontier_bytes'] / 1024:8.1f} KiB)  expanded={stats['expanded']}"
+              + (f"  agrees_with_legacy={bool(stats['agrees_with_legacy'])}" if "agrees_with_legacy" in stats else ""))
@@ -0,0 +1,163 @@
+# dependency_resolver_agent/benchmarks/regex_parser.py
+"""
+Microbenchmark: RegexConflictParser on large pip-compile --verbose style logs with many direct requirements,
+versus the previous parser that ran one regex over the whole output per direct requirement (reproduced
+below as the baseline). Both must agree on the involved packages, the first culprit and the constraints.
+Run: python -m dependency_resolver_agent.benchmarks.regex_parser --requirements 300 --megabytes 4
+A captured log can be used instead of a synthetic one: --log pip-compile-output.txt
+"""
+import argparse
+import random
+import re
+import time
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from dependency_resolver_agent.data_models.requirement import Requirement
+from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
+from dependency_resolver_agent.tooling.regex_conflict_parser import RegexConflictParser
+
+
+class LegacyRegexConflictParser:
+    def parse(self, stdout: str, stderr: str, direct_requirements: FrozenSet[Requirement]) -> ConflictInfo:
+        full_output = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}"
+        involved_direct_names = set()
+        sub_dep_culprit: Optional[Tuple[str, str]] = None
+        conflicting_constraints: List[Tuple[str, str, str, str]] = []
+        direct_req_name_map = {r.name.lower(): r.name for r in direct_requirements}
+        for req_name_orig_case in direct_req_name_map.values():
+            pattern = r"(\b" + re.escape(req_name_orig_case) + r"\b)" + \
+                      r"(\s*(?:[<>=!~]=?|is)\s*[\w.,*+-]+(?:,\s*[<>=!~]=?\s*[\w.,*+-]+)*)?"
+            if re.search(pattern, full_output, re.IGNORECASE):
+                involved_direct_names.add(req_name_orig_case)
+        conflict_block_match = re.search(
+            r"The conflict is caused by:(.*?)(?:\n\nTo fix this|Because no versions of|(?:\n\s*pip freeze output:)|(?:\n\s*ERROR:)|(?:\n\s*During handling of the above exception)|\Z)",
+            full_output, re.DOTALL | re.IGNORECASE
+        )
+        if conflict_block_match:
+            conflict_text = conflict_block_match.group(1).strip()
+            dep_lines_depends_on = re.findall(
+                r"^\s*([\w.-]+)\s+([\w.?*+!-]+|\(any\))\s+depends on\s+([\w.-]+)\s*([<>=!~]=?[\w.,*+-]+(?:,\s*[<>=!~]=?[\w.,*+-]+)*)?",
+                conflict_text, re.MULTILINE | re.IGNORECASE
+            )
+            dep_lines_required_by = re.findall(
+                r"^\s*([\w.-]+)\s+([<>=!~]=?[\w.,*+-]+(?:,\s*[<>=!~]=?[\w.,*+-]+)*)?\s+is required by\s+([\w.-]+)",
+                conflict_text, re.MULTILINE | re.IGNORECASE
+            )
+            potential_culprits_specs: Dict[str, Set[str]] = {}
+            for dependant, dependant_version, dep_name, dep_spec in dep_lines_depends_on:
+                dep_spec_cleaned = (dep_spec or "").strip()
+                if dep_spec_cleaned and dependant_version != "(any)":
+                    conflicting_constraints.append((dependant, dependant_version, dep_name, dep_spec_cleaned))
+                if dep_name.lower() not in direct_req_name_map:
+                    potential_culprits_specs.setdefault(dep_name, set()).add(dep_spec_cleaned)
+                elif dependant.lower() not in direct_req_name_map:
+                    potential_culprits_specs.setdefault(dep_name, set()).add(dep_spec_cleaned)
+            for dep_name, dep_spec, _requirer in dep_lines_required_by:
+                dep_spec_cleaned = (dep_spec or "").strip()
+                if dep_name.lower() not in direct_req_name_map:
+                    potential_culprits_specs.setdefault(dep_name, set()).add(dep_spec_cleaned)
+            for culprit_name, specs_set in potential_culprits_specs.items():
+                valid_specs = {s for s in specs_set if s}
+                if valid_specs:
+                    sub_dep_culprit = (culprit_name, "; ".join(sorted(valid_specs)))
+                    if not involved_direct_names:
+                        involved_direct_names.update(direct_req_name_map.values())
+                    break
+        if not involved_direct_names and ("ResolutionImpossible" in full_output or "Could not find a version that satisfies the requirement" in full_output):
+            involved_direct_names = set(direct_req_name_map.values())
+        return ConflictInfo(is_conflict=True, error_message=full_output, involved_direct_packages=involved_direct_names,
+                            sub_dependency_culprit=sub_dep_culprit, conflicting_constraints=conflicting_constraints)
+
+
+def generate_verbose_log(num_requirements: int, megabytes: float, num_culprits: int = 3,
+                         seed: int = 0) -> Tuple[str, FrozenSet[Requirement]]:
+    """A pip-compile --verbose style log: collection and backtracking chatter, then a conflict report."""
+    rng = random.Random(seed)
+    names = [f"{rng.choice(['py', 'lib', 'django', 'flask', 'zope'])}{'-' if i % 3 else '.'}pkg{i}" for i in range(num_requirements)]
+    direct = frozenset(Requirement(name=name, specifier=f"=={i % 9}.{i % 4}.0") for i, name in enumerate(names))
+    # Only some direct requirements ever show up in the log
+    mentioned = rng.sample(names, max(1, num_requirements // 3))
+    lines: List[str] = []
+    size = 0
+    target = int(megabytes * 1024 * 1024)
+    while size < target:
+        name = rng.choice(mentioned)
+        version = f"{rng.randint(0, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 5)}"
+        line = rng.choice((
+            f"Collecting {name}=={version} (from -r /tmp/pip_resolve_{seed:x}/requirements.in (line {rng.randint(1, num_requirements)}))",
+            f"  Using cached {name.replace('-', '_')}-{version}-py3-none-any.whl ({rng.randint(10, 900)} kB)",
+            f"INFO: pip is looking at multiple versions of transitive-dep{rng.randint(0, 50)} to determine which version is compatible with other requirements. This could take a while.",
+            f"  Discarding {name}=={version}: Requested transitive-dep{rng.randint(0, 50)}>={version} but the installed version is incompatible",
+            f"    Getting requirements to build wheel ... done ({rng.random():.2f}s)",
+        ))
+        lines.append(line)
+        size += len(line) + 1
+    cause_lines = []
+    for c in range(num_culprits):
+        requirer = mentioned[c % len(mentioned)]
+        cause_lines.append(f"    {requirer} 1.{c}.0 depends on shared-dep{c}<{c + 2}.0")
+        cause_lines.append(f"    transitive-dep{c} 2.{c}.1 depends on shared-dep{c}>={c + 3}.0")
+    lines.append(f"ERROR: Cannot install {' and '.join(str(r) for r in sorted(direct)[:20])} because these package versions have conflicting dependencies.")
+    lines.append("")
+    lines.append("The conflict is caused by:")
+    lines.extend(cause_lines)
+    lines.append("")
+    lines.append("To fix this you could try to:")
+    lines.append("1. loosen the range of package versions you've specified")
+    lines.append("2. remove package versions to allow pip attempt to solve the dependency conflict")
+    return "\n".join(lines) + "\n", direct
+
+
+def _time_parse(parser, stdout: str, stderr: str, direct: FrozenSet[Requirement], repeat: int) -> Tuple[float, ConflictInfo]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parser.parse(stdout, stderr, direct)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(num_requirements: int = 300, megabytes: float = 4.0, num_culprits: int = 3, repeat: int = 1,
+                  log_text: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    if log_text is None:
+        log_text, direct = generate_verbose_log(num_requirements, megabytes, num_culprits)
+    else:
+        # Captured log: treat every distribution named in a "Collecting" line as a direct requirement
+        direct = frozenset(Requirement(name=m) for m in set(re.findall(r"^Collecting ([\w.-]+)", log_text, re.MULTILINE)))
+    results = {}
+    parsed = {}
+    for label, parser in (("legacy_per_requirement", LegacyRegexConflictParser()), ("single_pass", RegexConflictParser())):
+        seconds, info = _time_parse(parser, "", log_text, direct, repeat)
+        parsed[label] = info
+        results[label] = {"seconds": seconds, "involved": len(info.involved_direct_packages),
+                          "culprits": len(info.sub_dependency_culprits) or int(info.sub_dependency_culprit is not None),
+                          "constraints": len(info.conflicting_constraints)}
+    legacy, current = parsed["legacy_per_requirement"], parsed["single_pass"]
+    results["single_pass"]["agrees_with_legacy"] = float(
+        legacy.involved_direct_packages == current.involved_direct_packages
+        and legacy.sub_dependency_culprit == current.sub_dependency_culprit
+        and legacy.conflicting_constraints == current.conflicting_constraints
+    )
+    results["input"] = {"bytes": len(log_text), "direct_requirements": len(direct)}
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="RegexConflictParser microbenchmark")
+    arg_parser.add_argument("--requirements", type=int, default=300)
+    arg_parser.add_argument("--megabytes", type=float, default=4.0)
+    arg_parser.add_argument("--culprits", type=int, default=3)
+    arg_parser.add_argument("--repeat", type=int, default=1, help="Best of N runs per parser")
+    arg_parser.add_argument("--log", help="Parse this captured pip-compile output instead of a synthetic log")
+    args = arg_parser.parse_args()
+    captured = None
+    if args.log:
+        with open(args.log, encoding="utf-8", errors="replace") as f:
+            captured = f.read()
+    bench = run_benchmark(args.requirements, args.megabytes, args.culprits, args.repeat, captured)
+    print(f"input: {bench.pop('input')}")
+    for label, stats in bench.items():
+        print(f"{label:24s} time={stats['seconds'] * 1000:9.1f} ms  involved={stats['involved']}  "
+              f"culprits={stats['culprits']}  constraints={stats['constraints']}"
+              + (f"  agrees_with_legacy={bool(stats['agrees_with_legacy'])}" if "agrees_with_legacy" in stats else ""))
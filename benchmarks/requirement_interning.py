@@ -0,0 +1,80 @@
+# dependency_resolver_agent/benchmarks/requirement_interning.py
+"""
+Microbenchmark: building ActionGenerator-style neighbours with the interned Requirement versus
+the previous plain frozen-dataclass Requirement (reproduced below as the baseline).
+Run: python -m dependency_resolver_agent.benchmarks.requirement_interning
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict
+
+from dependency_resolver_agent.data_models.requirement import Requirement, SpecifierSet, Version
+
+
+@dataclass(frozen=True, order=True)
+class LegacyRequirement:
+    name: str
+    specifier: str = field(default="")
+
+    def __post_init__(self):
+        if self.specifier:
+            SpecifierSet(self.specifier) # Parsed for validation only, then dropped
+
+    def is_exact(self) -> bool:
+        return self.specifier.startswith("==")
+
+    def get_version_obj(self):
+        return Version(self.specifier[2:]) if self.is_exact() else None
+
+
+def _build_neighbors(req_cls, num_requirements: int, num_targets: int, num_versions: int, rounds: int) -> int:
+    current = frozenset(req_cls(name=f"pkg{i}", specifier=f"=={i % 7}.{i % 5}.0") for i in range(num_requirements))
+    open_set = [] # Neighbours stay alive, as they do in the A* open set
+    for _ in range(rounds):
+        for t in range(num_targets):
+            pkg = f"pkg{t}"
+            current_req = next(r for r in current if r.name == pkg)
+            current_req.get_version_obj() # get_cost_of_action compares versions for every candidate
+            for v in range(num_versions):
+                new_req = req_cls(name=pkg, specifier=f"=={v}.0.{t % 3}")
+                new_req.get_version_obj()
+                open_set.append(frozenset([r for r in current if r.name != pkg] + [new_req]))
+    return len({id(r) for neighbor in open_set for r in neighbor})
+
+
+def run_benchmark(num_requirements: int = 300, num_targets: int = 5, num_versions: int = 10, rounds: int = 10) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for label, req_cls in (("legacy_dataclass", LegacyRequirement), ("interned_slots", Requirement)):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        distinct_objects = _build_neighbors(req_cls, num_requirements, num_targets, num_versions, rounds)
+        elapsed = time.perf_counter() - start
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = {
+            "seconds": elapsed,
+            "peak_bytes": peak,
+            "distinct_requirement_objects": distinct_objects,
+        }
+    # Timing without tracemalloc overhead
+    for label, req_cls in (("legacy_dataclass", LegacyRequirement), ("interned_slots", Requirement)):
+        start = time.perf_counter()
+        _build_neighbors(req_cls, num_requirements, num_targets, num_versions, rounds)
+        results[label]["seconds_untraced"] = time.perf_counter() - start
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Requirement interning microbenchmark")
+    arg_parser.add_argument("--requirements", type=int, default=300)
+    arg_parser.add_argument("--targets", type=int, default=5)
+    arg_parser.add_argument("--versions", type=int, default=10)
+    arg_parser.add_argument("--rounds", type=int, default=10)
+    args = arg_parser.parse_args()
+    for label, stats in run_benchmark(args.requirements, args.targets, args.versions, args.rounds).items():
+        print(f"{label:18s} time={stats['seconds_untraced'] * 1000:8.1f} ms  peak={stats['peak_bytes'] / 1024:8.1f} KiB  "
+              f"requirement objects={stats['distinct_requirement_objects']}")
@@ -0,0 +1,103 @@
+# dependency_resolver_agent/benchmarks/synthetic_universe.py
+"""
+Deterministic synthetic dependency universes for the end-to-end benchmark.
+
+Packages p000..pNNN each have `versions_per_package` releases 1.0.0, 2.0.0, ...; release r of a
+package depends on a few higher-numbered packages (so the graph is acyclic) with a window of
+compatible releases that moves up with r, the way real ecosystems drift. Conflict cases pin a
+release together with a dependency version outside its window; they are solvable by moving
+either pin, so the search has real work to do.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from dependency_resolver_agent.tooling.metadata_index import MetadataIndex, MetadataIndexBuilder
+
+
+@dataclass
+class SyntheticUniverse:
+    seed: int
+    versions_per_package: int
+    # package -> version -> Requires-Dist lines
+    releases: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    # package -> version -> {dependency: (first compatible release index, last compatible release index)}
+    windows: Dict[str, Dict[str, Dict[str, Tuple[int, int]]]] = field(default_factory=dict)
+
+    @property
+    def package_names(self) -> List[str]:
+        return sorted(self.releases)
+
+    def version(self, release_index: int) -> str:
+        return f"{release_index + 1}.0.0"
+
+    def write_metadata_index(self, path: str) -> MetadataIndex:
+        builder = MetadataIndexBuilder()
+        for name, versions in self.releases.items():
+            for version, requires_dist in versions.items():
+                builder.add_release(name, version, requires_dist)
+        builder.write(path)
+        return MetadataIndex.open(path)
+
+
+@dataclass
+class ConflictCase:
+    name: str
+    requirements_text: str
+
+
+def generate_universe(num_packages: int = 40, versions_per_package: int = 8, deps_per_release: int = 2,
+                      window: int = 2, seed: int = 0) -> SyntheticUniverse:
+    rng = random.Random(seed)
+    universe = SyntheticUniverse(seed=seed, versions_per_package=versions_per_package)
+    names = [f"p{i:03d}" for i in range(num_packages)]
+    for i, name in enumerate(names):
+        # Dependencies are fixed per package (releases differ only in the compatible ranges)
+        later = names[i + 1:]
+        deps = sorted(rng.sample(later, min(deps_per_release, len(later))))
+        universe.releases[name] = {}
+        universe.windows[name] = {}
+        for r in range(versions_per_package):
+            version = universe.version(r)
+            requires_dist = []
+            windows = {}
+            for dep in deps:
+                center = min(versions_per_package - 1, max(0, r + rng.randint(-1, 1)))
+                lo, hi = max(0, center - window), min(versions_per_package - 1, center + window)
+                spec = f">={universe.version(lo)}"
+                if hi < versions_per_package - 1:
+                    spec += f",<{universe.version(hi + 1)}"
+                requires_dist.append(f"{dep}{spec}")
+                windows[dep] = (lo, hi)
+            universe.releases[name][version] = requires_dist
+            universe.windows[name][version] = windows
+    return universe
+
+
+def generate_conflict_cases(universe: SyntheticUniverse, num_cases: int = 10, conflicts_per_case: int = 1,
+                            extra_requirements: int = 2, seed: int = 0) -> List[ConflictCase]:
+    """Requirement sets with `conflicts_per_case` independent pin clashes plus unpinned extras."""
+    rng = random.Random(seed)
+    cases: List[ConflictCase] = []
+    n_versions = universe.versions_per_package
+    candidates = [name for name in universe.package_names if any(universe.windows[name][v] for v in universe.windows[name])]
+    attempts = 0
+    while len(cases) < num_cases and attempts < num_cases * 50:
+        attempts += 1
+        pins: Dict[str, str] = {}
+        for _ in range(conflicts_per_case):
+            requirer = rng.choice(candidates)
+            release = rng.randrange(n_versions)
+            version = universe.version(release)
+            dep, (lo, hi) = rng.choice(sorted(universe.windows[requirer][version].items()))
+            outside = [r for r in range(n_versions) if r < lo or r > hi]
+            if not outside or requirer in pins or dep in pins:
+                break
+            pins[requirer] = f"=={version}"
+            pins[dep] = f"=={universe.version(rng.choice(outside))}"
+        else:
+            extras = [name for name in universe.package_names if name not in pins]
+            lines = [f"{name}{spec}" for name, spec in sorted(pins.items())]
+            lines += sorted(rng.sample(extras, min(extra_requirements, len(extras))))
+            cases.append(ConflictCase(name=f"case{len(cases):03d}", requirements_text="\n".join(lines) + "\n"))
+    return cases
@@ -2,11 +2,16 @@
 
 # Expose the key data models at the package level
 from .requirement import Requirement, PACKAGING_AVAILABLE, Version, SpecifierSet, InvalidSpecifier, InvalidVersion
+from .compiler_output import OutputBlob, CompilerOutput
 from .conflict_info import ConflictInfo
+from .search_result import SearchResult
 
 __all__ = [
     "Requirement",
     "ConflictInfo",
+    "SearchResult",
+    "OutputBlob",
+    "CompilerOutput",
     "PACKAGING_AVAILABLE",
     "Version",
     "SpecifierSet",
@@ -0,0 +1,52 @@
+# dependency_resolver_agent/data_models/compiler_output.py
+import hashlib
+import zlib
+
+
+class OutputBlob:
+    """A zlib-compressed, immutable chunk of compiler output. Decompressed only when read."""
+    __slots__ = ("digest", "data", "raw_size")
+
+    def __init__(self, digest: bytes, data: bytes, raw_size: int):
+        self.digest = digest
+        self.data = data
+        self.raw_size = raw_size
+
+    @classmethod
+    def from_text(cls, text: str) -> 'OutputBlob':
+        raw = text.encode("utf-8")
+        return cls(blob_digest(raw), zlib.compress(raw, 6), len(raw))
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.data).decode("utf-8")
+
+    @property
+    def compressed_size(self) -> int:
+        return len(self.data)
+
+
+def blob_digest(raw: bytes) -> bytes:
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+class CompilerOutput:
+    """stdout/stderr of one compile, held as (possibly shared) compressed blobs."""
+    __slots__ = ("stdout_blob", "stderr_blob")
+
+    def __init__(self, stdout_blob: OutputBlob, stderr_blob: OutputBlob):
+        self.stdout_blob = stdout_blob
+        self.stderr_blob = stderr_blob
+
+    @property
+    def stdout(self) -> str:
+        return self.stdout_blob.text
+
+    @property
+    def stderr(self) -> str:
+        return self.stderr_blob.text
+
+    @property
+    def full_text(self) -> str:
+        # Same layout the parsers have always used for error_message
+        return f"STDOUT:\n{self.stdout}\nSTDERR:\n{self.stderr}"
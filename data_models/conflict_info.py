@@ -1,6 +1,8 @@
 # dependency_resolver_agent/data_models/conflict_info.py
 from dataclasses import dataclass, field
-from typing import Set, Optional, Tuple
+from typing import List, Set, Optional, Tuple
+
+from .compiler_output import CompilerOutput
 
 @dataclass
 class ConflictInfo:
@@ -9,5 +11,20 @@ class ConflictInfo:
     involved_direct_packages: Set[str] = field(default_factory=set)
     # (package_name, specifier_hint_from_error_str)
     sub_dependency_culprit: Optional[Tuple[str, str]] = None
-    # Could add more structured fields if LLM provides them, e.g.:
-    # conflicting_transitive_constraints: Dict[str, List[str]]
\ No newline at end of file
+    # Every transitive dependency the report blames, with its specifiers, in report order (the first is sub_dependency_culprit)
+    sub_dependency_culprits: List[Tuple[str, str]] = field(default_factory=list)
+    # (requirer_name, requirer_version, dependency_name, dependency_specifier) from "X 1.0 depends on Y<2" lines
+    conflicting_constraints: List[Tuple[str, str, str, str]] = field(default_factory=list)
+    # Could add more structured fields if LLM provides them
+    # Compressed pip-compile output this result came from, shared with the evaluation cache
+    output_ref: Optional[CompilerOutput] = field(default=None, repr=False, compare=False)
+
+    def attach_output(self, output: CompilerOutput):
+        """Points at the cached compiler output and drops the private copy parsers put in error_message."""
+        self.output_ref = output
+        self.error_message = ""
+
+    def get_output_text(self) -> str:
+        if self.output_ref is not None:
+            return self.output_ref.full_text
+        return self.error_message
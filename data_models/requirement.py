@@ -1,6 +1,10 @@
 # dependency_resolver_agent/data_models/requirement.py
-from dataclasses import dataclass, field
-from typing import Optional
+import hashlib
+import threading
+import weakref
+from dataclasses import FrozenInstanceError
+from functools import lru_cache
+from typing import Optional, Tuple
 
 # --- Packaging Library (Optional but Recommended) ---
 try:
@@ -43,21 +47,100 @@ if not PACKAGING_AVAILABLE:
     print("                 Version comparison and specifier validation will be limited.")
 
 
-@dataclass(frozen=True, order=True)
+# Interning table: equal requirements share one instance for as long as anything refers to it
+_INTERNED: 'weakref.WeakValueDictionary[Tuple[str, str], Requirement]' = weakref.WeakValueDictionary()
+_INTERN_LOCK = threading.Lock()
+_UNSET = object()
+
+
+@lru_cache(maxsize=16384)
+def _parse_specifier(specifier: str) -> SpecifierSet:
+    # Shared across requirements: "==1.0.0" on many packages is parsed once
+    return SpecifierSet(specifier)
+
+
+@lru_cache(maxsize=16384)
+def _parse_version(version_str: str) -> Version:
+    return Version(version_str)
+
+
 class Requirement:
-    name: str
-    specifier: str = field(default="") # Can be empty for "any version"
+    """
+    Immutable (name, specifier) requirement. Instances are interned (Requirement("a", "==1") is
+    Requirement("a", "==1")), use __slots__, and cache their hash, parsed SpecifierSet and exact Version,
+    because the search creates and hashes thousands of them per expansion.
+    """
+    __slots__ = ("name", "specifier", "_hash", "_spec_set", "_version", "_exact_version_str", "_zobrist", "__weakref__")
+
+    def __new__(cls, name: str, specifier: str = ""):
+        key = (name, specifier)
+        existing = _INTERNED.get(key)
+        if existing is not None:
+            return existing
 
-    def __post_init__(self):
-        if not isinstance(self.name, str) or not self.name:
+        if not isinstance(name, str) or not name:
             raise ValueError("Requirement name must be a non-empty string.")
-        if not isinstance(self.specifier, str):
+        if not isinstance(specifier, str):
             raise ValueError("Requirement specifier must be a string (can be empty).")
-        if PACKAGING_AVAILABLE and self.specifier:
+        spec_set = None
+        if PACKAGING_AVAILABLE and specifier:
             try:
-                SpecifierSet(self.specifier)
+                spec_set = _parse_specifier(specifier) # Kept, not just used for validation
             except InvalidSpecifier as e:
-                raise ValueError(f"Invalid specifier '{self.specifier}' for package '{self.name}': {e}")
+                raise ValueError(f"Invalid specifier '{specifier}' for package '{name}': {e}")
+
+        self = object.__new__(cls)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "specifier", specifier)
+        object.__setattr__(self, "_hash", hash(key))
+        object.__setattr__(self, "_spec_set", spec_set)
+        object.__setattr__(self, "_version", _UNSET)
+        object.__setattr__(self, "_exact_version_str", _UNSET)
+        object.__setattr__(self, "_zobrist", None)
+        with _INTERN_LOCK:
+            return _INTERNED.setdefault(key, self)
+
+    def __setattr__(self, attr, value):
+        raise FrozenInstanceError(f"cannot assign to field '{attr}'")
+
+    def __delattr__(self, attr):
+        raise FrozenInstanceError(f"cannot delete field '{attr}'")
+
+    def __reduce__(self):
+        return (Requirement, (self.name, self.specifier)) # Re-interned on unpickling
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Requirement):
+            return NotImplemented
+        return self.name == other.name and self.specifier == other.specifier
+
+    def __lt__(self, other):
+        if not isinstance(other, Requirement):
+            return NotImplemented
+        return (self.name, self.specifier) < (other.name, other.specifier)
+
+    def __le__(self, other):
+        if not isinstance(other, Requirement):
+            return NotImplemented
+        return (self.name, self.specifier) <= (other.name, other.specifier)
+
+    def __gt__(self, other):
+        if not isinstance(other, Requirement):
+            return NotImplemented
+        return (self.name, self.specifier) > (other.name, other.specifier)
+
+    def __ge__(self, other):
+        if not isinstance(other, Requirement):
+            return NotImplemented
+        return (self.name, self.specifier) >= (other.name, other.specifier)
+
+    def __repr__(self):
+        return f"Requirement(name={self.name!r}, specifier={self.specifier!r})"
 
     def __str__(self):
         return f"{self.name}{self.specifier}" if self.specifier else self.name
@@ -65,26 +148,48 @@ class Requirement:
     def is_exact(self) -> bool:
         return self.specifier.startswith("==")
 
+    def get_specifier_set(self) -> SpecifierSet:
+        """Parsed specifier (cached); an empty set means any version."""
+        if self._spec_set is None:
+            object.__setattr__(self, "_spec_set", _parse_specifier(self.specifier) if PACKAGING_AVAILABLE else SpecifierSet(self.specifier))
+        return self._spec_set
+
     def get_exact_version_str(self) -> Optional[str]:
-        if self.is_exact():
-            version_part = self.specifier[2:]
-            if PACKAGING_AVAILABLE:
+        if self._exact_version_str is _UNSET:
+            exact_version_str = None
+            if self.is_exact():
+                version_part = self.specifier[2:]
+                if PACKAGING_AVAILABLE:
+                    version_obj = self.get_version_obj()
+                    # Or return version_part if malformed but still want to use?
+                    exact_version_str = str(version_obj.public) if version_obj is not None else None
+                else:
+                    exact_version_str = version_part # Fallback if packaging not available
+            object.__setattr__(self, "_exact_version_str", exact_version_str)
+        return self._exact_version_str
+
+    def get_version_obj(self) -> Optional[Version]:
+        if self._version is _UNSET:
+            version_obj = None
+            if self.is_exact() and PACKAGING_AVAILABLE:
                 try:
-                    return str(Version(version_part).public)
+                    version_obj = _parse_version(self.specifier[2:])
                 except InvalidVersion:
-                    return None # Or return version_part if malformed but still want to use?
-            return version_part # Fallback if packaging not available
-        return None
+                    version_obj = None
+            elif self.is_exact(): # PACKAGING_AVAILABLE is False
+                try:
+                    version_obj = Version(self.specifier[2:]) # Use dummy Version
+                except: # Catch any error during dummy parsing
+                    version_obj = None
+            object.__setattr__(self, "_version", version_obj)
+        return self._version
 
-    def get_version_obj(self) -> Optional[Version]:
-        if self.is_exact() and PACKAGING_AVAILABLE:
-            try:
-                return Version(self.specifier[2:])
-            except InvalidVersion:
-                return None
-        elif self.is_exact(): # PACKAGING_AVAILABLE is False
-             try:
-                return Version(self.specifier[2:]) # Use dummy Version
-             except: # Catch any error during dummy parsing
-                return None
-        return None
\ No newline at end of file
+    def zobrist_keys(self) -> Tuple[int, int]:
+        """
+        Two fixed pseudo-random 64-bit words (state fingerprint key, check key) for RequirementState.
+        Derived from the text rather than an RNG so runs are reproducible; computed once and freed with the instance.
+        """
+        if self._zobrist is None:
+            digest = hashlib.blake2b(f"{self.name}\0{self.specifier}".encode("utf-8"), digest_size=16).digest()
+            object.__setattr__(self, "_zobrist", (int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")))
+        return self._zobrist
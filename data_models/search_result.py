@@ -0,0 +1,22 @@
+# dependency_resolver_agent/data_models/search_result.py
+from dataclasses import dataclass
+from typing import FrozenSet, List, Tuple
+
+from .requirement import Requirement
+
+@dataclass
+class SearchResult:
+    requirements: FrozenSet[Requirement]
+    # (action, requirements after it) from the initial requirements to `requirements`
+    path: List[Tuple[str, FrozenSet[Requirement]]]
+    # True if `requirements` still conflicts: the search stopped (deadline, iteration limit, exhausted)
+    # and this is the closest state it reached
+    partial: bool
+    # Unweighted heuristic estimate and number of involved direct packages of `requirements` (0 when solved)
+    h_score: float
+    involved_count: int
+    cost: float
+    iterations: int
+    elapsed_seconds: float
+    # Heuristic weight of the search pass that found it (anytime search)
+    weight: float = 1.0
@@ -1,7 +1,9 @@
 # dependency_resolver_agent/llm_services/client.py
 from langchain_openai import ChatOpenAI
 from dependency_resolver_agent.utils import config_manager as config
-from dependency_resolver_agent.utils.logger import log_verbose
+from dependency_resolver_agent.utils.logger import get_logger
+
+log = get_logger(__name__)
 
 def get_openaicompatible_llm(
     model_name: str,
@@ -14,7 +16,7 @@ def get_openaicompatible_llm(
     """
     Returns a LangChain ChatOpenAI LLM instance configured for an OpenAI-compatible API.
     """
-    log_verbose(f"[LLM Client] Initializing LLM: Model={model_name}, BaseURL={base_url}, Temp={temperature}, MaxTokens={max_tokens}")
+    log.debug("[LLM Client] Initializing LLM: Model=%s, BaseURL=%s, Temp=%s, MaxTokens=%s", model_name, base_url, temperature, max_tokens)
     return ChatOpenAI(
         model=model_name,
         openai_api_key=api_key,
@@ -35,7 +37,8 @@ def get_llm_for_conflict_parsing(
     request_timeout: int = None
 ):
     """
-    Factory function to get an LLM instance specifically for conflict parsing, using OpenRouter.
+    Factory function to get an LLM instance specifically for conflict parsing, using OpenRouter
+    (or whatever OpenAI-compatible server LLM_BASE_URL points to).
     """
     model_to_use = model_name or config.LLM_MODEL_FOR_CONFLICT_PARSING
     temp_to_use = temperature if temperature is not None else config.LLM_TEMPERATURE
@@ -43,13 +46,13 @@ def get_llm_for_conflict_parsing(
     timeout_to_use = request_timeout if request_timeout is not None else config.LLM_REQUEST_TIMEOUT
 
     if not config.OPENROUTER_API_KEY or config.OPENROUTER_API_KEY == "YOUR_OPENROUTER_API_KEY_HERE":
-        log_verbose("[LLM Client] CRITICAL: OpenRouter API Key not configured. LLM will not function.")
+        log.error("[LLM Client] CRITICAL: OpenRouter API Key not configured. LLM will not function.")
         # raise ValueError("OpenRouter API Key not configured.") # Or handle more gracefully
 
     return get_openaicompatible_llm(
         model_name=model_to_use,
         api_key=config.OPENROUTER_API_KEY,
-        base_url="https://openrouter.ai/api/v1",
+        base_url=config.LLM_BASE_URL,
         temperature=temp_to_use,
         max_tokens=tokens_to_use,
         request_timeout=timeout_to_use
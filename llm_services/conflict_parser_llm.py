@@ -1,17 +1,21 @@
 # dependency_resolver_agent/llm_services/conflict_parser_llm.py
-import json
-from typing import FrozenSet, Optional, List
+import asyncio
+import concurrent.futures
+import threading
+from typing import Dict, FrozenSet, Optional, List
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.output_parsers import PydanticOutputParser # For structured output # <- CORRECT
 from pydantic import BaseModel, Field
 
 from dependency_resolver_agent.data_models.requirement import Requirement
 from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
 from dependency_resolver_agent.llm_services.client import get_llm_for_conflict_parsing
-from dependency_resolver_agent.utils.logger import log_verbose
+from dependency_resolver_agent.llm_services.conflict_region import extract_conflict_region, estimate_tokens
+from dependency_resolver_agent.utils.logger import get_logger
 from dependency_resolver_agent.utils import config_manager as config
 
+log = get_logger(__name__)
+
 
 # Define Pydantic model for structured LLM output
 class LLMConflictAnalysis(BaseModel):
@@ -26,16 +30,12 @@ You are an expert Python dependency analysis tool. Your task is to analyze the p
 The user's original direct dependencies were:
 {direct_dependencies_list_str}
 
-Pip-compile output:
----STDOUT---
-{stdout}
----END STDOUT---
-
----STDERR---
-{stderr}
----END STDERR---
+Relevant excerpt of the pip-compile output:
+---OUTPUT---
+{pip_output_excerpt}
+---END OUTPUT---
 
-Carefully review the stdout and stderr from pip-compile.
+Carefully review the pip-compile output.
 Based *only* on the information in the pip-compile output and the list of original direct dependencies:
 
 1.  Identify which of the *original direct dependencies* (from the list: {direct_dependencies_list_str}) are involved in or are causing the conflict.
@@ -50,82 +50,141 @@ If there's a conflict but no specific transitive sub-dependency is clearly the s
 """
 
 class LLMConflictParser:
-    def __init__(self):
+    """
+    LLM-backed conflict parser. The prompt/model/output-parser chain is built once. All calls run as
+    ainvoke() on one background event loop, at most `max_concurrency` at a time and each bounded by
+    `deadline_seconds`; parse() is the blocking front end used by the A* loop and its workers.
+    Only the conflict region of the pip output (within `token_budget`) is sent to the model.
+    """
+
+    def __init__(self, max_concurrency: int = config.LLM_MAX_CONCURRENCY,
+                 deadline_seconds: float = config.LLM_PARSE_DEADLINE_SECONDS,
+                 token_budget: int = config.LLM_PROMPT_TOKEN_BUDGET):
         self.llm = None
+        self.chain = None
+        self.max_concurrency = max(1, max_concurrency)
+        self.deadline_seconds = deadline_seconds
+        self.token_budget = token_budget
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None # Created on the background loop
+        self.calls = 0
+        self.timeouts = 0
+        self.prompt_tokens_sent = 0
         if config.OPENROUTER_API_KEY and config.OPENROUTER_API_KEY != "YOUR_OPENROUTER_API_KEY_HERE" and config.OPENROUTER_API_KEY != "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": # Check if a real key is likely set
             try:
                 self.llm = get_llm_for_conflict_parsing()
-                log_verbose("[LLMConflictParser] LLM initialized successfully.")
+                log.debug("[LLMConflictParser] LLM initialized successfully.")
             except Exception as e:
-                log_verbose(f"[LLMConflictParser] CRITICAL: Failed to initialize LLM: {e}. Will fallback to regex.")
+                log.error("[LLMConflictParser] CRITICAL: Failed to initialize LLM: %s. Will fallback to regex.", e)
                 self.llm = None
         else:
-            log_verbose("[LLMConflictParser] LLM not initialized due to missing or default API key.")
+            log.debug("[LLMConflictParser] LLM not initialized due to missing or default API key.")
 
         self.pydantic_parser = PydanticOutputParser(pydantic_object=LLMConflictAnalysis)
+        if self.llm is not None:
+            prompt = ChatPromptTemplate.from_template(
+                template=PROMPT_TEMPLATE,
+                partial_variables={"format_instructions": self.pydantic_parser.get_format_instructions()}
+            )
+            self.chain = prompt | self.llm | self.pydantic_parser
 
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-parser-loop", daemon=True).start()
+            return self._loop
 
     def parse(self, stdout: str, stderr: str, direct_requirements: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
         if not self.llm:
-            log_verbose("[LLMConflictParser] LLM not available, parse() returning None.")
+            log.debug("[LLMConflictParser] LLM not available, parse() returning None.")
             return None # Fallback will be handled by orchestrator
+        future = asyncio.run_coroutine_threadsafe(self._aparse(stdout, stderr, direct_requirements), self._get_loop())
+        try:
+            # _aparse enforces the deadline itself; the margin only covers scheduling
+            return future.result(timeout=self.deadline_seconds + 1.0)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            log.debug("[LLMConflictParser] Parse did not finish in time, falling back.")
+            return None
+
+    async def aparse(self, stdout: str, stderr: str, direct_requirements: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
+        """Awaitable parse() for callers running their own event loop."""
+        if not self.llm:
+            return None
+        future = asyncio.run_coroutine_threadsafe(self._aparse(stdout, stderr, direct_requirements), self._get_loop())
+        return await asyncio.wrap_future(future)
+
+    async def _aparse(self, stdout: str, stderr: str, direct_requirements: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
+        if self._semaphore is None: # Only ever touched from the background loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            return await asyncio.wait_for(self._invoke_limited(stdout, stderr, direct_requirements), timeout=self.deadline_seconds)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            log.debug("[LLMConflictParser] LLM call exceeded its %.0fs deadline.", self.deadline_seconds)
+            return None
 
+    async def _invoke_limited(self, stdout: str, stderr: str, direct_requirements: FrozenSet[Requirement]) -> Optional[ConflictInfo]:
         direct_deps_str_list = sorted([req.name for req in direct_requirements])
         direct_deps_display_str = ", ".join(direct_deps_str_list)
+        pip_output_excerpt = extract_conflict_region(stdout, stderr, self.token_budget)
 
-        prompt = ChatPromptTemplate.from_template(
-            template=PROMPT_TEMPLATE,
-            partial_variables={"format_instructions": self.pydantic_parser.get_format_instructions()}
-        )
-        
-        chain = prompt | self.llm | self.pydantic_parser
-
-        full_pip_output_for_llm = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}"
-        log_verbose(f"[LLMConflictParser] Querying LLM for conflict analysis. Direct deps: {direct_deps_display_str}")
-        # log_verbose(f"[LLMConflictParser] Full pip output for LLM:\n{full_pip_output_for_llm[:1000]}...") # Log sample of input to LLM
-
-        try:
-            llm_response_structured: LLMConflictAnalysis = chain.invoke({
-                "direct_dependencies_list_str": direct_deps_display_str,
-                "stdout": stdout,
-                "stderr": stderr
-            })
-            log_verbose(f"[LLMConflictParser] LLM Raw Response (structured): {llm_response_structured}")
-
-            # Ensure involved_direct_packages only contains names from the original list
-            valid_involved_direct = {
-                pkg_name for pkg_name in llm_response_structured.involved_direct_packages
-                if pkg_name in direct_deps_str_list
-            }
-            if len(valid_involved_direct) != len(llm_response_structured.involved_direct_packages):
-                log_verbose(f"[LLMConflictParser] Warning: LLM returned direct packages not in original list. Filtered.")
-
-
-            sub_dep_culprit = None
-            if llm_response_structured.sub_dependency_culprit_name and ll_m_response_structured.sub_dependency_culprit_specs:
-                sub_dep_culprit = (
-                    llm_response_structured.sub_dependency_culprit_name,
-                    llm_response_structured.sub_dependency_culprit_specs
-                )
-            elif llm_response_structured.sub_dependency_culprit_name: # Name but no specs
-                 sub_dep_culprit = (llm_response_structured.sub_dependency_culprit_name, "")
-
-
-            # If LLM says no direct packages involved but there was an error, it might be a parsing failure or a non-dependency error
-            is_conflict_according_to_llm = bool(valid_involved_direct) or bool(sub_dep_culprit)
-            
-            # The 'is_conflict' field of ConflictInfo should be based on pip-compile's exit code primarily.
-            # The LLM's job is to detail the conflict IF one exists.
-            # So, this method is called when a conflict IS known.
-            return ConflictInfo(
-                is_conflict=True, # Assume conflict as this parser is called on failure
-                error_message=full_pip_output_for_llm, # Store the full input given to LLM
-                involved_direct_packages=valid_involved_direct,
-                sub_dependency_culprit=sub_dep_culprit
+        async with self._semaphore:
+            self.calls += 1
+            self.prompt_tokens_sent += estimate_tokens(pip_output_excerpt)
+            log.debug("[LLMConflictParser] Querying LLM for conflict analysis. Direct deps: %s (excerpt ~%s tokens of ~%s)",
+                      direct_deps_display_str, estimate_tokens(pip_output_excerpt), estimate_tokens(stdout) + estimate_tokens(stderr))
+            try:
+                llm_response_structured: LLMConflictAnalysis = await self.chain.ainvoke({
+                    "direct_dependencies_list_str": direct_deps_display_str,
+                    "pip_output_excerpt": pip_output_excerpt
+                })
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.debug("[LLMConflictParser] Error during LLM invocation or parsing: %s - %s", type(e).__name__, e)
+                # Optionally, could try a simpler StrOutputParser if Pydantic fails, then regex the string.
+                # For now, signal failure by returning None.
+                return None
+        log.debug("[LLMConflictParser] LLM Raw Response (structured): %s", llm_response_structured)
+        return self._to_conflict_info(llm_response_structured, direct_deps_str_list, f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}")
+
+    def _to_conflict_info(self, llm_response_structured: LLMConflictAnalysis, direct_deps_str_list: List[str],
+                          full_pip_output: str) -> ConflictInfo:
+        # Ensure involved_direct_packages only contains names from the original list
+        valid_involved_direct = {
+            pkg_name for pkg_name in llm_response_structured.involved_direct_packages
+            if pkg_name in direct_deps_str_list
+        }
+        if len(valid_involved_direct) != len(llm_response_structured.involved_direct_packages):
+            log.warning("[LLMConflictParser] Warning: LLM returned direct packages not in original list. Filtered.")
+
+        sub_dep_culprit = None
+        if llm_response_structured.sub_dependency_culprit_name and llm_response_structured.sub_dependency_culprit_specs:
+            sub_dep_culprit = (
+                llm_response_structured.sub_dependency_culprit_name,
+                llm_response_structured.sub_dependency_culprit_specs
             )
+        elif llm_response_structured.sub_dependency_culprit_name: # Name but no specs
+             sub_dep_culprit = (llm_response_structured.sub_dependency_culprit_name, "")
+
+        # The 'is_conflict' field of ConflictInfo should be based on pip-compile's exit code primarily.
+        # The LLM's job is to detail the conflict IF one exists.
+        # So, this method is called when a conflict IS known.
+        return ConflictInfo(
+            is_conflict=True, # Assume conflict as this parser is called on failure
+            error_message=full_pip_output, # Full output; the orchestrator swaps it for the cached copy
+            involved_direct_packages=valid_involved_direct,
+            sub_dependency_culprit=sub_dep_culprit,
+            sub_dependency_culprits=[sub_dep_culprit] if sub_dep_culprit else []
+        )
 
-        except Exception as e:
-            log_verbose(f"[LLMConflictParser] Error during LLM invocation or parsing: {type(e).__name__} - {e}")
-            # Optionally, could try a simpler StrOutputParser if Pydantic fails, then regex the string.
-            # For now, signal failure by returning None.
-            return None
\ No newline at end of file
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "prompt_tokens_sent": self.prompt_tokens_sent,
+            "avg_prompt_tokens": (self.prompt_tokens_sent / self.calls) if self.calls else 0.0,
+        }
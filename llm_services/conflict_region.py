@@ -0,0 +1,68 @@
+# dependency_resolver_agent/llm_services/conflict_region.py
+"""
+Cuts pip-compile --verbose output (often hundreds of KB) down to the part that explains a failure,
+so only that goes into an LLM prompt.
+"""
+import re
+from typing import Dict, List
+
+# Rough size of an LLM token in characters of pip output (mostly ASCII package names and versions)
+CHARS_PER_TOKEN = 4
+
+CONFLICT_REPORT_HEADER = "The conflict is caused by:"
+_RELEVANT_LINE = re.compile(
+    r"ERROR:|Cannot install|depends on|The user requested|is required by|Could not find a version|"
+    r"No matching distribution|ResolutionImpossible|ResolutionTooDeep|requires a different Python|incompatible",
+    re.IGNORECASE
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def extract_conflict_region(stdout: str, stderr: str, token_budget: int) -> str:
+    """
+    The last "The conflict is caused by:" report first, then other error lines (latest first, shown in
+    their original order), within `token_budget`. Falls back to the tail of the output if nothing matches.
+    """
+    max_chars = max(token_budget, 1) * CHARS_PER_TOKEN
+    lines = f"{stdout}\n{stderr}".splitlines()
+
+    report: List[str] = []
+    for i in range(len(lines) - 1, -1, -1):
+        if CONFLICT_REPORT_HEADER in lines[i]:
+            # The report runs until the first blank line; pip prints the final one last
+            j = i
+            while j < len(lines) and (j == i or lines[j].strip()):
+                report.append(lines[j].rstrip())
+                j += 1
+            break
+
+    selected: Dict[str, None] = {}
+    used = 0
+    for line in report:
+        if used + len(line) + 1 > max_chars:
+            break
+        selected.setdefault(line)
+        used += len(line) + 1
+
+    # Other error context, most recent first; --verbose repeats the same lines many times
+    extra_positions: Dict[str, int] = {}
+    for position in range(len(lines) - 1, -1, -1):
+        line = lines[position].rstrip()
+        if not _RELEVANT_LINE.search(line) or line in selected or line in extra_positions:
+            continue
+        if used + len(line) + 1 > max_chars:
+            break
+        extra_positions[line] = position
+        used += len(line) + 1
+
+    excerpt = list(selected)
+    extra = sorted(extra_positions, key=extra_positions.get)
+    if excerpt and extra:
+        excerpt.append("")
+    excerpt.extend(extra)
+    if not excerpt:
+        return f"{stdout}\n{stderr}".strip()[-max_chars:]
+    return "\n".join(excerpt)
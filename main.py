@@ -1,31 +1,78 @@
 # dependency_resolver_agent/main.py
+import re
 import time
 import shutil
 import subprocess
 import sys
 import os
+from typing import Optional
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from dependency_resolver_agent.utils import logger, cache_manager, config_manager
+from dependency_resolver_agent.utils import logger, cache_manager, config_manager, tracing
 from dependency_resolver_agent.tooling.pypi_service import PyPIService
-from dependency_resolver_agent.tooling.pip_compiler_service import PipCompilerService
-from dependency_resolver_agent.tooling.regex_conflict_parser import RegexConflictParser
-from dependency_resolver_agent.llm_services.conflict_parser_llm import LLMConflictParser # Import LLM parser
+from dependency_resolver_agent.tooling.metadata_index import MetadataIndex
+from dependency_resolver_agent.tooling.compiler_factory import create_compiler_service
+from dependency_resolver_agent.tooling.conflict_parser_factory import create_conflict_parser, create_configured_llm_parser
 from dependency_resolver_agent.agent_core.action_generator import ActionGenerator
 from dependency_resolver_agent.agent_core.heuristic_calculator import HeuristicCalculator
+from dependency_resolver_agent.agent_core.feasibility_checker import FeasibilityChecker
 from dependency_resolver_agent.agent_core.orchestrator import Orchestrator
 from dependency_resolver_agent.data_models.requirement import PACKAGING_AVAILABLE
 
 
+def enable_configured_persistent_cache(python_executable: str):
+    if not config_manager.PERSISTENT_CACHE_ENABLED:
+        return None
+    persistent_cache = cache_manager.enable_persistent_cache(
+        config_manager.PERSISTENT_CACHE_PATH,
+        python_executable=python_executable,
+        index_fingerprint=config_manager.PERSISTENT_CACHE_INDEX_FINGERPRINT,
+        max_bytes=config_manager.PERSISTENT_CACHE_MAX_BYTES,
+        max_age_seconds=config_manager.PERSISTENT_CACHE_MAX_AGE_SECONDS
+    )
+    print(f"Persistent cache: {config_manager.PERSISTENT_CACHE_PATH} ({len(persistent_cache)} entries)")
+    return persistent_cache
+
+
+def open_configured_metadata_index():
+    if not config_manager.METADATA_INDEX_PATH:
+        return None
+    metadata_index = MetadataIndex.open(config_manager.METADATA_INDEX_PATH)
+    print(f"Metadata index: {config_manager.METADATA_INDEX_PATH} ({len(metadata_index)} packages)")
+    return metadata_index
+
+
+def write_trace_files(trace: tracing.Tracer, test_name: str):
+    os.makedirs(config_manager.TRACE_OUTPUT_DIR, exist_ok=True)
+    base_name = os.path.join(config_manager.TRACE_OUTPUT_DIR, re.sub(r"[^\w.-]+", "_", test_name).strip("_"))
+    trace.write_summary(base_name + "-summary.json")
+    trace.write_chrome_trace(base_name + "-trace.json")
+    print(f"Trace written to {base_name}-trace.json (chrome://tracing, Perfetto or speedscope), summary to {base_name}-summary.json")
+
+
+def build_orchestrator(pypi_svc: PyPIService, pip_compiler_svc, llm_parser_instance=None,
+                       search_strategy: Optional[str] = None) -> Orchestrator:
+    return Orchestrator(
+        action_generator=ActionGenerator(pypi_service=pypi_svc),
+        heuristic_calc=HeuristicCalculator(pypi_service=pypi_svc),
+        pip_compiler=pip_compiler_svc,
+        regex_conflict_parser=create_conflict_parser("regex"), # Always provide regex as fallback
+        llm_conflict_parser=llm_parser_instance if config_manager.USE_LLM_PARSER else None,
+        feasibility_checker=FeasibilityChecker(pypi_svc) if pypi_svc.metadata_index is not None else None,
+        search_strategy=search_strategy
+    )
+
+
 def run_tests():
     current_python_interpreter = config_manager.DEFAULT_PYTHON_EXECUTABLE
     print(f"Script is running under Python interpreter: {current_python_interpreter}")
     # ... (pip-compile check remains the same) ...
     pip_compile_exe_path_check = shutil.which("pip-compile")
-    if not pip_compile_exe_path_check:
+    print(f"Compiler backend: {config_manager.COMPILER_BACKEND}")
+    if config_manager.COMPILER_BACKEND == "pip-compile" and not pip_compile_exe_path_check:
         print("CRITICAL ERROR: 'pip-compile' command not found in PATH.")
         # ... (rest of the check)
         sys.exit(1) # Simplified exit for brevity
@@ -47,25 +94,16 @@ def run_tests():
         print(f"LLM Model for Parsing: {config_manager.LLM_MODEL_FOR_CONFLICT_PARSING}")
 
 
+    enable_configured_persistent_cache(current_python_interpreter)
+
     # Initialize services
-    pypi_svc = PyPIService()
-    pip_compiler_svc = PipCompilerService(python_executable=current_python_interpreter)
-    regex_parser = RegexConflictParser()
-    
-    llm_parser_instance = None
-    if config_manager.USE_LLM_PARSER:
-        llm_parser_instance = LLMConflictParser() # Instantiated here
+    metadata_index = open_configured_metadata_index()
+    pypi_svc = PyPIService(metadata_index=metadata_index)
+    pip_compiler_svc = create_compiler_service(config_manager.COMPILER_BACKEND, python_executable=current_python_interpreter)
 
-    action_gen = ActionGenerator(pypi_service=pypi_svc)
-    heuristic_calc = HeuristicCalculator()
+    llm_parser_instance = create_configured_llm_parser() # Only now is the LLM stack imported, and only if enabled
 
-    orchestrator = Orchestrator(
-        action_generator=action_gen,
-        heuristic_calc=heuristic_calc,
-        pip_compiler=pip_compiler_svc,
-        regex_conflict_parser=regex_parser, # Always provide regex as fallback
-        llm_conflict_parser=llm_parser_instance if config_manager.USE_LLM_PARSER else None
-    )
+    orchestrator = build_orchestrator(pypi_svc, pip_compiler_svc, llm_parser_instance)
 
     # ... (Test cases remain the same as the previous full build)
     test_cases = {
@@ -90,7 +128,8 @@ flask==2.0.0
 jinja2==3.1.0
 """, # Flask 2.0.0 requires jinja2<3.1,>=2.10.1. Jinja2==3.1.0 is incompatible.
     }
-    pypi_svc.versions_db.setdefault("jinja2", ["2.11.3", "3.0.0", "3.0.3", "3.1.0", "3.1.2", "3.1.3"])
+    if metadata_index is None:
+        pypi_svc.versions_db.setdefault("jinja2", ["2.11.3", "3.0.0", "3.0.3", "3.1.0", "3.1.2", "3.1.3"])
 
 
     for test_name, initial_reqs_content in test_cases.items():
@@ -106,10 +145,12 @@ jinja2==3.1.0
         cache_manager.clear_pip_compile_cache()
         start_time = time.time()
 
-        result_tuple = orchestrator.solve(
-            initial_reqs_content,
-            max_iterations=config_manager.MAX_ASTAR_ITERATIONS
-        )
+        with tracing.capture(record_events=bool(config_manager.TRACE_OUTPUT_DIR)) as trace:
+            result_tuple = orchestrator.solve(
+                initial_reqs_content,
+                max_iterations=config_manager.MAX_ASTAR_ITERATIONS,
+                jobs=config_manager.DEFAULT_SOLVE_JOBS
+            )
         end_time = time.time()
         # logger.set_verbose_logging(False) # Keep it on if it was for LLM
 
@@ -128,7 +169,33 @@ jinja2==3.1.0
             print("\n--- No Solution Found for this test case ---")
 
         print(f"\nTotal time for {test_name}: {end_time - start_time:.3f} seconds")
-        print(f"Cache size for {test_name}: {len(cache_manager.PIP_COMPILE_CACHE) + len(cache_manager.FULL_EVAL_CACHE)} entries.")
+        print("Time by phase:")
+        for line in tracing.format_summary(trace.summary()):
+            print(line)
+        if config_manager.TRACE_OUTPUT_DIR:
+            write_trace_files(trace, test_name)
+        search_stats = orchestrator.last_search_stats
+        print(f"Search ({search_stats['strategy']}): {search_stats['expansions']} expansions, {search_stats['compiles']} compiles, "
+              f"peak frontier {search_stats['peak_frontier']} nodes, {search_stats['dropped']} dropped.")
+        cache_stats = cache_manager.get_cache_stats()
+        print(f"Cache for {test_name}: {cache_stats['entries']} entries, {cache_stats['bytes_used']} bytes "
+              f"(hits={cache_stats['hits']}, misses={cache_stats['misses']}, evictions={cache_stats['evictions']}, "
+              f"persistent hits={cache_stats['persistent_hits']}).")
+        print(f"Conflict parses reused by signature: {cache_stats['signature_hits']} "
+              f"of {cache_stats['signature_hits'] + cache_stats['signature_misses']} failures "
+              f"(hit rate {cache_stats['signature_hit_rate']:.0%}).")
+        subsumption_stats = orchestrator.subsumption_index.stats()
+        print(f"Compiles avoided by subsumption: {subsumption_stats['compiles_avoided']} "
+              f"(implied conflicts={subsumption_stats['inferred_unsatisfiable']}, implied solvable={subsumption_stats['inferred_satisfiable']}).")
+        if orchestrator.feasibility_checker is not None:
+            print(f"States rejected by the metadata pre-check so far: {orchestrator.feasibility_checker.rejected} "
+                  f"of {orchestrator.feasibility_checker.checks} checked.")
+        early_stops = getattr(pip_compiler_svc, "early_stops", None) # pip-compile backend only
+        if early_stops is not None:
+            print(f"pip-compile runs stopped early so far: {early_stops['conflict_report'] + early_stops['no_matching_distribution']} "
+                  f"after a complete error report, {early_stops['backtracking_budget']} by the backtracking watchdog.")
+        if config_manager.WARM_START_ENABLED:
+            print(f"Compiles warm-started from an ancestor's pins so far: {pip_compiler_svc.seeded_compiles}.")
         print("=========================================")
 
 if __name__ == "__main__":
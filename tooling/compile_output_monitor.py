@@ -0,0 +1,66 @@
+# dependency_resolver_agent/tooling/compile_output_monitor.py
+"""
+Incremental reading of pip-compile output, line by line as it is produced, to decide whether the
+run can be stopped before the process exits: once pip has printed a complete conflict report, or
+once it has spent more backtracking rounds than the configured budget.
+"""
+import re
+from typing import Optional
+
+from dependency_resolver_agent.utils import config_manager as config
+from dependency_resolver_agent.utils.cache_manager import RESOLUTION_TOO_DEEP_MARKER
+
+STOP_CONFLICT_REPORT = "conflict_report"
+STOP_NO_MATCHING_DISTRIBUTION = "no_matching_distribution"
+STOP_BACKTRACKING_BUDGET = "backtracking_budget"
+
+_REPORT_HEADER = re.compile(r"The conflict is caused by:", re.IGNORECASE)
+_CAUSE_LINE = re.compile(r"depends on|The user requested|is required by", re.IGNORECASE)
+# After the causes pip only prints generic advice and the ResolutionImpossible footer
+_REPORT_END = re.compile(r"To fix this you could try to|ResolutionImpossible", re.IGNORECASE)
+_NO_MATCHING_DISTRIBUTION = re.compile(r"ERROR: No matching distribution found for")
+# pip's resolver reporter: one of these per rejected candidate (debug) or per backtracking milestone (info)
+_BACKTRACK_LINE = re.compile(
+    r"Will try a different candidate|pip is (?:still )?looking at multiple versions of|"
+    r"This is taking longer than usual|Reporter\.rejecting_candidate"
+)
+
+
+class CompileOutputMonitor:
+    def __init__(self, max_backtrack_rounds: int = config.PIP_COMPILE_MAX_BACKTRACK_ROUNDS,
+                 stop_on_report: bool = config.PIP_COMPILE_EARLY_STOP):
+        self.max_backtrack_rounds = max_backtrack_rounds # 0 disables the watchdog
+        self.stop_on_report = stop_on_report
+        self.backtrack_rounds = 0
+        self.stop_reason: Optional[str] = None
+        self._in_report = False
+        self._report_causes = 0
+
+    def feed(self, line: str) -> Optional[str]:
+        """Takes the next output line; returns a STOP_* reason once the run can be stopped, else None."""
+        if self.stop_reason is not None:
+            return self.stop_reason
+        if self._in_report:
+            if _CAUSE_LINE.search(line):
+                self._report_causes += 1
+            elif self._report_causes and _REPORT_END.search(line) and self.stop_on_report:
+                self.stop_reason = STOP_CONFLICT_REPORT
+        elif _REPORT_HEADER.search(line):
+            self._in_report = True
+        elif _NO_MATCHING_DISTRIBUTION.search(line) and self.stop_on_report:
+            self.stop_reason = STOP_NO_MATCHING_DISTRIBUTION
+        elif _BACKTRACK_LINE.search(line):
+            self.backtrack_rounds += 1
+            if self.max_backtrack_rounds and self.backtrack_rounds > self.max_backtrack_rounds:
+                self.stop_reason = STOP_BACKTRACKING_BUDGET
+        return self.stop_reason
+
+    def stop_message(self) -> str:
+        """
+        Line appended to stderr when the run is stopped, so the output still reads as a resolution failure.
+        A budget stop carries RESOLUTION_TOO_DEEP_MARKER: it is inconclusive, not evidence of a conflict.
+        """
+        if self.stop_reason == STOP_BACKTRACKING_BUDGET:
+            return (f"ERROR: {RESOLUTION_TOO_DEEP_MARKER}: pip-compile exceeded {self.max_backtrack_rounds} backtracking rounds "
+                    "and was stopped (PIP_COMPILE_MAX_BACKTRACK_ROUNDS)")
+        return "" # pip already printed the complete error
@@ -0,0 +1,26 @@
+# dependency_resolver_agent/tooling/compiler_factory.py
+from typing import Optional
+
+from dependency_resolver_agent.utils import config_manager as config
+
+COMPILER_BACKENDS = ("pip-compile", "in-process")
+
+
+def create_compiler_service(backend: Optional[str] = None,
+                            python_executable: str = config.DEFAULT_PYTHON_EXECUTABLE,
+                            index_path: Optional[str] = None):
+    """
+    Returns the compiler service selected by `backend` (default: config.COMPILER_BACKEND).
+    Every backend exposes run_compile(requirements_set, cancel_event=None, seed_pins=None) -> (success, stdout, stderr).
+    """
+    backend = backend or config.COMPILER_BACKEND
+    if backend == "pip-compile":
+        from dependency_resolver_agent.tooling.pip_compiler_service import PipCompilerService
+        return PipCompilerService(python_executable=python_executable)
+    if backend == "in-process":
+        index_path = index_path or config.LOCAL_PACKAGE_INDEX_PATH or config.PIP_WHEELHOUSE_DIR
+        if not index_path:
+            raise ValueError("The in-process compiler backend needs LOCAL_PACKAGE_INDEX_PATH or PIP_WHEELHOUSE_DIR (a directory of wheels/.metadata files).")
+        from dependency_resolver_agent.tooling.inprocess_resolver_service import InProcessResolverService
+        return InProcessResolverService(index_path, python_executable=python_executable)
+    raise ValueError(f"Unknown compiler backend '{backend}'. Expected one of: {', '.join(COMPILER_BACKENDS)}")
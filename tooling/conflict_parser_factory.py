@@ -0,0 +1,56 @@
+# dependency_resolver_agent/tooling/conflict_parser_factory.py
+import importlib
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+from dependency_resolver_agent.utils import config_manager as config
+
+if TYPE_CHECKING:
+    from dependency_resolver_agent.llm_services.conflict_parser_llm import LLMConflictParser
+
+# Parser name -> "module:class". Backends are imported the first time they are asked for, so a regex-only run
+# never loads the LLM stack (langchain, pydantic, the OpenAI client).
+CONFLICT_PARSER_BACKENDS: Dict[str, str] = {
+    "regex": "dependency_resolver_agent.tooling.regex_conflict_parser:RegexConflictParser",
+    "llm": "dependency_resolver_agent.llm_services.conflict_parser_llm:LLMConflictParser",
+}
+
+_loaded_classes: Dict[str, type] = {}
+_load_lock = threading.Lock()
+
+
+def register_conflict_parser(name: str, target: str):
+    """Registers (or replaces) a backend as "module:class"; nothing is imported until it is used."""
+    module_name, _, class_name = target.partition(":")
+    if not module_name or not class_name:
+        raise ValueError(f"Conflict parser target must look like 'package.module:ClassName', got '{target}'")
+    with _load_lock:
+        CONFLICT_PARSER_BACKENDS[name] = target
+        _loaded_classes.pop(name, None)
+
+
+def get_conflict_parser_class(name: str) -> type:
+    parser_class = _loaded_classes.get(name)
+    if parser_class is not None:
+        return parser_class
+    target = CONFLICT_PARSER_BACKENDS.get(name)
+    if target is None:
+        raise ValueError(f"Unknown conflict parser '{name}'. Expected one of: {', '.join(CONFLICT_PARSER_BACKENDS)}")
+    module_name, _, class_name = target.partition(":")
+    with _load_lock:
+        parser_class = getattr(importlib.import_module(module_name), class_name)
+        _loaded_classes[name] = parser_class
+    return parser_class
+
+
+def create_conflict_parser(name: str, **kwargs):
+    """
+    Returns a new parser of the named backend. Every backend exposes
+    parse(stdout, stderr, direct_requirements) -> Optional[ConflictInfo].
+    """
+    return get_conflict_parser_class(name)(**kwargs)
+
+
+def create_configured_llm_parser() -> Optional['LLMConflictParser']:
+    """The LLM parser if USE_LLM_PARSER is on, else None (without importing the LLM stack)."""
+    return create_conflict_parser("llm") if config.USE_LLM_PARSER else None
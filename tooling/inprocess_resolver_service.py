@@ -0,0 +1,371 @@
+# dependency_resolver_agent/tooling/inprocess_resolver_service.py
+import os
+import threading
+import zipfile
+from email.parser import HeaderParser
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    from pip._vendor import resolvelib # Same resolver pip itself uses
+except ImportError: # pragma: no cover - very old or stripped pip
+    import resolvelib
+
+from packaging.requirements import Requirement as PkgRequirement, InvalidRequirement
+from packaging.specifiers import SpecifierSet, InvalidSpecifier
+from packaging.tags import sys_tags
+from packaging.utils import canonicalize_name, parse_wheel_filename, InvalidWheelFilename
+from packaging.version import Version, InvalidVersion
+
+from dependency_resolver_agent.data_models.requirement import Requirement
+from dependency_resolver_agent.utils.logger import get_logger, lazy
+from dependency_resolver_agent.utils import cache_manager
+from dependency_resolver_agent.utils import config_manager as config
+from dependency_resolver_agent.utils.persistent_cache import get_python_version
+from dependency_resolver_agent.tooling.metadata_index import MetadataIndex
+
+log = get_logger(__name__)
+
+RESOLUTION_IMPOSSIBLE_HELP = "ERROR: ResolutionImpossible: for help visit https://pip.pypa.io/en/latest/topics/dependency-resolution/#dealing-with-dependency-conflicts"
+
+
+class Candidate:
+    """
+    One release of a project. `path` is where its source reads the metadata from (a wheel or
+    .metadata file, or the version key in a MetadataIndex). Metadata is read lazily and then kept.
+    """
+    __slots__ = ("name", "version", "path", "_requires_dist", "_requires_python", "_index")
+
+    def __init__(self, name: str, version: Version, path: str, index: 'LocalPackageIndex'):
+        self.name = name
+        self.version = version
+        self.path = path
+        self._requires_dist: Optional[List[PkgRequirement]] = None
+        self._requires_python: Optional[SpecifierSet] = None
+        self._index = index
+
+    def _load(self):
+        requires_dist, requires_python = self._index.read_metadata(self)
+        self._requires_dist = requires_dist
+        self._requires_python = requires_python
+
+    @property
+    def requires_dist(self) -> List[PkgRequirement]:
+        if self._requires_dist is None:
+            self._load()
+        return self._requires_dist
+
+    @property
+    def requires_python(self) -> SpecifierSet:
+        if self._requires_dist is None:
+            self._load()
+        return self._requires_python
+
+    def __repr__(self):
+        return f"Candidate({self.name}=={self.version})"
+
+
+class LocalPackageIndex:
+    """
+    File-based package index: a directory of wheels (flat, find-links style, or one sub-directory per
+    project like a PEP 503 simple repository). PEP 658 "<file>.metadata" sidecars are used when present,
+    so sdists can take part too. Candidate lists and parsed metadata are cached for the life of the object.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._projects: Optional[Dict[str, List[Candidate]]] = None
+        self._lock = threading.Lock()
+        self._supported_tags = set(sys_tags())
+        self.metadata_reads = 0
+
+    def _scan(self) -> Dict[str, List[Candidate]]:
+        projects: Dict[str, Dict[Version, Candidate]] = {}
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if filename.endswith(".whl"):
+                    try:
+                        name, version, _build, tags = parse_wheel_filename(filename)
+                    except InvalidWheelFilename:
+                        continue
+                    if not tags & self._supported_tags:
+                        continue
+                elif filename.endswith(".metadata") and not filename.endswith(".whl.metadata"):
+                    # PEP 658 sidecar of an sdist (or of nothing: metadata-only index); wheel sidecars are found via the wheel
+                    name, version = self._read_name_version(path)
+                    if name is None:
+                        continue
+                else:
+                    continue
+                existing = projects.setdefault(canonicalize_name(name), {})
+                existing.setdefault(version, Candidate(canonicalize_name(name), version, path, self))
+        log.debug("[LocalPackageIndex] Indexed %s projects under %s", len(projects), self.root)
+        return {name: sorted(by_version.values(), key=lambda c: c.version, reverse=True) for name, by_version in projects.items()}
+
+    def _read_name_version(self, metadata_path: str) -> Tuple[Optional[str], Optional[Version]]:
+        with open(metadata_path, encoding="utf-8") as f:
+            headers = HeaderParser().parse(f)
+        try:
+            return headers["Name"], Version(headers["Version"])
+        except (TypeError, InvalidVersion):
+            return None, None
+
+    def get_candidates(self, name: str) -> List[Candidate]:
+        """All releases of a project, newest first."""
+        if self._projects is None:
+            with self._lock:
+                if self._projects is None:
+                    self._projects = self._scan()
+        return self._projects.get(canonicalize_name(name), [])
+
+    def project_names(self) -> List[str]:
+        if self._projects is None:
+            self.get_candidates("")
+        return sorted(self._projects)
+
+    def read_metadata(self, candidate: Candidate) -> Tuple[List[PkgRequirement], SpecifierSet]:
+        self.metadata_reads += 1
+        path = candidate.path
+        sidecar = path if path.endswith(".metadata") else path + ".metadata"
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                raw = f.read()
+        else:
+            with zipfile.ZipFile(path) as wheel:
+                metadata_name = next(n for n in wheel.namelist() if n.endswith(".dist-info/METADATA"))
+                raw = wheel.read(metadata_name).decode("utf-8")
+        headers = HeaderParser().parsestr(raw)
+        return _parse_requires(headers.get_all("Requires-Dist") or [], headers.get("Requires-Python") or "", path)
+
+
+class MetadataIndexSource:
+    """Candidate source backed by a prebuilt MetadataIndex (no wheel files needed)."""
+
+    def __init__(self, metadata_index: MetadataIndex):
+        self.metadata_index = metadata_index
+        self._candidates: Dict[str, List[Candidate]] = {}
+        self.metadata_reads = 0
+
+    def get_candidates(self, name: str) -> List[Candidate]:
+        canonical = canonicalize_name(name)
+        candidates = self._candidates.get(canonical)
+        if candidates is None:
+            candidates = []
+            for release in reversed(self.metadata_index.get_releases(canonical)):
+                try:
+                    candidates.append(Candidate(canonical, Version(release.version), release.version, self))
+                except InvalidVersion:
+                    continue
+            self._candidates[canonical] = candidates
+        return candidates
+
+    def read_metadata(self, candidate: Candidate) -> Tuple[List[PkgRequirement], SpecifierSet]:
+        self.metadata_reads += 1
+        release = self.metadata_index.get_release(candidate.name, candidate.path)
+        if release is None:
+            return [], SpecifierSet("")
+        return _parse_requires(release.requires_dist, release.requires_python, f"{candidate.name} {candidate.path}")
+
+
+def _parse_requires(requires_dist_lines: Iterable[str], requires_python: str, origin: str) -> Tuple[List[PkgRequirement], SpecifierSet]:
+    requires_dist = []
+    for line in requires_dist_lines:
+        try:
+            requires_dist.append(PkgRequirement(line))
+        except InvalidRequirement:
+            log.debug("[InProcessResolver] Skipping invalid Requires-Dist '%s' in %s", line, origin)
+    try:
+        python_spec = SpecifierSet(requires_python)
+    except InvalidSpecifier:
+        python_spec = SpecifierSet("")
+    return requires_dist, python_spec
+
+
+class _Provider(resolvelib.AbstractProvider):
+    def __init__(self, index, python_version: Version, marker_env: Dict[str, str],
+                 cancel_event: Optional[threading.Event], seed_pins: Optional[Dict[str, str]] = None):
+        self.index = index
+        self.python_version = python_version
+        self.marker_env = marker_env
+        self.cancel_event = cancel_event
+        self.seed_pins = seed_pins or {} # {canonical name: version} tried first, when still allowed
+        self.prereleases_allowed = set() # Projects whose latest find_matches admitted pre-releases
+
+    def identify(self, requirement_or_candidate) -> str:
+        return canonicalize_name(requirement_or_candidate.name)
+
+    def get_preference(self, identifier, resolutions, candidates, information, backtrack_causes):
+        # Resolve the most constrained projects first, like pip does for pinned requirements
+        return sum(1 for _ in candidates[identifier])
+
+    def find_matches(self, identifier: str, requirements: Mapping[str, Iterable[PkgRequirement]],
+                     incompatibilities: Mapping[str, Iterable[Candidate]]) -> List[Candidate]:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise _Cancelled()
+        reqs = list(requirements[identifier])
+        bad_versions = {c.version for c in incompatibilities[identifier]}
+        # pip's rule: pre-releases only match if a specifier names one (e.g. >=2.0b1), or if no final release matches
+        explicit_prereleases = any(r.specifier.prereleases for r in reqs)
+        matches = []
+        prerelease_matches = []
+        for candidate in self.index.get_candidates(identifier):
+            if candidate.version in bad_versions:
+                continue
+            if not all(r.specifier.contains(candidate.version, prereleases=True) for r in reqs):
+                continue
+            if self.python_version not in candidate.requires_python:
+                continue
+            if candidate.version.is_prerelease and not explicit_prereleases:
+                prerelease_matches.append(candidate)
+            else:
+                matches.append(candidate)
+        if not matches:
+            matches = prerelease_matches
+        if explicit_prereleases or (matches and matches is prerelease_matches):
+            self.prereleases_allowed.add(identifier)
+        else:
+            self.prereleases_allowed.discard(identifier)
+        seed_version = self.seed_pins.get(identifier)
+        if seed_version is not None:
+            # Only the order changes: the ancestor's pin is tried before the newest release
+            matches.sort(key=lambda c: str(c.version) != seed_version)
+        return matches
+
+    def is_satisfied_by(self, requirement: PkgRequirement, candidate: Candidate) -> bool:
+        prereleases = True if candidate.name in self.prereleases_allowed else None
+        return requirement.specifier.contains(candidate.version, prereleases=prereleases)
+
+    def get_dependencies(self, candidate: Candidate) -> List[PkgRequirement]:
+        deps = []
+        for req in candidate.requires_dist:
+            if req.marker is not None and not req.marker.evaluate(self.marker_env):
+                continue # Includes extras-only dependencies (extra == "") and other-platform deps
+            deps.append(req)
+        return deps
+
+
+class _PinReporter(resolvelib.BaseReporter):
+    """Counts rounds and keeps the latest resolver state, whose mapping is the (partial) resolution so far."""
+
+    def __init__(self):
+        self.rounds = 0
+        self.state = None
+
+    def ending_round(self, index, state):
+        self.rounds = index + 1
+        self.state = state
+
+    def pins(self) -> Dict[str, str]:
+        if self.state is None:
+            return {}
+        return {name: str(c.version) for name, c in self.state.mapping.items()}
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class InProcessResolverService:
+    """
+    Drop-in alternative to PipCompilerService: resolves with resolvelib inside this process
+    against a LocalPackageIndex directory or a prebuilt MetadataIndex file, with the same
+    (success, stdout, stderr) contract.
+    Failures are reported in pip's own wording so the conflict parsers work unchanged.
+    """
+
+    def __init__(self, index_path: str, python_executable: str = config.DEFAULT_PYTHON_EXECUTABLE):
+        self.python_executable = python_executable
+        if os.path.isfile(index_path):
+            self.index = MetadataIndexSource(MetadataIndex.open(index_path))
+        else:
+            self.index = LocalPackageIndex(index_path)
+        self.python_version = Version(get_python_version(python_executable))
+        self.marker_env = {
+            "python_version": f"{self.python_version.major}.{self.python_version.minor}",
+            "python_full_version": str(self.python_version),
+            "extra": "",
+        }
+        # Resolver rounds over all compiles, and how many compiles were warm-started from seed pins
+        self.total_rounds = 0
+        self.seeded_compiles = 0
+        self._stats_lock = threading.Lock()
+
+    def run_compile(self, requirements_set: FrozenSet[Requirement], cancel_event: Optional[threading.Event] = None,
+                    seed_pins: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str]:
+        """
+        Resolves requirements_set in-process.
+        seed_pins ({canonical name: version}, e.g. the parent state's resolution) are tried first wherever the
+        requirements still allow them; they only steer the search order, never the outcome.
+        The pins reached (all of them on success, the partial resolution on failure) are recorded with
+        cache_manager.store_resolved_pins when WARM_START_ENABLED.
+        Returns: (success_status: bool, stdout: str, stderr: str)
+        """
+        log.debug("  [InProcessResolverService] Resolving: %s", lazy(self._reqs_to_str_summary, requirements_set))
+        try:
+            user_reqs = [PkgRequirement(str(r)) for r in sorted(requirements_set)]
+        except InvalidRequirement as e:
+            return False, "", f"ERROR: Invalid requirement: {e}"
+
+        for req in user_reqs:
+            if not self.index.get_candidates(req.name):
+                return False, "", (f"ERROR: Could not find a version that satisfies the requirement {req} (from versions: none)\n"
+                                   f"ERROR: No matching distribution found for {req.name}")
+
+        provider = _Provider(self.index, self.python_version, self.marker_env, cancel_event, seed_pins)
+        reporter = _PinReporter()
+        resolver = resolvelib.Resolver(provider, reporter)
+        try:
+            result = resolver.resolve(user_reqs, max_rounds=config.INPROCESS_RESOLVER_MAX_ROUNDS)
+        except _Cancelled:
+            return False, "", "Error: pip-compile cancelled."
+        except resolvelib.ResolutionImpossible as e:
+            log.debug("    In-process resolution FAILED (ResolutionImpossible, %s rounds)", reporter.rounds)
+            self._record(requirements_set, reporter, seed_pins)
+            return False, "", self._format_resolution_impossible(e.causes, user_reqs)
+        except resolvelib.ResolutionTooDeep:
+            log.debug("    In-process resolution FAILED (ResolutionTooDeep)")
+            self._record(requirements_set, reporter, seed_pins)
+            # Round limit hit: inconclusive, so the marker keeps it out of the persistent cache and the subsumption index
+            return False, "", (f"ERROR: {cache_manager.RESOLUTION_TOO_DEEP_MARKER}: exceeded "
+                               f"{config.INPROCESS_RESOLVER_MAX_ROUNDS} rounds (INPROCESS_RESOLVER_MAX_ROUNDS)")
+        self._record(requirements_set, reporter, seed_pins)
+
+        lines = [f"{c.name}=={c.version}" for _, c in sorted(result.mapping.items())]
+        log.debug("    In-process resolution SUCCESS (%s pins, %s rounds)", len(lines), reporter.rounds)
+        return True, "\n".join(lines) + "\n", ""
+
+    def _record(self, requirements_set: FrozenSet[Requirement], reporter: _PinReporter, seed_pins: Optional[Dict[str, str]]):
+        with self._stats_lock:
+            self.total_rounds += reporter.rounds
+            if seed_pins:
+                self.seeded_compiles += 1
+        if config.WARM_START_ENABLED:
+            cache_manager.store_resolved_pins(requirements_set, reporter.pins())
+
+    def _format_resolution_impossible(self, causes: Sequence, user_reqs: List[PkgRequirement]) -> str:
+        # Mirrors pip's ResolutionImpossible report
+        cause_lines = []
+        for cause in causes:
+            if cause.parent is None:
+                cause_lines.append(f"    The user requested {cause.requirement}")
+            else:
+                cause_lines.append(f"    {cause.parent.name} {cause.parent.version} depends on {cause.requirement}")
+        if not cause_lines:
+            requested = ", ".join(str(r) for r in user_reqs)
+            return (f"ERROR: Could not find a version that satisfies the requirement {requested}\n"
+                    f"{RESOLUTION_IMPOSSIBLE_HELP}")
+        requested = " and ".join(str(r) for r in user_reqs)
+        return (
+            f"ERROR: Cannot install {requested} because these package versions have conflicting dependencies.\n\n"
+            "The conflict is caused by:\n" + "\n".join(dict.fromkeys(cause_lines)) + "\n\n"
+            "To fix this you could try to:\n"
+            "1. loosen the range of package versions you've specified\n"
+            "2. remove package versions to allow pip attempt to solve the dependency conflict\n\n"
+            f"{RESOLUTION_IMPOSSIBLE_HELP}\n"
+        )
+
+    def _reqs_to_str_summary(self, reqs: FrozenSet[Requirement], limit: int = 3) -> str:
+        sorted_reqs = sorted(str(r) for r in reqs)
+        if len(sorted_reqs) > limit:
+            return ", ".join(sorted_reqs[:limit]) + f"... (+{len(sorted_reqs) - limit} more)"
+        return ", ".join(sorted_reqs)
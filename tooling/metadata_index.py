@@ -0,0 +1,255 @@
+# dependency_resolver_agent/tooling/metadata_index.py
+"""
+Offline package metadata index: per project, the released versions with their Requires-Dist
+and Requires-Python. Built once from a local simple-repository directory, a JSON dump or a
+directory of METADATA files, then written to a compact binary file that is memory-mapped on load.
+
+File layout (little endian):
+  header   : magic, format version, package count, release count, dependency count, string table size
+  packages : (name_off, name_len, first_release, n_releases) per package, sorted by canonical name
+  releases : (version_off, version_len, requires_python_off, requires_python_len, first_dep, n_deps),
+             grouped per package and sorted by ascending Version
+  deps     : (off, len) per Requires-Dist line
+  strings  : UTF-8 string table the offsets point into
+Opening the file costs one mmap and one header read; packages are located by binary search and
+decoded on first use only.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from email.parser import HeaderParser
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from packaging.utils import canonicalize_name
+from packaging.version import Version, InvalidVersion
+
+from dependency_resolver_agent.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+MAGIC = b"DRMI"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIIIIQ")
+_PACKAGE = struct.Struct("<IIII")
+_RELEASE = struct.Struct("<IIIIII")
+_DEP = struct.Struct("<II")
+
+
+class PackageRelease(NamedTuple):
+    version: str
+    requires_dist: Tuple[str, ...]
+    requires_python: str
+
+
+def _version_sort_key(version: str):
+    try:
+        return (1, Version(version))
+    except InvalidVersion:
+        return (0, version) # Unparseable versions sort first (oldest)
+
+
+class MetadataIndexBuilder:
+    def __init__(self):
+        self._packages: Dict[str, Dict[str, PackageRelease]] = {}
+
+    def add_release(self, name: str, version: str, requires_dist: Iterable[str] = (), requires_python: str = ""):
+        releases = self._packages.setdefault(canonicalize_name(name), {})
+        releases[version] = PackageRelease(version, tuple(requires_dist), requires_python or "")
+
+    def add_versions(self, versions_db: Dict[str, List[str]]):
+        """Versions only (no dependency data), e.g. from the old SIMULATED_PYPI_VERSIONS dict."""
+        for name, versions in versions_db.items():
+            for version in versions:
+                self.add_release(name, version)
+
+    def add_metadata_text(self, raw_metadata: str):
+        headers = HeaderParser().parsestr(raw_metadata)
+        if not headers.get("Name") or not headers.get("Version"):
+            return
+        self.add_release(headers["Name"], headers["Version"],
+                         headers.get_all("Requires-Dist") or (), headers.get("Requires-Python") or "")
+
+    def add_json_dump(self, path: str):
+        """
+        JSON dump: {"name": {"version": {"requires_dist": [...], "requires_python": "..."}, ...}, ...}
+        A plain list of versions per package is accepted too.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for name, releases in data.items():
+            if isinstance(releases, list):
+                for version in releases:
+                    self.add_release(name, version)
+                continue
+            for version, info in releases.items():
+                info = info or {}
+                self.add_release(name, version, info.get("requires_dist") or (), info.get("requires_python") or "")
+
+    def add_metadata_directory(self, path: str):
+        """Directory tree of METADATA / *.metadata files (e.g. extracted from wheels)."""
+        for dirpath, _dirnames, filenames in os.walk(path):
+            for filename in filenames:
+                if filename == "METADATA" or filename.endswith(".metadata"):
+                    with open(os.path.join(dirpath, filename), encoding="utf-8") as f:
+                        self.add_metadata_text(f.read())
+
+    def add_simple_repository(self, path: str):
+        """Wheels and PEP 658 sidecars in a local simple-repository (or find-links) directory."""
+        # Imported here: the resolver module pulls in resolvelib, which index readers do not need
+        from dependency_resolver_agent.tooling.inprocess_resolver_service import LocalPackageIndex
+        local_index = LocalPackageIndex(path)
+        for name in local_index.project_names():
+            for candidate in local_index.get_candidates(name):
+                self.add_release(name, str(candidate.version),
+                                 (str(r) for r in candidate.requires_dist), str(candidate.requires_python))
+
+    def write(self, path: str):
+        strings = bytearray()
+        string_offsets: Dict[str, Tuple[int, int]] = {}
+
+        def intern(text: str) -> Tuple[int, int]:
+            slot = string_offsets.get(text)
+            if slot is None:
+                raw = text.encode("utf-8")
+                slot = (len(strings), len(raw))
+                strings.extend(raw)
+                string_offsets[text] = slot
+            return slot
+
+        package_rows = bytearray()
+        release_rows = bytearray()
+        dep_rows = bytearray()
+        n_releases = n_deps = 0
+        for name in sorted(self._packages):
+            releases = sorted(self._packages[name].values(), key=lambda r: _version_sort_key(r.version))
+            package_rows += _PACKAGE.pack(*intern(name), n_releases, len(releases))
+            for release in releases:
+                release_rows += _RELEASE.pack(*intern(release.version), *intern(release.requires_python),
+                                              n_deps, len(release.requires_dist))
+                for dep in release.requires_dist:
+                    dep_rows += _DEP.pack(*intern(dep))
+                n_deps += len(release.requires_dist)
+            n_releases += len(releases)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(self._packages), n_releases, n_deps, len(strings)))
+            f.write(package_rows)
+            f.write(release_rows)
+            f.write(dep_rows)
+            f.write(strings)
+        os.replace(tmp_path, path) # Readers never see a half-written index
+        log.debug("[MetadataIndex] Wrote %s packages / %s releases to %s", len(self._packages), n_releases, path)
+
+
+class MetadataIndex:
+    """Read-only, memory-mapped view of a file written by MetadataIndexBuilder."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._n_packages, n_releases, n_deps, _strings_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a metadata index (format {FORMAT_VERSION})")
+        self._packages_at = _HEADER.size
+        self._releases_at = self._packages_at + self._n_packages * _PACKAGE.size
+        self._deps_at = self._releases_at + n_releases * _RELEASE.size
+        self._strings_at = self._deps_at + n_deps * _DEP.size
+        self._releases_memo: Dict[str, List[PackageRelease]] = {}
+
+    @classmethod
+    def open(cls, path: str) -> 'MetadataIndex':
+        return cls(path)
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_at + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _package_row(self, i: int) -> Tuple[int, int, int, int]:
+        return _PACKAGE.unpack_from(self._mm, self._packages_at + i * _PACKAGE.size)
+
+    def _find_package(self, canonical: str) -> Optional[Tuple[int, int]]:
+        target = canonical.encode("utf-8")
+        lo, hi = 0, self._n_packages
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name_off, name_len, first_release, n_releases = self._package_row(mid)
+            start = self._strings_at + name_off
+            name = self._mm[start:start + name_len]
+            if name == target:
+                return first_release, n_releases
+            # Names were sorted as str; for canonical (ASCII) names byte order is the same
+            if name < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def get_releases(self, name: str) -> List[PackageRelease]:
+        """All releases of a package, oldest first."""
+        canonical = canonicalize_name(name)
+        releases = self._releases_memo.get(canonical)
+        if releases is not None:
+            return releases
+        releases = []
+        found = self._find_package(canonical)
+        if found is not None:
+            first_release, n_releases = found
+            for r in range(first_release, first_release + n_releases):
+                v_off, v_len, rp_off, rp_len, first_dep, n_deps = _RELEASE.unpack_from(self._mm, self._releases_at + r * _RELEASE.size)
+                deps = tuple(
+                    self._string(*_DEP.unpack_from(self._mm, self._deps_at + d * _DEP.size))
+                    for d in range(first_dep, first_dep + n_deps)
+                )
+                releases.append(PackageRelease(self._string(v_off, v_len), deps, self._string(rp_off, rp_len)))
+        self._releases_memo[canonical] = releases
+        return releases
+
+    def get_versions(self, name: str) -> List[str]:
+        """Version strings of a package, oldest first."""
+        return [r.version for r in self.get_releases(name)]
+
+    def get_release(self, name: str, version: str) -> Optional[PackageRelease]:
+        for release in self.get_releases(name):
+            if release.version == version:
+                return release
+        return None
+
+    def package_names(self) -> List[str]:
+        return [self._string(*self._package_row(i)[:2]) for i in range(self._n_packages)]
+
+    def __contains__(self, name: str) -> bool:
+        return self._find_package(canonicalize_name(name)) is not None
+
+    def __len__(self) -> int:
+        return self._n_packages
+
+    def close(self):
+        self._mm.close()
+
+
+def build_metadata_index(output_path: str, simple_repository: Optional[str] = None, json_dump: Optional[str] = None,
+                         metadata_directory: Optional[str] = None) -> MetadataIndex:
+    builder = MetadataIndexBuilder()
+    if simple_repository:
+        builder.add_simple_repository(simple_repository)
+    if json_dump:
+        builder.add_json_dump(json_dump)
+    if metadata_directory:
+        builder.add_metadata_directory(metadata_directory)
+    builder.write(output_path)
+    return MetadataIndex(output_path)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Build an offline package metadata index.")
+    arg_parser.add_argument("output", help="Index file to write")
+    arg_parser.add_argument("--simple-repository", help="Directory of wheels / PEP 658 .metadata files")
+    arg_parser.add_argument("--json-dump", help="JSON dump of {name: {version: {requires_dist, requires_python}}}")
+    arg_parser.add_argument("--metadata-directory", help="Directory tree of METADATA files")
+    args = arg_parser.parse_args()
+    index = build_metadata_index(args.output, args.simple_repository, args.json_dump, args.metadata_directory)
+    print(f"Indexed {len(index)} packages into {args.output}")
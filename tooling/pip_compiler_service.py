@@ -1,14 +1,31 @@
 # dependency_resolver_agent/tooling/pip_compiler_service.py
+import atexit
 import subprocess
 import tempfile
 import os
+import queue
+import re
 import shutil
-from typing import FrozenSet, Tuple
+import threading
+import time
+from typing import Dict, FrozenSet, IO, List, Optional, Tuple
 
 from dependency_resolver_agent.data_models.requirement import Requirement
-from dependency_resolver_agent.utils.logger import log_verbose
+from dependency_resolver_agent.tooling.compile_output_monitor import CompileOutputMonitor
+from dependency_resolver_agent.utils.logger import get_logger, lazy
+from dependency_resolver_agent.utils import cache_manager
 from dependency_resolver_agent.utils import config_manager as config
 
+log = get_logger(__name__)
+
+# "name==version" lines of a compiled requirements.txt ("# via" comments and hashes are skipped)
+_PIN_LINE = re.compile(r"^([A-Za-z0-9][\w.-]*)(?:\[[^\]]*\])?==([^\s;\\#]+)", re.MULTILINE)
+
+
+def _canonical_name(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
 class PipCompilerService:
     def __init__(self, python_executable: str = config.DEFAULT_PYTHON_EXECUTABLE):
         self.python_executable = python_executable
@@ -18,21 +35,47 @@ class PipCompilerService:
             print(msg)
             # In a real app, you might raise a specific setup error
             # For now, we let it fail later if called.
+        # Runs stopped before pip-compile exited, by reason (see CompileOutputMonitor)
+        self.early_stops = {"conflict_report": 0, "no_matching_distribution": 0, "backtracking_budget": 0}
+        self.seeded_compiles = 0
+        self._stats_lock = threading.Lock()
+        # One scratch directory per worker thread, reused by every compile that thread runs
+        self._worker = threading.local()
+        self._workspaces: List[str] = []
+        atexit.register(self.close)
+        if config.PIP_COMPILE_CACHE_DIR:
+            os.makedirs(config.PIP_COMPILE_CACHE_DIR, exist_ok=True)
 
-    def run_compile(self, requirements_set: FrozenSet[Requirement]) -> Tuple[bool, str, str]:
+    def run_compile(self, requirements_set: FrozenSet[Requirement], cancel_event: Optional[threading.Event] = None,
+                    seed_pins: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str]:
         """
         Runs pip-compile.
+        seed_pins ({canonical name: version}, e.g. the parent state's resolution) are written to the output file
+        before the run. pip-compile prefers existing pins that still satisfy requirements.in and ignores the
+        others, so they speed up resolution without constraining it (unlike -c constraints).
+        On success the pins are recorded with cache_manager.store_resolved_pins when WARM_START_ENABLED.
+        Runs in the calling thread's workspace, with the persistent PIP_COMPILE_CACHE_DIR and the
+        PIP_WHEELHOUSE_DIR / PIP_COMPILE_INDEX_URL / PIP_COMPILE_OFFLINE index settings.
+        Output is read while pip-compile runs. The process is killed, and the run reported as a failure, once
+        a complete conflict report has been printed or backtracking exceeds PIP_COMPILE_MAX_BACKTRACK_ROUNDS.
+        If cancel_event is set while pip-compile is running, the process is killed and a failure is returned.
         Returns: (success_status: bool, stdout: str, stderr: str)
         """
-        log_verbose(f"  [PipCompilerService] Compiling: {self._reqs_to_str_summary(requirements_set)}")
-        temp_dir = ""
+        log.debug("  [PipCompilerService] Compiling: %s", lazy(self._reqs_to_str_summary, requirements_set))
         try:
-            temp_dir = tempfile.mkdtemp(prefix="pip_resolve_")
+            workspace = self._worker_workspace()
             requirements_in_content = "\n".join(sorted(str(r) for r in requirements_set))
-            in_file_path = os.path.join(temp_dir, "requirements.in")
-            out_file_path = os.path.join(temp_dir, "requirements.txt")
+            in_file_path = os.path.join(workspace, "requirements.in")
+            out_file_path = os.path.join(workspace, "requirements.txt")
 
             with open(in_file_path, "w") as f: f.write(requirements_in_content)
+            if os.path.exists(out_file_path):
+                os.remove(out_file_path) # The previous compile's pins would act as seed pins
+            if seed_pins:
+                with open(out_file_path, "w") as f:
+                    f.write("".join(f"{name}=={version}\n" for name, version in sorted(seed_pins.items())))
+                with self._stats_lock:
+                    self.seeded_compiles += 1
 
             cmd = [
                 self.pip_compile_exe,
@@ -40,31 +83,46 @@ class PipCompilerService:
                 "--verbose",               # For better error messages
                 "--output-file", out_file_path,
                 # "--allow-unsafe", # Consider if needed; can mask real issues
-                in_file_path
             ]
-            log_verbose(f"    Executing: {' '.join(cmd)}")
-            process = subprocess.run(
+            cmd.extend(self._index_args())
+            cmd.append(in_file_path)
+            log.debug("    Executing: %s", lazy(' '.join, cmd))
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
-                shell=False, # Important for security and correctness
-                check=False, # We handle return code manually
-                timeout=config.PIP_COMPILE_TIMEOUT_SECONDS
+                bufsize=1, # Line buffered, for streaming
+                cwd=workspace,
+                env=self._compile_env(),
+                shell=False # Important for security and correctness
             )
+            monitor = CompileOutputMonitor()
+            stdout_str, stderr_str = self._wait_for_process(process, cancel_event, monitor)
+            if stdout_str is None:
+                log.debug("    pip-compile cancelled.")
+                return False, "", "Error: pip-compile cancelled."
+            if monitor.stop_reason is not None:
+                log.debug("    pip-compile stopped early (%s, %s backtracking rounds)", monitor.stop_reason, monitor.backtrack_rounds)
+                with self._stats_lock:
+                    self.early_stops[monitor.stop_reason] += 1
+                return False, stdout_str, stderr_str
 
             success = process.returncode == 0
             # Even on success, pip-compile might print concerning things to stderr (e.g. deprecation warnings)
             # But for conflict resolution, RC is the primary indicator.
             # Some "INFO" level things from pip-tools go to stderr.
-            if success and ("ERROR:" in process.stderr or "ResolutionImpossible" in process.stderr):
-                log_verbose(f"    pip-compile RC=0 but error pattern found in stderr. Considering it a failure.")
+            if success and ("ERROR:" in stderr_str or "ResolutionImpossible" in stderr_str):
+                log.debug("    pip-compile RC=0 but error pattern found in stderr. Considering it a failure.")
                 success = False # Treat as failure for our purposes
 
-            log_verbose(f"    pip-compile {'SUCCESS' if success else 'FAILED'} (RC={process.returncode})")
-            return success, process.stdout, process.stderr
+            log.debug("    pip-compile %s (RC=%s)", 'SUCCESS' if success else 'FAILED', process.returncode)
+            if success and config.WARM_START_ENABLED:
+                cache_manager.store_resolved_pins(requirements_set, self._read_pins(out_file_path))
+            return success, stdout_str, stderr_str
 
         except subprocess.TimeoutExpired:
-            log_verbose(f"    pip-compile timed out after {config.PIP_COMPILE_TIMEOUT_SECONDS}s")
+            log.debug("    pip-compile timed out after %ss", config.PIP_COMPILE_TIMEOUT_SECONDS)
             return False, "", "Error: pip-compile timed out."
         except FileNotFoundError: # Should be caught by __init__ but as a safeguard
             msg = f"CRITICAL: pip-compile command '{self.pip_compile_exe}' not found during execution."
@@ -72,11 +130,112 @@ class PipCompilerService:
             return False, "", msg # Or raise
         except Exception as e:
             err_msg = f"Unexpected pip-compile error: {type(e).__name__}: {e}"
-            log_verbose(f"    {err_msg}")
+            log.debug("    %s", err_msg)
             return False, "", err_msg
+
+    def _worker_workspace(self) -> str:
+        workspace = getattr(self._worker, "path", None)
+        if workspace is None or not os.path.isdir(workspace):
+            workspace = tempfile.mkdtemp(prefix="pip_resolve_worker_")
+            self._worker.path = workspace
+            with self._stats_lock:
+                self._workspaces.append(workspace)
+        return workspace
+
+    def close(self):
+        """Removes the worker workspaces (also done at interpreter exit); later compiles create new ones."""
+        with self._stats_lock:
+            workspaces, self._workspaces = self._workspaces, []
+        for workspace in workspaces:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    @staticmethod
+    def _index_args() -> List[str]:
+        args = []
+        if config.PIP_COMPILE_CACHE_DIR:
+            args.extend(["--cache-dir", os.path.join(config.PIP_COMPILE_CACHE_DIR, "pip-tools")])
+        if config.PIP_COMPILE_INDEX_URL and not config.PIP_COMPILE_OFFLINE:
+            args.extend(["--index-url", config.PIP_COMPILE_INDEX_URL])
+        if config.PIP_WHEELHOUSE_DIR:
+            args.extend(["--find-links", config.PIP_WHEELHOUSE_DIR])
+        return args
+
+    @staticmethod
+    def _compile_env() -> Dict[str, str]:
+        # pip, running inside pip-compile, reads its own options from PIP_* variables
+        env = dict(os.environ)
+        if config.PIP_COMPILE_CACHE_DIR:
+            env["PIP_CACHE_DIR"] = os.path.join(config.PIP_COMPILE_CACHE_DIR, "http")
+        if config.PIP_COMPILE_OFFLINE:
+            env["PIP_NO_INDEX"] = "1"
+            env.pop("PIP_INDEX_URL", None)
+            env.pop("PIP_EXTRA_INDEX_URL", None)
+        return env
+
+    def _wait_for_process(self, process: subprocess.Popen, cancel_event: Optional[threading.Event],
+                          monitor: CompileOutputMonitor) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Streams pip-compile's output into `monitor` until the process exits, the monitor asks to stop it,
+        the timeout expires or cancel_event is set. Returns (None, None) if it was killed because of cancellation.
+        """
+        lines: "queue.Queue[Tuple[int, Optional[str]]]" = queue.Queue()
+        readers = [
+            threading.Thread(target=self._pump, args=(stream, index, lines), name="pip-compile-output", daemon=True)
+            for index, stream in enumerate((process.stdout, process.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+        captured: Tuple[List[str], List[str]] = ([], [])
+        open_streams = len(readers)
+        deadline = time.monotonic() + config.PIP_COMPILE_TIMEOUT_SECONDS
+        try:
+            while open_streams:
+                if cancel_event is not None and cancel_event.is_set():
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(process.args, config.PIP_COMPILE_TIMEOUT_SECONDS)
+                try:
+                    index, line = lines.get(timeout=min(remaining, config.PIP_COMPILE_CANCEL_POLL_SECONDS))
+                except queue.Empty:
+                    continue
+                if line is None:
+                    open_streams -= 1
+                    continue
+                captured[index].append(line)
+                if monitor.feed(line) is not None:
+                    stop_message = monitor.stop_message()
+                    if stop_message:
+                        captured[1].append(stop_message + "\n")
+                    break
+            else:
+                process.wait()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            for reader in readers:
+                reader.join(timeout=1)
+            process.stdout.close()
+            process.stderr.close()
+        return "".join(captured[0]), "".join(captured[1])
+
+    @staticmethod
+    def _read_pins(out_file_path: str) -> Dict[str, str]:
+        try:
+            with open(out_file_path, encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            return {}
+        return {_canonical_name(name): version for name, version in _PIN_LINE.findall(content)}
+
+    @staticmethod
+    def _pump(stream: IO[str], index: int, lines: "queue.Queue[Tuple[int, Optional[str]]]"):
+        try:
+            for line in stream:
+                lines.put((index, line))
         finally:
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            lines.put((index, None))
 
     def _reqs_to_str_summary(self, reqs: FrozenSet[Requirement], limit: int = 3) -> str:
         sorted_reqs = sorted(str(r) for r in reqs)
@@ -1,8 +1,15 @@
 # dependency_resolver_agent/tooling/pypi_service.py
-from typing import List, Dict, Optional, Set as TypingSet
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Hashable, List, Dict, Optional, Tuple, Set as TypingSet
 
 from dependency_resolver_agent.data_models.requirement import Requirement, Version, SpecifierSet, PACKAGING_AVAILABLE, InvalidVersion, InvalidSpecifier
-from dependency_resolver_agent.utils.logger import log_verbose
+from dependency_resolver_agent.utils.logger import get_logger
+from dependency_resolver_agent.tooling.metadata_index import MetadataIndex, PackageRelease
+from dependency_resolver_agent.utils import config_manager as config
+
+log = get_logger(__name__)
 
 # This would ideally come from config_manager or be more dynamic
 SIMULATED_PYPI_VERSIONS: Dict[str, List[str]] = {
@@ -20,22 +27,235 @@ SIMULATED_PYPI_VERSIONS: Dict[str, List[str]] = {
     "subdep":         ["0.5.0", "0.6.0", "1.0.0", "1.0.1", "1.2.0"], # For testing pinning
 }
 
+_MISSING = object()
+
+
+class _LRUMemo:
+    """Memo that forgets its least recently used entries past max_entries; safe to share between solver threads."""
+    __slots__ = ("max_entries", "_entries", "_lock")
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionTable:
+    """
+    All known versions of one package, parsed and sorted once (newest first).
+    Specifier filtering narrows the candidate range by bisecting on each clause's bounds and only
+    runs the exact SpecifierSet check on that slice; results are memoised (LRU) per specifier string.
+    """
+    __slots__ = ("raw_desc", "versions_desc", "strs_desc", "_asc", "_index_of", "_filter_memo")
+
+    def __init__(self, raw_versions: List[str], memo_max_entries: int = config.PYPI_MEMO_MAX_ENTRIES):
+        parsed = sorted(((Version(v), v) for v in raw_versions), key=lambda pair: pair[0], reverse=True)
+        self.raw_desc: List[str] = [raw for _, raw in parsed]
+        self.versions_desc: List[Version] = [v for v, _ in parsed]
+        self.strs_desc: List[str] = [str(v) for v in self.versions_desc]
+        self._asc: List[Version] = self.versions_desc[::-1] # bisect needs ascending order
+        self._index_of: Dict[Version, int] = {}
+        for i, v in enumerate(self.versions_desc):
+            self._index_of.setdefault(v, i)
+        self._filter_memo = _LRUMemo(memo_max_entries) # specifier -> positions
+
+    def index_of(self, version: Version) -> int:
+        """Position in versions_desc, or -1."""
+        return self._index_of.get(version, -1)
+
+    def filter(self, specifier: str) -> Tuple[int, ...]:
+        """Positions (into versions_desc, newest first) of versions that satisfy `specifier`."""
+        memo = self._filter_memo.get(specifier)
+        if memo is not None:
+            return memo
+        spec_set = SpecifierSet(specifier)
+        lo, hi = 0, len(self._asc)
+        for clause in spec_set:
+            clause_lo, clause_hi = self._clause_bounds(clause.operator, clause.version)
+            lo, hi = max(lo, clause_lo), min(hi, clause_hi)
+            if lo >= hi:
+                break
+        n = len(self._asc)
+        # Exact check on the narrowed slice keeps packaging's pre-release/local/post rules intact
+        result = tuple(n - 1 - i for i in range(hi - 1, lo - 1, -1) if self._asc[i] in spec_set) if lo < hi else ()
+        self._filter_memo.put(specifier, result)
+        return result
+
+    def _clause_bounds(self, operator: str, version_str: str) -> Tuple[int, int]:
+        asc = self._asc
+        n = len(asc)
+        try:
+            if operator == "~=" or (operator == "==" and version_str.endswith(".*")):
+                prefix = version_str[:-2] if version_str.endswith(".*") else version_str
+                v = Version(prefix)
+                release = v.release if operator == "==" else v.release[:-1]
+                if not release:
+                    return 0, n
+                upper_release = release[:-1] + (release[-1] + 1,)
+                epoch = f"{v.epoch}!" if v.epoch else ""
+                upper = Version(epoch + ".".join(map(str, upper_release)) + ".dev0")
+                lower = Version(epoch + ".".join(map(str, release)) + ".dev0") if operator == "==" else v
+                return bisect_left(asc, lower), bisect_left(asc, upper)
+            if operator in ("!=", "==="):
+                return 0, n
+            v = Version(version_str)
+            if operator == ">=":
+                return bisect_left(asc, v), n
+            if operator == ">":
+                return bisect_right(asc, v), n
+            if operator == "<=":
+                # Local versions of v (v+local) sort right after v and still satisfy <=v
+                return 0, self._skip_local_variants(bisect_right(asc, v), v)
+            if operator == "<":
+                return 0, bisect_left(asc, v)
+            if operator == "==":
+                hi = bisect_right(asc, v)
+                if not v.local:
+                    hi = self._skip_local_variants(hi, v) # ==1.0 also matches 1.0+local
+                return bisect_left(asc, v), hi
+        except (InvalidVersion, TypeError):
+            pass
+        return 0, n
+
+    def _skip_local_variants(self, hi: int, v: Version) -> int:
+        # Local versions (v+local) sort right after v
+        asc = self._asc
+        while hi < len(asc) and asc[hi].local and Version(asc[hi].public) == v:
+            hi += 1
+        return hi
+
+
 class PyPIService:
-    def __init__(self, simulated_versions: Optional[Dict[str, List[str]]] = None):
-        self.versions_db = simulated_versions if simulated_versions is not None else SIMULATED_PYPI_VERSIONS
+    def __init__(self, simulated_versions: Optional[Dict[str, List[str]]] = None, metadata_index: Optional[MetadataIndex] = None):
+        self.metadata_index = metadata_index
+        if simulated_versions is not None:
+            self.versions_db = simulated_versions
+        elif metadata_index is not None:
+            self.versions_db = {} # Ad-hoc overrides on top of the index
+        else:
+            self.versions_db = SIMULATED_PYPI_VERSIONS
+        # package -> (versions_db list it was built from, its length, table)
+        self._version_tables: Dict[str, Tuple[Optional[List[str]], int, Optional[VersionTable]]] = {}
+        # package -> LRU of get_versions_to_try() results by (specifier, arguments); dropped with a stale table
+        self._versions_to_try_memo: Dict[str, _LRUMemo] = {}
+        # (package, version) -> Requires-Dist constraints (None: release unknown)
+        self._dependency_constraints = _LRUMemo(config.PYPI_DEPENDENCY_CACHE_MAX_ENTRIES)
+
+    def _get_raw_versions(self, package_name: str) -> List[str]:
+        raw_versions = self.versions_db.get(package_name)
+        if raw_versions is None and self.metadata_index is not None:
+            raw_versions = self.metadata_index.get_versions(package_name)
+        return raw_versions or []
+
+    def get_release(self, package_name: str, version: str) -> Optional[PackageRelease]:
+        """Requires-Dist / Requires-Python of one release, if a metadata index is loaded."""
+        if self.metadata_index is None:
+            return None
+        return self.metadata_index.get_release(package_name, version)
+
+    def get_dependency_constraints(self, package_name: str, version: str) -> Optional[Dict[str, str]]:
+        """
+        Unconditional Requires-Dist of one release as {dependency name: specifier}; None if the release is unknown.
+        Marker-guarded dependencies are left out: they may not apply to the target environment.
+        """
+        key = (package_name, version)
+        constraints = self._dependency_constraints.get(key, _MISSING)
+        if constraints is not _MISSING:
+            return constraints
+        release = self.get_release(package_name, version)
+        constraints = None
+        if release is not None and PACKAGING_AVAILABLE:
+            from packaging.requirements import Requirement as PkgRequirement, InvalidRequirement
+            constraints = {}
+            for line in release.requires_dist:
+                try:
+                    dep = PkgRequirement(line)
+                except InvalidRequirement:
+                    log.debug("[PyPIService] Ignoring invalid Requires-Dist '%s' of %s %s", line, package_name, version)
+                    continue
+                if dep.marker is not None or not str(dep.specifier):
+                    continue
+                dep_name = dep.name.lower()
+                constraints[dep_name] = f"{constraints[dep_name]},{dep.specifier}" if dep_name in constraints else str(dep.specifier)
+        self._dependency_constraints.put(key, constraints)
+        return constraints
+
+    def _get_version_table(self, package_name: str) -> Optional[VersionTable]:
+        """Parsed/sorted versions of a package; None if there are none or one does not parse."""
+        raw_versions = self.versions_db.get(package_name)
+        cached = self._version_tables.get(package_name)
+        # versions_db is a plain mutable dict: the table is stale if its list was replaced or grown
+        if cached is not None and cached[0] is raw_versions and cached[1] == len(raw_versions or ()):
+            return cached[2]
+
+        versions_source = raw_versions
+        if raw_versions is None and self.metadata_index is not None:
+            raw_versions = self.metadata_index.get_versions(package_name) # Index is immutable
+        table = None
+        if raw_versions and PACKAGING_AVAILABLE:
+            try:
+                table = VersionTable(raw_versions)
+            except InvalidVersion:
+                log.warning("[PyPIService] Warning: Invalid version in DB for %s", package_name)
+        self._version_tables[package_name] = (versions_source, len(versions_source or ()), table)
+        if cached is not None:
+            self._versions_to_try_memo.pop(package_name, None) # Built from the stale table
+        return table
+
+    def has_version_matching(self, package_name: str, specifier: str) -> Optional[bool]:
+        """Whether any known version satisfies `specifier`; None if that cannot be decided."""
+        table = self._get_version_table(package_name)
+        if table is None:
+            return None
+        try:
+            return bool(table.filter(specifier))
+        except InvalidSpecifier:
+            return None
+
+    def version_distance(self, package_name: str, version: str, specifier: str) -> Optional[int]:
+        """
+        Number of releases between `version` and the nearest release satisfying `specifier`
+        (0 if `version` itself satisfies it); None if unknown or nothing satisfies it.
+        """
+        table = self._get_version_table(package_name)
+        if table is None:
+            return None
+        try:
+            current_idx = table.index_of(Version(version))
+            matching = table.filter(specifier)
+        except (InvalidVersion, InvalidSpecifier):
+            return None
+        if current_idx == -1 or not matching:
+            return None
+        nearest = bisect_left(matching, current_idx) # matching positions are ascending
+        candidates = matching[max(nearest - 1, 0):nearest + 1]
+        return min(abs(i - current_idx) for i in candidates)
 
     def get_available_versions(self, package_name: str) -> List[str]:
         """Returns available versions, newest first, if packaging lib is available."""
-        raw_versions = self.versions_db.get(package_name, [])
-        if not raw_versions:
-            return []
-        if PACKAGING_AVAILABLE:
-            try:
-                return sorted(raw_versions, key=Version, reverse=True)
-            except InvalidVersion: # Should not happen if SIMULATED_PYPI_VERSIONS is clean
-                log_verbose(f"[PyPIService] Warning: Invalid version in DB for {package_name}")
-                return sorted(raw_versions, reverse=True) # Fallback string sort
-        return sorted(raw_versions, reverse=True)
+        table = self._get_version_table(package_name)
+        if table is not None:
+            return list(table.raw_desc)
+        raw_versions = self._get_raw_versions(package_name)
+        return sorted(raw_versions, reverse=True) # Fallback string sort
 
 
     def get_versions_to_try(
@@ -48,87 +268,66 @@ class PyPIService:
         sub_dep_specifier_hint: Optional[str] = None # For pinning transitive
         ) -> List[str]:
 
-        all_versions_str = self.get_available_versions(package_name) # Already sorted newest first
-        if not all_versions_str: return []
-
-        if not PACKAGING_AVAILABLE: # Simplified fallback
+        table = self._get_version_table(package_name)
+        if table is None: # No versions, no 'packaging', or an unparseable version in the DB
+            all_versions_str = self.get_available_versions(package_name)
             return all_versions_str[:num_latest + num_around * 2]
 
-        try:
-            all_versions_obj = [Version(v) for v in all_versions_str] # Already sorted
-        except InvalidVersion:
-            log_verbose(f"Warning: Invalid version format for {package_name} during get_versions_to_try. Using unsorted subset.")
-            return all_versions_str[:num_latest + num_around * 2]
+        current_specifier = current_requirement.specifier if current_requirement else ""
+        package_memo = self._versions_to_try_memo.get(package_name)
+        if package_memo is None:
+            package_memo = self._versions_to_try_memo.setdefault(package_name, _LRUMemo(config.PYPI_MEMO_MAX_ENTRIES))
+        memo_key = (current_specifier, num_around, num_latest, num_within_spec, sub_dep_specifier_hint)
+        memo = package_memo.get(memo_key)
+        if memo is not None:
+            return list(memo)
 
-        versions_to_try_set: TypingSet[Version] = set()
+        # Positions into table.versions_desc (0 = newest)
+        positions_to_try: TypingSet[int] = set()
 
         # 0. If a sub_dep_specifier_hint is provided (for pinning transitive)
-        hint_spec_set: Optional[SpecifierSet] = None
         if sub_dep_specifier_hint:
             try:
-                hint_spec_set = SpecifierSet(sub_dep_specifier_hint)
-                # Try to get versions satisfying this hint
-                versions_satisfying_hint = sorted(
-                    [v for v in all_versions_obj if v in hint_spec_set],
-                    reverse=True
-                )
-                for i in range(min(len(versions_satisfying_hint), num_latest)): # take a few latest satisfying hint
-                    versions_to_try_set.add(versions_satisfying_hint[i])
-                # If no versions found satisfying hint, this path might not add any initially
+                # take a few latest satisfying hint; if none satisfy it, this path adds nothing
+                positions_to_try.update(table.filter(sub_dep_specifier_hint)[:num_latest])
             except InvalidSpecifier:
-                log_verbose(f"[PyPIService] Invalid specifier hint '{sub_dep_specifier_hint}' for {package_name}")
-
+                log.debug("[PyPIService] Invalid specifier hint '%s' for %s", sub_dep_specifier_hint, package_name)
 
         # 1. Add a few latest overall versions (especially if no hint or hint yielded few)
-        for i in range(min(len(all_versions_obj), num_latest)):
-            versions_to_try_set.add(all_versions_obj[i])
+        positions_to_try.update(range(min(len(table.versions_desc), num_latest)))
 
         current_version_obj: Optional[Version] = None
-        current_specifier_set: Optional[SpecifierSet] = None
-
-        if current_requirement and current_requirement.specifier:
+        within_spec: Tuple[int, ...] = ()
+        if current_specifier:
             try:
-                current_specifier_set = SpecifierSet(current_requirement.specifier)
+                # 2. If current requirement has a specifier, try the latest versions within that specifier
+                within_spec = table.filter(current_specifier)
                 if current_requirement.is_exact():
                     exact_ver_str = current_requirement.get_exact_version_str()
                     if exact_ver_str:
                         current_version_obj = Version(exact_ver_str)
             except (InvalidSpecifier, InvalidVersion):
                 pass
-
-        # 2. If current requirement has a specifier, try versions within that specifier
-        if current_specifier_set:
-            versions_within_spec = sorted(
-                [v for v in all_versions_obj if v in current_specifier_set],
-                reverse=True
-            )
-            for i in range(min(len(versions_within_spec), num_within_spec)):
-                versions_to_try_set.add(versions_within_spec[i])
-            if versions_within_spec: # Also add the absolute latest that satisfies the spec
-                 versions_to_try_set.add(versions_within_spec[0])
-
+        positions_to_try.update(within_spec[:max(num_within_spec, 1)])
 
         # 3. If current version is known (exact), try versions around it
-        if current_version_obj:
-            try:
-                # Find index of current_version_obj in all_versions_obj (which is sorted newest to oldest)
-                current_idx = -1
-                for idx, v_obj in enumerate(all_versions_obj):
-                    if v_obj == current_version_obj:
-                        current_idx = idx
-                        break
-                
-                if current_idx != -1:
-                    # Older versions (index increases)
-                    for i in range(1, num_around + 1):
-                        if current_idx + i < len(all_versions_obj):
-                            versions_to_try_set.add(all_versions_obj[current_idx + i])
-                    # Newer versions (index decreases)
-                    for i in range(1, num_around + 1):
-                        if current_idx - i >= 0:
-                            versions_to_try_set.add(all_versions_obj[current_idx - i])
-            except ValueError:
-                pass # current_version_obj not in all_versions_obj
-
-        # Convert to string and sort newest first
-        return sorted([str(v) for v in versions_to_try_set], key=Version, reverse=True)
\ No newline at end of file
+        if current_version_obj is not None:
+            current_idx = table.index_of(current_version_obj)
+            if current_idx != -1:
+                for i in range(1, num_around + 1):
+                    if current_idx + i < len(table.versions_desc): # Older versions (index increases)
+                        positions_to_try.add(current_idx + i)
+                    if current_idx - i >= 0: # Newer versions (index decreases)
+                        positions_to_try.add(current_idx - i)
+
+        # Positions are already newest-first, so sorting them replaces re-sorting by Version.
+        # Equal versions spelled differently (e.g. "0.17" and "0.17.0") are adjacent; keep one.
+        result_list: List[str] = []
+        previous: Optional[Version] = None
+        for i in sorted(positions_to_try):
+            if table.versions_desc[i] != previous:
+                result_list.append(table.strs_desc[i])
+                previous = table.versions_desc[i]
+        result = tuple(result_list)
+        package_memo.put(memo_key, result)
+        return list(result)
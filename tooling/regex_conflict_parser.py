@@ -1,100 +1,121 @@
 # dependency_resolver_agent/tooling/regex_conflict_parser.py
 import re
-from typing import Set, Optional, Tuple, FrozenSet
+from typing import Dict, List, Set, Tuple, FrozenSet
 
 from dependency_resolver_agent.data_models.requirement import Requirement
 from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
 
+# Runs of name characters. A name is mentioned wherever a run of its dot/dash-separated segments spells it,
+# which is where a case-insensitive \bname\b search would find it
+_NAME_RUN = re.compile(r"[\w.-]+")
+_SEGMENT_SPLIT = re.compile(r"([.-])")
+
+# Example:
+# ERROR: Cannot install -r requirements.in (line 3) and requests==2.29.0 because these package versions have conflicting dependencies.
+# The conflict is caused by:
+#     requests 2.29.0 depends on urllib3<2.0 and >=1.25.0
+#     root depends on urllib3==2.0.0
+#
+# To fix this you could try to:
+# 1. loosen the range of package versions you've specified
+# 2. remove package versions to allow pip attempt to solve the dependency conflict
+_CONFLICT_BLOCK = re.compile(
+    r"The conflict is caused by:(.*?)(?:\n\nTo fix this|Because no versions of|(?:\n\s*pip freeze output:)|(?:\n\s*ERROR:)|(?:\n\s*During handling of the above exception)|\Z)",
+    re.DOTALL | re.IGNORECASE
+)
+# "    package_a x.y.z depends on conflictingpackage==A"
+_DEPENDS_ON = re.compile(
+    r"\s*([\w.-]+)\s+([\w.?*+!-]+|\(any\))\s+depends on\s+([\w.-]+)\s*([<>=!~]=?[\w.,*+-]+(?:,\s*[<>=!~]=?[\w.,*+-]+)*)?",
+    re.IGNORECASE
+)
+# "    conflictingpackage A is required by package_b x.y.z"
+_REQUIRED_BY = re.compile(
+    r"\s*([\w.-]+)\s+([<>=!~]=?[\w.,*+-]+(?:,\s*[<>=!~]=?[\w.,*+-]+)*)?\s+is required by\s+([\w.-]+)",
+    re.IGNORECASE
+)
+
+
 class RegexConflictParser:
+    """
+    Scans pip-compile output once, however many direct requirements there are: one tokenizer pass finds
+    which direct requirements are mentioned, and one pass over the conflict report collects every
+    dependency edge and every culprit.
+    """
+
     def parse(self, stdout: str, stderr: str, direct_requirements: FrozenSet[Requirement]) -> ConflictInfo:
         full_output = f"STDOUT:\n{stdout}\nSTDERR:\n{stderr}"
-        involved_direct_names = set()
-        sub_dep_culprit: Optional[Tuple[str, str]] = None
-        
         direct_req_name_map = {r.name.lower(): r.name for r in direct_requirements}
 
-        # Look for direct dependencies mentioned in error context
-        # This needs to be fairly general.
-        # Common patterns:
-        # - "package_a depends on sub_package_x" (where package_a is direct)
-        # - Lines starting with "  direct_package_name ..." in resolution lists
-        # - "Cannot install direct_package_name"
-        for req_name_orig_case in direct_req_name_map.values():
-            # Regex to find the package name, possibly followed by specifiers or version numbers
-            # This tries to capture mentions of the direct package in various contexts
-            # Adjusted to be less strict about "==" immediately following
-            pattern = r"(\b" + re.escape(req_name_orig_case) + r"\b)" + \
-                      r"(\s*(?:[<>=!~]=?|is)\s*[\w.,*+-]+(?:,\s*[<>=!~]=?\s*[\w.,*+-]+)*)?" # Optional specifier/version part
-            if re.search(pattern, full_output, re.IGNORECASE):
-                involved_direct_names.add(req_name_orig_case)
+        # Direct requirements mentioned anywhere in the output ("Cannot install x", "x depends on ...", resolution lists)
+        involved_direct_names = self._mentioned_names(full_output, direct_req_name_map)
 
-        # Attempt to find "The conflict is caused by:" block
-        # Example:
-        # ERROR: Cannot install -r requirements.in (line 3) and requests==2.29.0 because these package versions have conflicting dependencies.
-        # The conflict is caused by:
-        #     requests 2.29.0 depends on urllib3<2.0 and >=1.25.0
-        #     root depends on urllib3==2.0.0
-        #
-        # To fix this you could try to:
-        # 1. loosen the range of package versions you've specified
-        # 2. remove package versions to allow pip attempt to solve the dependency conflict
-        conflict_block_match = re.search(
-            r"The conflict is caused by:(.*?)(?:\n\nTo fix this|Because no versions of|(?:\n\s*pip freeze output:)|(?:\n\s*ERROR:)|(?:\n\s*During handling of the above exception)|\Z)",
-            full_output, re.DOTALL | re.IGNORECASE
-        )
+        conflicting_constraints: List[Tuple[str, str, str, str]] = []
+        culprits: List[Tuple[str, str]] = []
+        conflict_block_match = _CONFLICT_BLOCK.search(full_output)
         if conflict_block_match:
-            conflict_text = conflict_block_match.group(1).strip()
-            # Find lines like: "    package_a x.y.z depends on conflictingpackage==A"
-            # Or "    conflictingpackage A is required by package_b x.y.z"
-            dep_lines_depends_on = re.findall(
-                r"^\s*([\w.-]+)\s+(?:[\w.?*-]+|\(any\))\s+depends on\s+([\w.-]+)\s*([<>=!~]=?[\w.,*+-]+(?:,\s*[<>=!~]=?[\w.,*+-]+)*)?",
-                conflict_text, re.MULTILINE | re.IGNORECASE
-            )
-            dep_lines_required_by = re.findall(
-                r"^\s*([\w.-]+)\s+([<>=!~]=?[\w.,*+-]+(?:,\s*[<>=!~]=?[\w.,*+-]+)*)?\s+is required by\s+([\w.-]+)",
-                conflict_text, re.MULTILINE | re.IGNORECASE
-            )
-
-            potential_culprits_specs: dict[str, Set[str]] = {} # {sub_dep_name: {spec1, spec2}}
+            depends_on: List[Tuple[str, str, str, str]] = []
+            required_by: List[Tuple[str, str, str]] = []
+            for line in conflict_block_match.group(1).strip().splitlines():
+                edge = _DEPENDS_ON.match(line)
+                if edge:
+                    depends_on.append(edge.groups(""))
+                    continue
+                edge = _REQUIRED_BY.match(line)
+                if edge:
+                    required_by.append(edge.groups(""))
 
-            for dependant, dep_name, dep_spec in dep_lines_depends_on:
-                dep_spec_cleaned = (dep_spec or "").strip()
-                # Only consider it a sub-dependency if the 'dependant' is not one of our direct_requirements
-                # OR if the 'dep_name' itself is not a direct requirement (it's the one being depended upon)
-                if dep_name.lower() not in direct_req_name_map:
+            potential_culprits_specs: Dict[str, Set[str]] = {} # {sub_dep_name: {spec1, spec2}}, in report order
+            for dependant, dependant_version, dep_name, dep_spec in depends_on:
+                dep_spec_cleaned = dep_spec.strip()
+                if dep_spec_cleaned and dependant_version != "(any)":
+                    conflicting_constraints.append((dependant, dependant_version, dep_name, dep_spec_cleaned))
+                # A sub-dependency is a dependency that is not one of our direct requirements, or a direct
+                # requirement that a transitive package depends on
+                if dep_name.lower() not in direct_req_name_map or dependant.lower() not in direct_req_name_map:
                     potential_culprits_specs.setdefault(dep_name, set()).add(dep_spec_cleaned)
-                # Also, if a direct dependency depends on something that *becomes* a conflict point
-                elif dep_name.lower() in direct_req_name_map and dependant.lower() not in direct_req_name_map : # e.g. transitive depends on a direct
-                     potential_culprits_specs.setdefault(dep_name, set()).add(dep_spec_cleaned)
-
-
-            for dep_name, dep_spec, _requirer in dep_lines_required_by:
-                dep_spec_cleaned = (dep_spec or "").strip()
+            for dep_name, dep_spec, _requirer in required_by:
                 if dep_name.lower() not in direct_req_name_map:
-                    potential_culprits_specs.setdefault(dep_name, set()).add(dep_spec_cleaned)
+                    potential_culprits_specs.setdefault(dep_name, set()).add(dep_spec.strip())
 
             for culprit_name, specs_set in potential_culprits_specs.items():
-                # A good candidate for sub_dependency_culprit is a non-direct package
-                # that has multiple *different* specifiers mentioned for it, or at least one specific one.
-                # Filter out empty strings from specs_set if they occurred
                 valid_specs = {s for s in specs_set if s}
-                if len(valid_specs) > 0 : #  len(valid_specs) > 1 or (len(valid_specs) == 1 and next(iter(valid_specs))):
-                    # Join multiple specifiers with "; "
-                    sub_dep_culprit = (culprit_name, "; ".join(sorted(list(valid_specs))))
-                    # If this sub_dep_culprit is mentioned, try to add the direct_reqs that caused it
-                    # This is harder without full dependency graph parsing.
-                    # For now, if sub_dep_culprit, assume all direct reqs are involved.
-                    if not involved_direct_names : # If we haven't found any yet
-                        involved_direct_names.update(direct_req_name_map.values())
-                    break # Take the first one
+                if valid_specs:
+                    culprits.append((culprit_name, "; ".join(sorted(valid_specs))))
+            # Which direct requirements lead to a culprit needs the dependency graph; until then blame all of them
+            if culprits and not involved_direct_names:
+                involved_direct_names.update(direct_req_name_map.values())
 
         # Fallback: if parsing failed to identify specifics but it's a clear resolution error
-        if not involved_direct_names and ("ResolutionImpossible" in full_output or "Could not find a version that satisfies the requirement" in full_output):
+        if not involved_direct_names and ("ResolutionImpossible" in full_output or "ResolutionTooDeep" in full_output or
+                                          "Could not find a version that satisfies the requirement" in full_output):
             involved_direct_names = set(direct_req_name_map.values()) # Blame all direct ones
 
         return ConflictInfo(
             is_conflict=True, # This parser is only called on conflict
             error_message=full_output,
             involved_direct_packages=involved_direct_names,
-            sub_dependency_culprit=sub_dep_culprit
-        )
\ No newline at end of file
+            sub_dependency_culprit=culprits[0] if culprits else None,
+            sub_dependency_culprits=culprits,
+            conflicting_constraints=conflicting_constraints
+        )
+
+    def _mentioned_names(self, text: str, name_map: Dict[str, str]) -> Set[str]:
+        """Original-case names from name_map (keyed by lower-case name) that occur in text as whole names."""
+        if not name_map:
+            return set()
+        max_parts = max(len(_SEGMENT_SPLIT.split(name)) for name in name_map) # Segments and separators
+        found: Set[str] = set()
+        # Verbose logs repeat the same tokens many times; each distinct run is looked at once
+        for run in set(_NAME_RUN.findall(text.lower())):
+            if run in name_map:
+                found.add(name_map[run])
+            parts = _SEGMENT_SPLIT.split(run)
+            if len(parts) == 1:
+                continue
+            # Every sub-run of whole segments, up to the longest name: "foo" and "bar" in "foo-bar.baz"
+            for start in range(0, len(parts), 2):
+                for end in range(start, min(start + max_parts, len(parts)), 2):
+                    candidate = "".join(parts[start:end + 1])
+                    if candidate in name_map:
+                        found.add(name_map[candidate])
+        return found
@@ -0,0 +1,73 @@
+# dependency_resolver_agent/tooling/wheelhouse.py
+"""
+Pre-warms the local wheelhouse (PIP_WHEELHOUSE_DIR) that pip-compile reads as --find-links, so later
+compiles, including PIP_COMPILE_OFFLINE ones, do not go to the package index.
+Each line of the requirements list is downloaded on its own, with its dependencies: the list may name
+several versions of the same project (the alternatives the search will try), which one pip download
+could not resolve together.
+Run: python -m dependency_resolver_agent.tooling.wheelhouse candidates.txt --wheelhouse ./wheelhouse
+"""
+import argparse
+import os
+import subprocess
+from typing import Dict, List, Optional
+
+from dependency_resolver_agent.utils.logger import get_logger, lazy
+from dependency_resolver_agent.utils import config_manager as config
+
+log = get_logger(__name__)
+
+
+def read_requirement_lines(requirements_path: str) -> List[str]:
+    lines = []
+    with open(requirements_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                lines.append(line)
+    return lines
+
+
+def prewarm_wheelhouse(requirement_lines: List[str], wheelhouse_dir: str = config.PIP_WHEELHOUSE_DIR,
+                       python_executable: str = config.DEFAULT_PYTHON_EXECUTABLE,
+                       index_url: str = config.PIP_COMPILE_INDEX_URL,
+                       cache_dir: str = config.PIP_COMPILE_CACHE_DIR) -> Dict[str, Optional[str]]:
+    """
+    Downloads every requirement line (and its dependencies) into wheelhouse_dir. Files already there are
+    reused. Returns {line: None if downloaded, else pip's last error line}.
+    """
+    if not wheelhouse_dir:
+        raise ValueError("No wheelhouse directory given (set PIP_WHEELHOUSE_DIR or pass wheelhouse_dir).")
+    os.makedirs(wheelhouse_dir, exist_ok=True)
+    env = dict(os.environ)
+    if cache_dir:
+        env["PIP_CACHE_DIR"] = os.path.join(cache_dir, "http") # Same cache pip-compile uses
+    results: Dict[str, Optional[str]] = {}
+    for line in requirement_lines:
+        cmd = [python_executable, "-m", "pip", "download", "--dest", wheelhouse_dir,
+               "--find-links", wheelhouse_dir, "--disable-pip-version-check", "--quiet"]
+        if index_url:
+            cmd.extend(["--index-url", index_url])
+        cmd.append(line)
+        log.debug("  [Wheelhouse] Executing: %s", lazy(' '.join, cmd))
+        completed = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        if completed.returncode == 0:
+            results[line] = None
+        else:
+            error_lines = [l for l in completed.stderr.splitlines() if l.strip()]
+            results[line] = error_lines[-1] if error_lines else f"pip download exited with {completed.returncode}"
+            log.debug("  [Wheelhouse] Could not download %s: %s", line, results[line])
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Download requirements into the local wheelhouse used by pip-compile.")
+    arg_parser.add_argument("requirements", help="Requirements list; one requirement per line, alternatives allowed")
+    arg_parser.add_argument("--wheelhouse", default=config.PIP_WHEELHOUSE_DIR, help="Target directory (default: PIP_WHEELHOUSE_DIR)")
+    arg_parser.add_argument("--index-url", default=config.PIP_COMPILE_INDEX_URL)
+    args = arg_parser.parse_args()
+    outcome = prewarm_wheelhouse(read_requirement_lines(args.requirements), args.wheelhouse, index_url=args.index_url)
+    failed = {line: error for line, error in outcome.items() if error}
+    print(f"Downloaded {len(outcome) - len(failed)} of {len(outcome)} requirements into {args.wheelhouse}")
+    for line, error in failed.items():
+        print(f"  {line}: {error}")
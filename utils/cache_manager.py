@@ -1,34 +1,294 @@
 # dependency_resolver_agent/utils/cache_manager.py
-from typing import Dict, FrozenSet, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
 
-from dependency_resolver_agent.data_models import Requirement, ConflictInfo
-# Forward declaration for type hint, actual import handled by type checker
-if False: # TYPE_CHECKING
-    from dependency_resolver_agent.data_models.requirement import Requirement
-    from dependency_resolver_agent.data_models.conflict_info import ConflictInfo
+from dependency_resolver_agent.data_models import Requirement, ConflictInfo, OutputBlob, CompilerOutput
+from dependency_resolver_agent.data_models.compiler_output import blob_digest
+from dependency_resolver_agent.utils.persistent_cache import PersistentEvalCache, compute_environment_fingerprint, make_cache_key
+from dependency_resolver_agent.utils.conflict_signature import ConflictSignatureCache
+from dependency_resolver_agent.utils import config_manager as config
 
 
-# Cache for pip-compile results: Keyed by FrozenSet[Requirement], Value: ConflictInfo
-PIP_COMPILE_CACHE: Dict[FrozenSet['Requirement'], 'ConflictInfo'] = {}
+# Rough per-entry bookkeeping cost (key frozenset, ConflictInfo, LRU links) on top of the blob bytes
+ENTRY_OVERHEAD_BYTES = 512
 
-# Cache for full pip-compile evaluation (raw output + ConflictInfo)
-# Key: FrozenSet[Requirement], Value: Tuple[bool_success, str_stdout, str_stderr, ConflictInfo]
-# This helps avoid re-parsing if only raw output was needed before, but now ConflictInfo is
-FULL_EVAL_CACHE: Dict[FrozenSet['Requirement'], tuple[bool, str, str, 'ConflictInfo']] = {}
 
+class _CacheEntry:
+    __slots__ = ("success", "output", "conflict_info")
 
-def get_cached_pip_compile_result(requirements_set: FrozenSet['Requirement']) -> Optional['ConflictInfo']:
-    return PIP_COMPILE_CACHE.get(requirements_set)
+    def __init__(self, success: bool, output: CompilerOutput, conflict_info: ConflictInfo):
+        self.success = success
+        self.output = output
+        self.conflict_info = conflict_info
+
+
+class EvalCache:
+    """
+    Single in-memory cache of evaluated requirement sets.
+    Keyed by FrozenSet[Requirement]; each entry holds the success flag, the compiler output as shared
+    compressed blobs, and the ConflictInfo (which refers to the same blobs instead of copying them).
+    Bounded by a byte budget (compressed blob bytes + per-entry overhead) with LRU eviction.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[FrozenSet[Requirement], _CacheEntry]' = OrderedDict()
+        # digest -> [blob, number of entries referring to it]
+        self._blobs: Dict[bytes, list] = {}
+        self._bytes_used = 0
+        self._lock = threading.RLock() # Parallel solve workers store results concurrently
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.blob_dedup_hits = 0
+
+    def intern_output(self, stdout: str, stderr: str) -> CompilerOutput:
+        """Compresses stdout/stderr, reusing already stored blobs with identical content."""
+        return CompilerOutput(self._intern_blob(stdout), self._intern_blob(stderr))
+
+    def _intern_blob(self, text: str) -> OutputBlob:
+        raw = text.encode("utf-8")
+        digest = blob_digest(raw)
+        with self._lock:
+            slot = self._blobs.get(digest)
+            if slot is not None:
+                self.blob_dedup_hits += 1
+                return slot[0]
+        return OutputBlob.from_text(text)
+
+    def get(self, requirements_set: FrozenSet[Requirement]) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(requirements_set)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(requirements_set)
+            self.hits += 1
+            return entry
+
+    def contains(self, requirements_set: FrozenSet[Requirement]) -> bool:
+        # Presence check that does not touch LRU order or hit/miss statistics
+        with self._lock:
+            return requirements_set in self._entries
+
+    def put(self, requirements_set: FrozenSet[Requirement], success: bool, output: CompilerOutput, conflict_info: ConflictInfo):
+        with self._lock:
+            if requirements_set in self._entries:
+                self._remove(requirements_set)
+            self._entries[requirements_set] = _CacheEntry(success, output, conflict_info)
+            self._bytes_used += ENTRY_OVERHEAD_BYTES
+            for blob in (output.stdout_blob, output.stderr_blob):
+                self._ref_blob(blob)
+            while self._entries and (self._bytes_used > self.max_bytes or
+                                     (self.max_entries is not None and len(self._entries) > self.max_entries)):
+                oldest = next(iter(self._entries))
+                if oldest is requirements_set and len(self._entries) == 1:
+                    break # Never evict the entry just stored
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _ref_blob(self, blob: OutputBlob):
+        slot = self._blobs.get(blob.digest)
+        if slot is None:
+            self._blobs[blob.digest] = [blob, 1]
+            self._bytes_used += blob.compressed_size
+        else:
+            slot[1] += 1
+
+    def _unref_blob(self, blob: OutputBlob):
+        slot = self._blobs.get(blob.digest)
+        if slot is None:
+            return
+        slot[1] -= 1
+        if slot[1] <= 0:
+            del self._blobs[blob.digest]
+            self._bytes_used -= blob.compressed_size
+
+    def _remove(self, requirements_set: FrozenSet[Requirement]):
+        entry = self._entries.pop(requirements_set)
+        self._bytes_used -= ENTRY_OVERHEAD_BYTES
+        for blob in (entry.output.stdout_blob, entry.output.stderr_blob):
+            self._unref_blob(blob)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._blobs.clear()
+            self._bytes_used = 0
+            self.hits = self.misses = self.evictions = self.blob_dedup_hits = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            raw_bytes = sum(slot[0].raw_size for slot in self._blobs.values())
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "blobs": len(self._blobs),
+                "bytes_used": self._bytes_used,
+                "raw_output_bytes": raw_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "blob_dedup_hits": self.blob_dedup_hits,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+EVAL_CACHE = EvalCache(max_bytes=config.EVAL_CACHE_MAX_BYTES, max_entries=config.EVAL_CACHE_MAX_ENTRIES)
+
+# Optional on-disk cache shared across runs and processes (see enable_persistent_cache)
+PERSISTENT_CACHE: Optional[PersistentEvalCache] = None
+PERSISTENT_CACHE_FINGERPRINT: str = ""
+PERSISTENT_HITS = 0
+
+# Pins the compiler resolved per state (complete on success, partial on failure), for warm-starting child compiles
+RESOLVED_PINS: "OrderedDict[FrozenSet[Requirement], Dict[str, str]]" = OrderedDict()
+_RESOLVED_PINS_LOCK = threading.Lock()
+
+# Parsed ConflictInfo per conflict signature, shared by the regex and LLM parsers (see utils/conflict_signature.py)
+SIGNATURE_CACHE = ConflictSignatureCache(max_entries=config.CONFLICT_SIGNATURE_CACHE_MAX_ENTRIES)
 
-def store_pip_compile_result(requirements_set: FrozenSet['Requirement'], result: 'ConflictInfo'):
-    PIP_COMPILE_CACHE[requirements_set] = result
+# Failures produced by PipCompilerService itself rather than by resolution; never persisted
+TRANSIENT_FAILURE_PREFIXES = (
+    "Error: pip-compile timed out.",
+    "Error: pip-compile cancelled.",
+    "Unexpected pip-compile error",
+    "CRITICAL: pip-compile command",
+)
+# Written by the resolver budgets (PIP_COMPILE_MAX_BACKTRACK_ROUNDS, INPROCESS_RESOLVER_MAX_ROUNDS; pip's own round
+# limit says the same): the run gave up before proving anything, so the failure is inconclusive, not a conflict
+RESOLUTION_TOO_DEEP_MARKER = "ResolutionTooDeep"
+
+
+def configure_eval_cache(max_bytes: int, max_entries: Optional[int] = None):
+    with EVAL_CACHE._lock:
+        EVAL_CACHE.max_bytes = max_bytes
+        EVAL_CACHE.max_entries = max_entries
 
 def clear_pip_compile_cache():
-    PIP_COMPILE_CACHE.clear()
-    FULL_EVAL_CACHE.clear()
+    """Clears the in-process cache only; the persistent cache survives on purpose."""
+    global PERSISTENT_HITS
+    EVAL_CACHE.clear()
+    SIGNATURE_CACHE.clear()
+    with _RESOLVED_PINS_LOCK:
+        RESOLVED_PINS.clear()
+    PERSISTENT_HITS = 0
+
+def enable_persistent_cache(db_path: str, python_executable: str, index_fingerprint: str = "",
+                            max_bytes: int = 512 * 1024 * 1024, max_age_seconds: float = 7 * 24 * 3600,
+                            compiler_backend: Optional[str] = None, local_index_path: Optional[str] = None) -> PersistentEvalCache:
+    """compiler_backend and local_index_path default to the configured ones (see tooling/compiler_factory.py)."""
+    global PERSISTENT_CACHE, PERSISTENT_CACHE_FINGERPRINT
+    compiler_backend = compiler_backend or config.COMPILER_BACKEND
+    if local_index_path is None:
+        local_index_path = (config.LOCAL_PACKAGE_INDEX_PATH or config.PIP_WHEELHOUSE_DIR) if compiler_backend == "in-process" else ""
+    PERSISTENT_CACHE = PersistentEvalCache(db_path, max_bytes=max_bytes, max_age_seconds=max_age_seconds)
+    PERSISTENT_CACHE_FINGERPRINT = compute_environment_fingerprint(python_executable, index_fingerprint,
+                                                                   compiler_backend, local_index_path)
+    return PERSISTENT_CACHE
+
+def disable_persistent_cache():
+    global PERSISTENT_CACHE, PERSISTENT_CACHE_FINGERPRINT
+    PERSISTENT_CACHE = None
+    PERSISTENT_CACHE_FINGERPRINT = ""
+
+def intern_compiler_output(stdout: str, stderr: str) -> CompilerOutput:
+    return EVAL_CACHE.intern_output(stdout, stderr)
+
+def _get_entry(requirements_set: FrozenSet['Requirement']) -> Optional[_CacheEntry]:
+    global PERSISTENT_HITS
+    entry = EVAL_CACHE.get(requirements_set)
+    if entry is None and PERSISTENT_CACHE is not None:
+        persisted = PERSISTENT_CACHE.get(make_cache_key(requirements_set, PERSISTENT_CACHE_FINGERPRINT))
+        if persisted is not None:
+            success, stdout_str, stderr_str, conflict_info = persisted
+            output = EVAL_CACHE.intern_output(stdout_str, stderr_str)
+            conflict_info.attach_output(output)
+            EVAL_CACHE.put(requirements_set, success, output, conflict_info)
+            PERSISTENT_HITS += 1
+            entry = _CacheEntry(success, output, conflict_info)
+    return entry
+
+def get_cached_conflict_info(requirements_set: FrozenSet['Requirement']) -> Optional['ConflictInfo']:
+    """Cached ConflictInfo for a state, without decompressing its compiler output."""
+    entry = _get_entry(requirements_set)
+    return entry.conflict_info if entry is not None else None
+
+def is_evaluated(requirements_set: FrozenSet['Requirement']) -> bool:
+    return EVAL_CACHE.contains(requirements_set)
+
+def get_cached_full_eval(requirements_set: FrozenSet['Requirement']) -> Optional[Tuple[bool, str, str, 'ConflictInfo']]:
+    entry = _get_entry(requirements_set)
+    if entry is None:
+        return None
+    return entry.success, entry.output.stdout, entry.output.stderr, entry.conflict_info
+
+def store_cached_full_eval(requirements_set: FrozenSet['Requirement'], data: Tuple[bool, str, str, 'ConflictInfo']):
+    success, stdout_str, stderr_str, conflict_info = data
+    output = conflict_info.output_ref if conflict_info.output_ref is not None else EVAL_CACHE.intern_output(stdout_str, stderr_str)
+    store_eval(requirements_set, success, output, conflict_info)
+
+def is_transient_failure(success: bool, stdout_str: str, stderr_str: str) -> bool:
+    """True for failures of the compiler run itself (timeout, cancel, crash) rather than a resolution result."""
+    return not success and not stdout_str and stderr_str.startswith(TRANSIENT_FAILURE_PREFIXES)
+
+def is_inconclusive_failure(success: bool, stdout_str: str, stderr_str: str) -> bool:
+    """
+    True for failures that say nothing about the requirement set: transient ones and budget cutoffs. They may be
+    cached for this process, but are never persisted, reused by conflict signature or recorded as unsatisfiable.
+    """
+    return not success and (is_transient_failure(success, stdout_str, stderr_str) or RESOLUTION_TOO_DEEP_MARKER in stderr_str)
+
+def store_eval(requirements_set: FrozenSet['Requirement'], success: bool, output: CompilerOutput, conflict_info: 'ConflictInfo',
+               persist: bool = True):
+    if conflict_info.output_ref is None:
+        conflict_info.attach_output(output)
+    EVAL_CACHE.put(requirements_set, success, output, conflict_info)
+    if persist and PERSISTENT_CACHE is not None:
+        stdout_str, stderr_str = output.stdout, output.stderr
+        if is_inconclusive_failure(success, stdout_str, stderr_str):
+            return
+        PERSISTENT_CACHE.put(make_cache_key(requirements_set, PERSISTENT_CACHE_FINGERPRINT),
+                             (success, stdout_str, stderr_str, conflict_info))
+
+# Kept for callers that only need the ConflictInfo; backed by the same single cache
+def get_cached_pip_compile_result(requirements_set: FrozenSet['Requirement']) -> Optional['ConflictInfo']:
+    return get_cached_conflict_info(requirements_set)
+
+def store_resolved_pins(requirements_set: FrozenSet['Requirement'], pins: Dict[str, str]):
+    """Records {canonical name: version} resolved for requirements_set (kept for the WARM_START_MAX_STATES latest states)."""
+    if not pins:
+        return
+    with _RESOLVED_PINS_LOCK:
+        RESOLVED_PINS[requirements_set] = pins
+        RESOLVED_PINS.move_to_end(requirements_set)
+        while len(RESOLVED_PINS) > config.WARM_START_MAX_STATES:
+            RESOLVED_PINS.popitem(last=False)
+
+def get_resolved_pins(requirements_set: FrozenSet['Requirement']) -> Optional[Dict[str, str]]:
+    with _RESOLVED_PINS_LOCK:
+        return RESOLVED_PINS.get(requirements_set)
+
+def get_signature_conflict_info(signature: str) -> Optional['ConflictInfo']:
+    return SIGNATURE_CACHE.get(signature)
+
+def has_signature_conflict_info(signature: str) -> bool:
+    return signature in SIGNATURE_CACHE
 
-def get_cached_full_eval(requirements_set: FrozenSet['Requirement']) -> Optional[tuple[bool, str, str, 'ConflictInfo']]:
-    return FULL_EVAL_CACHE.get(requirements_set)
+def store_signature_conflict_info(signature: str, conflict_info: 'ConflictInfo'):
+    SIGNATURE_CACHE.put(signature, conflict_info)
 
-def store_cached_full_eval(requirements_set: FrozenSet['Requirement'], data: tuple[bool, str, str, 'ConflictInfo']):
-    FULL_EVAL_CACHE[requirements_set] = data
\ No newline at end of file
+def get_cache_stats() -> Dict[str, float]:
+    stats = EVAL_CACHE.stats()
+    stats["persistent_hits"] = PERSISTENT_HITS
+    signature_stats = SIGNATURE_CACHE.stats()
+    stats["signature_hits"] = signature_stats["hits"]
+    stats["signature_misses"] = signature_stats["misses"]
+    stats["signature_hit_rate"] = signature_stats["hit_rate"]
+    return stats
@@ -5,10 +5,95 @@ import os # For environment variables
 # Basic configuration, can be expanded (e.g., load from .env using python-dotenv)
 DEFAULT_PYTHON_EXECUTABLE = sys.executable
 PIP_COMPILE_TIMEOUT_SECONDS = 120
+# Stop pip-compile as soon as its streamed output holds a complete conflict report
+PIP_COMPILE_EARLY_STOP = os.getenv("PIP_COMPILE_EARLY_STOP", "1") == "1"
+# ... or once it has backtracked this many rounds (reported as ResolutionTooDeep); 0 disables the watchdog
+PIP_COMPILE_MAX_BACKTRACK_ROUNDS = int(os.getenv("PIP_COMPILE_MAX_BACKTRACK_ROUNDS", "100"))
+# Persistent pip HTTP/wheel cache and pip-tools dependency cache shared by every pip-compile run ("" = pip's defaults)
+PIP_COMPILE_CACHE_DIR = os.getenv(
+    "PIP_COMPILE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "dependency_resolver_agent", "pip")
+)
+# Local wheelhouse given to pip-compile as --find-links (pre-warm it with tooling/wheelhouse.py); also the
+# in-process backend's index when LOCAL_PACKAGE_INDEX_PATH is not set
+PIP_WHEELHOUSE_DIR = os.getenv("PIP_WHEELHOUSE_DIR", "")
+PIP_COMPILE_INDEX_URL = os.getenv("PIP_COMPILE_INDEX_URL", "")
+# Resolve from PIP_WHEELHOUSE_DIR only: no package index, no network
+PIP_COMPILE_OFFLINE = os.getenv("PIP_COMPILE_OFFLINE", "0") == "1"
 MAX_ASTAR_ITERATIONS = 50
+# Compiler backend: "pip-compile" (subprocess per node) or "in-process" (resolvelib against LOCAL_PACKAGE_INDEX_PATH)
+COMPILER_BACKEND = os.getenv("COMPILER_BACKEND", "pip-compile")
+# Directory of wheels / PEP 658 .metadata files used by the in-process backend
+LOCAL_PACKAGE_INDEX_PATH = os.getenv("LOCAL_PACKAGE_INDEX_PATH", "")
+INPROCESS_RESOLVER_MAX_ROUNDS = int(os.getenv("INPROCESS_RESOLVER_MAX_ROUNDS", "2000"))
+# Number of pip-compile workers used to evaluate the A* frontier in parallel (1 = serial search)
+DEFAULT_SOLVE_JOBS = int(os.getenv("SOLVE_JOBS", "1"))
+# Batch mode (batch_runner.py): global cap on compiles running at the same time across all solves
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 4)))
+# How often a running pip-compile checks whether it has been cancelled
+PIP_COMPILE_CANCEL_POLL_SECONDS = 0.2
+
+# In-memory evaluation cache: LRU bounded by compressed output bytes (and optionally entry count)
+EVAL_CACHE_MAX_BYTES = int(os.getenv("EVAL_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+EVAL_CACHE_MAX_ENTRIES = int(os.environ["EVAL_CACHE_MAX_ENTRIES"]) if os.getenv("EVAL_CACHE_MAX_ENTRIES") else None
+
+# Reuse the parsed ConflictInfo of any earlier failure whose normalised pip output (conflict signature) is the same
+CONFLICT_SIGNATURE_CACHE_ENABLED = os.getenv("CONFLICT_SIGNATURE_CACHE_ENABLED", "1") == "1"
+CONFLICT_SIGNATURE_CACHE_MAX_ENTRIES = int(os.getenv("CONFLICT_SIGNATURE_CACHE_MAX_ENTRIES", "4096"))
+
+# Warm start: keep the (partial) pins each compile resolved and seed a node's compile with its closest ancestor's pins
+WARM_START_ENABLED = os.getenv("WARM_START_ENABLED", "1") == "1"
+WARM_START_MAX_STATES = int(os.getenv("WARM_START_MAX_STATES", "4096"))
+
+# A* heuristic: "legacy", "admissible" (optimal fixes) or opt-in "weighted" (fewer compiles, cost within
+# HEURISTIC_WEIGHT x optimal). HEURISTIC_WEIGHT is the only search weight and only applies to "weighted"
+HEURISTIC_MODE = os.getenv("HEURISTIC_MODE", "admissible")
+HEURISTIC_WEIGHT = float(os.getenv("HEURISTIC_WEIGHT", "1.5"))
+# Search strategy (agent_core/search_strategies.py): "astar", "greedy", "beam" or "memory-bounded"
+SEARCH_STRATEGY = os.getenv("SEARCH_STRATEGY", "astar")
+SEARCH_BEAM_WIDTH = int(os.getenv("SEARCH_BEAM_WIDTH", "8"))         # beam: nodes kept per level
+SEARCH_MAX_NODES = int(os.getenv("SEARCH_MAX_NODES", "2000"))        # memory-bounded: hard cap on queued nodes
+SEARCH_MAX_CLOSED = int(os.getenv("SEARCH_MAX_CLOSED", "20000"))     # memory-bounded: expanded states remembered (LRU)
+# Anytime search (Orchestrator.solve_anytime): wall-clock budget per solve (0 = none) and decreasing weights per pass
+SOLVE_TIME_BUDGET_SECONDS = float(os.getenv("SOLVE_TIME_BUDGET_SECONDS", "0"))
+ANYTIME_WEIGHTS = tuple(float(w) for w in os.getenv("ANYTIME_WEIGHTS", "").split(",") if w.strip()) # e.g. "3,2,1.5,1"
+
+# Logging (utils/logger.py): level when verbose output is off, one JSON object per line, append to a file instead of stdout
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING")
+LOG_JSON = os.getenv("LOG_JSON", "0") == "1"
+LOG_FILE = os.getenv("LOG_FILE", "")
+
+# Per-phase timings and counters of the solve hot path (utils/tracing.py); spans kept per captured solve at most
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") == "1"
+TRACE_MAX_EVENTS = int(os.getenv("TRACE_MAX_EVENTS", "200000"))
+# main.py: write <test case>-summary.json and <test case>-trace.json (Chrome trace / speedscope) here ("" = off)
+TRACE_OUTPUT_DIR = os.getenv("TRACE_OUTPUT_DIR", "")
+
+# Reject states that local package metadata (METADATA_INDEX_PATH) already proves infeasible, without compiling
+FEASIBILITY_PRECHECK_ENABLED = os.getenv("FEASIBILITY_PRECHECK_ENABLED", "1") == "1"
+
+# Infer outcomes from known (un)satisfiable subsets/supersets instead of compiling
+SUBSUMPTION_INDEX_ENABLED = os.getenv("SUBSUMPTION_INDEX_ENABLED", "1") == "1"
+
+# Persistent evaluation cache (shared across runs and processes)
+PERSISTENT_CACHE_ENABLED = os.getenv("PERSISTENT_CACHE_ENABLED", "1") == "1"
+PERSISTENT_CACHE_PATH = os.getenv(
+    "PERSISTENT_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "dependency_resolver_agent", "eval_cache.sqlite3")
+)
+PERSISTENT_CACHE_MAX_BYTES = int(os.getenv("PERSISTENT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+PERSISTENT_CACHE_MAX_AGE_SECONDS = float(os.getenv("PERSISTENT_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+# Change (e.g. to an index snapshot date) to invalidate results computed against another package index
+PERSISTENT_CACHE_INDEX_FINGERPRINT = os.getenv("PERSISTENT_CACHE_INDEX_FINGERPRINT", "")
 
 # PyPI service
 SIMULATED_PYPI_VERSIONS_CONFIG_KEY = "SIMULATED_PYPI_VERSIONS"
+# Prebuilt offline metadata index (see tooling/metadata_index.py); replaces SIMULATED_PYPI_VERSIONS when set
+METADATA_INDEX_PATH = os.getenv("METADATA_INDEX_PATH", "")
+# LRU bounds of the PyPIService memos (one service is shared by every solve of a batch): specifier filters and
+# versions-to-try results per package, and parsed Requires-Dist per release
+PYPI_MEMO_MAX_ENTRIES = int(os.getenv("PYPI_MEMO_MAX_ENTRIES", "512"))
+PYPI_DEPENDENCY_CACHE_MAX_ENTRIES = int(os.getenv("PYPI_DEPENDENCY_CACHE_MAX_ENTRIES", "65536"))
 
 # --- LLM Configuration ---
 # Replace with your actual OpenRouter API Key or set as environment variable
@@ -20,8 +105,16 @@ LLM_MODEL_FOR_CONFLICT_PARSING = os.getenv("LLM_MODEL_FOR_CONFLICT_PARSING", "mi
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.1"))
 LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
 LLM_REQUEST_TIMEOUT = int(os.getenv("LLM_REQUEST_TIMEOUT", "60")) # Seconds for LLM API call
+# Any OpenAI-compatible endpoint (e.g. a local fake server for tests); OpenRouter by default
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://openrouter.ai/api/v1")
+# LLM calls in flight at once across all searches, and the deadline of one parse (including the wait for a slot)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_PARSE_DEADLINE_SECONDS = float(os.getenv("LLM_PARSE_DEADLINE_SECONDS", "30"))
+# Approximate token budget for the pip output excerpt put into the prompt
+LLM_PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "1500"))
 
 
 # --- Feature Flags ---
 # Set to True to use LLM parser. If False or LLM fails, RegexParser will be used as fallback.
-USE_LLM_PARSER = True
\ No newline at end of file
+# When off, the LLM stack (langchain, pydantic, OpenAI client) is never imported.
+USE_LLM_PARSER = os.getenv("USE_LLM_PARSER", "1") == "1"
\ No newline at end of file
@@ -0,0 +1,142 @@
+# dependency_resolver_agent/utils/conflict_signature.py
+"""
+Conflict signatures: pip-compile output reduced to what identifies the failure, without temp paths,
+timings, requirement-file line numbers or the versions of unrelated pins. Different requirement sets
+often fail with the same signature; their parsed ConflictInfo is then reused instead of running the
+regex or LLM parser again.
+"""
+import hashlib
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, FrozenSet, List, Optional
+
+from dependency_resolver_agent.data_models import Requirement, ConflictInfo
+
+CONFLICT_REPORT_HEADER = "the conflict is caused by:"
+
+_TEMP_PATH = re.compile(
+    r"[^\s'\"()]*pip_resolve_[^\s'\"()]*|" + re.escape(tempfile.gettempdir()) + r"[\\/][^\s'\"()]*"
+)
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?")
+_DURATION = re.compile(r"\b\d+(?:\.\d+)?\s?(?:ms|s|secs?|seconds?)\b")
+_ADDRESS = re.compile(r"\b0x[0-9a-fA-F]{6,}\b")
+_LINE_REF = re.compile(r"\(line \d+\)")
+# "ERROR: Cannot install a==1.0 and b==2.0 because ..." lists every requested pin; only the names identify the failure
+_CANNOT_INSTALL = re.compile(r"Cannot install (.*?) because")
+_SPECIFIER = re.compile(r"\s*(?:===?|[<>!~]=?)[^\s,]*(?:,\s*(?:===?|[<>!~]=?)[^\s,]*)*")
+_RELEVANT_LINE = re.compile(
+    r"ERROR:|Cannot install|depends on|The user requested|is required by|Could not find a version|"
+    r"No matching distribution|ResolutionImpossible|ResolutionTooDeep|requires a different Python",
+    re.IGNORECASE
+)
+
+
+def _normalise_line(line: str) -> str:
+    cannot_install = _CANNOT_INSTALL.search(line)
+    if cannot_install:
+        names = sorted({_SPECIFIER.sub("", part).strip().lower() for part in cannot_install.group(1).split(" and ")})
+        line = f"{line[:cannot_install.start(1)]}{' and '.join(names)}{line[cannot_install.end(1):]}"
+    line = _TEMP_PATH.sub("<tmp>", line)
+    line = _TIMESTAMP.sub("<time>", line)
+    line = _ADDRESS.sub("<addr>", line)
+    line = _LINE_REF.sub("(line #)", line)
+    line = _DURATION.sub("<duration>", line)
+    return " ".join(line.split())
+
+
+def normalise_compiler_output(stdout: str, stderr: str) -> List[str]:
+    """The lines that describe the failure (conflict report and error lines), normalised and de-duplicated."""
+    lines = f"{stdout}\n{stderr}".splitlines()
+    selected: Dict[str, None] = {}
+    in_report = False
+    for line in lines:
+        if CONFLICT_REPORT_HEADER in line.lower():
+            in_report = True
+        elif in_report and not line.strip():
+            in_report = False
+        if in_report or _RELEVANT_LINE.search(line):
+            selected.setdefault(_normalise_line(line))
+    if not selected: # Nothing recognisable; fall back to the whole (normalised) output
+        selected = dict.fromkeys(_normalise_line(line) for line in lines if line.strip())
+    return list(selected)
+
+
+def conflict_signature(stdout: str, stderr: str, direct_requirements: FrozenSet[Requirement]) -> str:
+    """
+    Stable digest of a failure. The names of the direct requirements are part of it because the parsers
+    report which of them are involved.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(",".join(sorted({r.name.lower() for r in direct_requirements})).encode("utf-8"))
+    for line in normalise_compiler_output(stdout, stderr):
+        digest.update(b"\n")
+        digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ConflictSignatureCache:
+    """LRU map from conflict signature to the ConflictInfo the first parse of that failure produced."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ConflictInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _detached_copy(conflict_info: ConflictInfo) -> ConflictInfo:
+        # Each state gets its own object; the compiler output is attached by the caller
+        return replace(
+            conflict_info,
+            error_message="",
+            involved_direct_packages=set(conflict_info.involved_direct_packages),
+            sub_dependency_culprits=list(conflict_info.sub_dependency_culprits),
+            conflicting_constraints=list(conflict_info.conflicting_constraints),
+            output_ref=None
+        )
+
+    def get(self, signature: str) -> Optional[ConflictInfo]:
+        with self._lock:
+            conflict_info = self._entries.get(signature)
+            if conflict_info is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(signature)
+            self.hits += 1
+        return self._detached_copy(conflict_info)
+
+    def put(self, signature: str, conflict_info: ConflictInfo):
+        stored = self._detached_copy(conflict_info)
+        with self._lock:
+            self._entries[signature] = stored
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def __contains__(self, signature: str) -> bool:
+        # Presence check that does not touch LRU order or hit/miss statistics
+        with self._lock:
+            return signature in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
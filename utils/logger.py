@@ -1,10 +1,118 @@
 # dependency_resolver_agent/utils/logger.py
+"""
+Levelled logging on top of the standard logging module. Modules log through get_logger(__name__) with
+%-style arguments, which are only formatted when the record's level is enabled; an argument that is
+expensive to compute is wrapped in lazy(func, *args) so it is not even computed otherwise.
+
+Output goes to stdout (whatever sys.stdout is at the time, so redirect_stdout still works) or LOG_FILE,
+as plain messages or, with LOG_JSON=1, one JSON object per line carrying level, logger, process, thread
+and any `extra` fields. Handlers lock around each write, and every record is a single write to a file
+opened for appending, so threads and processes sharing LOG_FILE do not interleave lines.
+"""
+import json
+import logging
+import sys
+from typing import Any, Callable, Optional
+
+from dependency_resolver_agent.utils import config_manager as config
+
+ROOT_LOGGER_NAME = "dependency_resolver_agent"
+# True while debug output is on; a cheap guard for call sites that would do real work just to log
 ENABLE_VERBOSE_LOGGING = False
 
-def log_verbose(message: str):
-    if ENABLE_VERBOSE_LOGGING:
-        print(message)
+_package_logger = logging.getLogger(ROOT_LOGGER_NAME)
+_base_level = logging.WARNING
 
-def set_verbose_logging(enable: bool):
+
+class lazy:
+    """Deferred log argument: func(*args) is only called if the message is formatted."""
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args))
+
+    def __repr__(self) -> str:
+        return repr(self.func(*self.args))
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to the current sys.stdout rather than the one seen at configuration time."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, _stream):
+        pass
+
+
+class JsonFormatter(logging.Formatter):
+    # Attributes every LogRecord has; anything else on a record came from `extra`
+    _STANDARD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage().strip(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in self._STANDARD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def configure_logging(level: Optional[str] = None, json_output: Optional[bool] = None,
+                      log_file: Optional[str] = None) -> logging.Logger:
+    """(Re)configures the package logger; defaults come from LOG_LEVEL, LOG_JSON and LOG_FILE."""
+    global _base_level
+    level = level or config.LOG_LEVEL
+    json_output = config.LOG_JSON if json_output is None else json_output
+    log_file = config.LOG_FILE if log_file is None else log_file
+    _base_level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+    if not isinstance(_base_level, int):
+        raise ValueError(f"Unknown log level '{level}'")
+    for handler in list(_package_logger.handlers):
+        _package_logger.removeHandler(handler)
+        handler.close()
+    handler = logging.FileHandler(log_file, mode="a", encoding="utf-8", delay=True) if log_file else _StdoutHandler()
+    handler.setFormatter(JsonFormatter() if json_output else logging.Formatter("%(message)s"))
+    _package_logger.addHandler(handler)
+    _package_logger.propagate = False # Already handled here; the root logger would print it again
+    _set_level(logging.DEBUG if ENABLE_VERBOSE_LOGGING else _base_level)
+    return _package_logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    if name != ROOT_LOGGER_NAME and not name.startswith(ROOT_LOGGER_NAME + "."):
+        name = f"{ROOT_LOGGER_NAME}.{name}"
+    return logging.getLogger(name)
+
+
+def _set_level(level: int):
     global ENABLE_VERBOSE_LOGGING
-    ENABLE_VERBOSE_LOGGING = enable
\ No newline at end of file
+    _package_logger.setLevel(level)
+    ENABLE_VERBOSE_LOGGING = level <= logging.DEBUG
+
+
+def set_verbose_logging(enable: bool):
+    """Debug output on, or back to the configured LOG_LEVEL."""
+    _set_level(logging.DEBUG if enable else _base_level)
+
+
+def log_verbose(message: str, *args: Any):
+    """Debug message on the package logger (prefer a module logger from get_logger)."""
+    _package_logger.debug(message, *args)
+
+
+configure_logging()
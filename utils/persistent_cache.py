@@ -0,0 +1,234 @@
+# dependency_resolver_agent/utils/persistent_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from dependency_resolver_agent.data_models import Requirement, ConflictInfo, SpecifierSet, InvalidSpecifier
+from dependency_resolver_agent.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Part of every key, so bumping it orphans all earlier entries (the size/age eviction reclaims them). Bump it whenever
+# the stored format or the parser semantics change: the evals columns, the ConflictInfo JSON, how a conflict is
+# parsed from pip output, or which failures get stored.
+# 2: ConflictInfo constraint fields, multi-culprit parses, raw outputs rebuilt from compressed references,
+#    inconclusive (ResolutionTooDeep) failures no longer stored, backend and local index in the key
+CACHE_SCHEMA_VERSION = 2
+
+# Environment variables that change which distributions pip-compile can see
+INDEX_ENV_VARS = ("PIP_INDEX_URL", "PIP_EXTRA_INDEX_URL", "PIP_FIND_LINKS", "PIP_NO_INDEX", "PIP_PRE")
+# This agent's own index settings (see config_manager); only part of the fingerprint when set
+COMPILER_INDEX_ENV_VARS = ("PIP_COMPILE_INDEX_URL", "PIP_WHEELHOUSE_DIR", "PIP_COMPILE_OFFLINE")
+
+_PYTHON_VERSION_MEMO: Dict[str, str] = {}
+
+
+def _canonical_name(name: str) -> str:
+    # PEP 503 normalisation, so "Flask" and "flask" share a key
+    return "-".join(name.replace("_", "-").replace(".", "-").lower().split("-"))
+
+
+def _canonical_specifier(specifier: str) -> str:
+    if not specifier:
+        return ""
+    try:
+        # SpecifierSet orders its clauses, so ">=1,<2" and "<2, >=1" share a key
+        return str(SpecifierSet(specifier))
+    except InvalidSpecifier:
+        return specifier.replace(" ", "")
+
+
+def canonical_requirements_text(requirements_set: Iterable[Requirement]) -> str:
+    return "\n".join(sorted(f"{_canonical_name(r.name)}{_canonical_specifier(r.specifier)}" for r in requirements_set))
+
+
+def get_python_version(python_executable: str) -> str:
+    """Returns the full version string of the interpreter pip-compile resolves for (memoised)."""
+    if python_executable in _PYTHON_VERSION_MEMO:
+        return _PYTHON_VERSION_MEMO[python_executable]
+    if os.path.realpath(python_executable) == os.path.realpath(sys.executable):
+        version = sys.version.split()[0]
+    else:
+        try:
+            version = subprocess.run(
+                [python_executable, "-c", "import sys; print(sys.version.split()[0])"],
+                capture_output=True, text=True, check=True, timeout=30
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            version = f"unknown:{python_executable}"
+    _PYTHON_VERSION_MEMO[python_executable] = version
+    return version
+
+
+def compute_environment_fingerprint(python_executable: str, index_fingerprint: str = "", compiler_backend: str = "",
+                                    local_index_path: str = "") -> str:
+    """
+    Fingerprint of everything besides the requirement set that affects a compile result: interpreter version,
+    compiler backend (pip-compile and the in-process resolver word and bound their failures differently),
+    index configuration, the in-process backend's local index, and an optional caller-supplied snapshot id.
+    """
+    parts = [f"schema={CACHE_SCHEMA_VERSION}", f"python={get_python_version(python_executable)}", f"platform={sys.platform}",
+             f"backend={compiler_backend}", f"local_index={os.path.abspath(local_index_path) if local_index_path else ''}"]
+    parts.extend(f"{var}={os.environ.get(var, '')}" for var in INDEX_ENV_VARS)
+    parts.extend(f"{var}={os.environ[var]}" for var in COMPILER_INDEX_ENV_VARS if os.environ.get(var))
+    parts.append(f"index={index_fingerprint}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def make_cache_key(requirements_set: FrozenSet[Requirement], environment_fingerprint: str) -> str:
+    payload = environment_fingerprint + "\n" + canonical_requirements_text(requirements_set)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _conflict_info_to_json(info: ConflictInfo) -> str:
+    return json.dumps({
+        "is_conflict": info.is_conflict,
+        "error_message": info.error_message,
+        "involved_direct_packages": sorted(info.involved_direct_packages),
+        "sub_dependency_culprit": list(info.sub_dependency_culprit) if info.sub_dependency_culprit else None,
+        "sub_dependency_culprits": [list(c) for c in info.sub_dependency_culprits],
+        "conflicting_constraints": [list(c) for c in info.conflicting_constraints],
+    })
+
+
+def _conflict_info_from_json(raw: str) -> ConflictInfo:
+    data = json.loads(raw)
+    culprit = data.get("sub_dependency_culprit")
+    return ConflictInfo(
+        is_conflict=data["is_conflict"],
+        error_message=data.get("error_message", ""),
+        involved_direct_packages=set(data.get("involved_direct_packages", [])),
+        sub_dependency_culprit=tuple(culprit) if culprit else None,
+        sub_dependency_culprits=[tuple(c) for c in data.get("sub_dependency_culprits", [])],
+        conflicting_constraints=[tuple(c) for c in data.get("conflicting_constraints", [])]
+    )
+
+
+class PersistentEvalCache:
+    """
+    SQLite-backed store of full evaluations (success, stdout, stderr, ConflictInfo), shared across runs
+    and processes. Entries are keyed by make_cache_key() and evicted by age and by total stored size.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int, max_age_seconds: float, evict_every: int = 64):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._writes_since_evict = 0
+        self._counter_lock = threading.Lock()
+
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS evals ("
+                " key TEXT PRIMARY KEY,"
+                " success INTEGER NOT NULL,"
+                " stdout BLOB NOT NULL,"
+                " stderr BLOB NOT NULL,"
+                " conflict_info TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS evals_accessed_at ON evals(accessed_at)")
+        self.evict()
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL") # Readers do not block the writer (other processes included)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[bool, str, str, ConflictInfo]]:
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT success, stdout, stderr, conflict_info, created_at FROM evals WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            success, stdout_blob, stderr_blob, info_json, created_at = row
+            now = time.time()
+            if now - created_at > self.max_age_seconds:
+                conn.execute("DELETE FROM evals WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE evals SET accessed_at = ? WHERE key = ?", (now, key))
+            return (
+                bool(success),
+                zlib.decompress(stdout_blob).decode("utf-8"),
+                zlib.decompress(stderr_blob).decode("utf-8"),
+                _conflict_info_from_json(info_json)
+            )
+        except (sqlite3.Error, zlib.error, ValueError, KeyError) as e:
+            log.debug("[PersistentEvalCache] Read failed for %s: %s: %s", key[:12], type(e).__name__, e)
+            return None
+
+    def put(self, key: str, data: Tuple[bool, str, str, ConflictInfo]):
+        success, stdout_str, stderr_str, info = data
+        stdout_blob = zlib.compress(stdout_str.encode("utf-8"))
+        stderr_blob = zlib.compress(stderr_str.encode("utf-8"))
+        info_json = _conflict_info_to_json(info)
+        size = len(stdout_blob) + len(stderr_blob) + len(info_json)
+        now = time.time()
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO evals (key, success, stdout, stderr, conflict_info, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, int(success), stdout_blob, stderr_blob, info_json, size, now, now)
+            )
+        except sqlite3.Error as e:
+            log.debug("[PersistentEvalCache] Write failed for %s: %s: %s", key[:12], type(e).__name__, e)
+            return
+
+        with self._counter_lock:
+            self._writes_since_evict += 1
+            run_eviction = self._writes_since_evict >= self.evict_every
+            if run_eviction:
+                self._writes_since_evict = 0
+        if run_eviction:
+            self.evict()
+
+    def evict(self):
+        """Drops entries older than max_age_seconds, then least recently used entries until under max_bytes."""
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM evals WHERE created_at < ?", (time.time() - self.max_age_seconds,))
+            total_size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM evals").fetchone()[0]
+            if total_size > self.max_bytes:
+                to_free = total_size - self.max_bytes
+                freed = 0
+                doomed = []
+                for key, size in conn.execute("SELECT key, size FROM evals ORDER BY accessed_at ASC"):
+                    doomed.append((key,))
+                    freed += size
+                    if freed >= to_free:
+                        break
+                conn.executemany("DELETE FROM evals WHERE key = ?", doomed)
+                log.debug("[PersistentEvalCache] Evicted %s entries (%s bytes).", len(doomed), freed)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            log.debug("[PersistentEvalCache] Eviction failed: %s: %s", type(e).__name__, e)
+
+    def clear(self):
+        self._conn().execute("DELETE FROM evals")
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM evals").fetchone()[0]
@@ -0,0 +1,235 @@
+# dependency_resolver_agent/utils/tracing.py
+"""
+Low-overhead instrumentation of the solve hot path.
+Every recorded phase updates an aggregate (count, total, max duration) and named counters count events
+such as cache hits; both are always on unless TRACING_ENABLED=0 (one clock read and a dict update per
+call). Individual spans, needed for a timeline, are only kept inside capture():
+
+    with tracing.capture() as trace:
+        orchestrator.solve(...)
+    trace.write_summary("solve-summary.json")
+    trace.write_chrome_trace("solve-trace.json") # chrome://tracing, Perfetto or speedscope
+
+Hot loops call record(phase, start) with start = clock(); coarser sections use `with span(phase):`.
+Aggregates are process-wide, so concurrent solves (batch mode) share them.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from dependency_resolver_agent.utils import config_manager as config
+
+clock = time.perf_counter_ns
+get_ident = threading.get_ident
+
+T = TypeVar("T")
+
+
+class Tracer:
+    """
+    Phase aggregates, counters and (when record_events) spans. Each thread writes only to its own tables,
+    so recording takes no lock; readers merge the per-thread tables.
+    """
+
+    def __init__(self, record_events: bool = False, max_events: int = config.TRACE_MAX_EVENTS):
+        self.origin_ns = clock()
+        self.end_ns: Optional[int] = None # Set when a capture ends
+        self.record_events = record_events
+        self.max_events = max_events
+        # thread id -> (thread name, {phase: [count, total ns, max ns]}, {counter: value}, [(phase, start ns, duration ns)])
+        self._threads: Dict[int, Tuple[str, Dict[str, List[int]], Dict[str, int], List[Tuple[str, int, int]]]] = {}
+        self._merged: Tuple[Dict[str, List[int]], Dict[str, int]] = ({}, {}) # From merge()
+        self._merge_lock = threading.Lock()
+
+    def _thread_tables(self):
+        tables = self._threads.get(get_ident())
+        if tables is None:
+            tables = (threading.current_thread().name, {}, {}, [])
+            self._threads[get_ident()] = tables
+        return tables
+
+    def add(self, phase: str, start_ns: int, duration_ns: int):
+        tables = self._threads.get(get_ident()) or self._thread_tables()
+        stat = tables[1].get(phase)
+        if stat is None:
+            tables[1][phase] = stat = [0, 0, 0]
+        stat[0] += 1
+        stat[1] += duration_ns
+        if duration_ns > stat[2]:
+            stat[2] = duration_ns
+        if self.record_events and len(tables[3]) < self.max_events:
+            tables[3].append((phase, start_ns, duration_ns))
+
+    def count(self, name: str, amount: int = 1):
+        counters = (self._threads.get(get_ident()) or self._thread_tables())[2]
+        counters[name] = counters.get(name, 0) + amount
+
+    def merge(self, other: 'Tracer'):
+        """Adds other's aggregates and counters (not its spans)."""
+        phases, counters = other._totals()
+        with self._merge_lock:
+            for phase, (count, total, longest) in phases.items():
+                stat = self._merged[0].setdefault(phase, [0, 0, 0])
+                stat[0] += count
+                stat[1] += total
+                stat[2] = max(stat[2], longest)
+            for name, amount in counters.items():
+                self._merged[1][name] = self._merged[1].get(name, 0) + amount
+
+    def _totals(self) -> Tuple[Dict[str, List[int]], Dict[str, int]]:
+        with self._merge_lock:
+            phases = {phase: list(stat) for phase, stat in self._merged[0].items()}
+            counters = dict(self._merged[1])
+        for _name, thread_phases, thread_counters, _events in list(self._threads.values()):
+            for phase, (count, total, longest) in list(thread_phases.items()):
+                stat = phases.setdefault(phase, [0, 0, 0])
+                stat[0] += count
+                stat[1] += total
+                stat[2] = max(stat[2], longest)
+            for name, amount in list(thread_counters.items()):
+                counters[name] = counters.get(name, 0) + amount
+        return phases, counters
+
+    def _events(self) -> List[Tuple[str, int, List[Tuple[str, int, int]]]]:
+        """[(thread name, thread id, spans)]; each thread keeps its first max_events spans."""
+        threads = []
+        for thread_id, (name, _phases, _counters, events) in list(self._threads.items()):
+            if events:
+                threads.append((name, thread_id, list(events)))
+        return threads
+
+    def summary(self) -> Dict[str, object]:
+        phases, counters = self._totals()
+        # Each thread keeps up to max_events spans of its own, so kept and dropped are counted per thread
+        events = dropped_events = 0
+        for _name, thread_phases, _counters, thread_events in list(self._threads.values()):
+            kept = len(thread_events)
+            events += kept
+            if self.record_events:
+                dropped_events += max(0, sum(stat[0] for stat in list(thread_phases.values())) - kept)
+        return {
+            "wall_ms": ((self.end_ns or clock()) - self.origin_ns) / 1e6,
+            "phases": {
+                phase: {"count": count, "total_ms": total / 1e6, "mean_ms": total / count / 1e6, "max_ms": longest / 1e6}
+                for phase, (count, total, longest) in sorted(phases.items(), key=lambda item: -item[1][1])
+            },
+            "counters": dict(sorted(counters.items())),
+            "events": events,
+            "dropped_events": dropped_events,
+        }
+
+    def chrome_trace(self) -> Dict[str, object]:
+        """Trace Event Format ("X" complete events, microseconds); speedscope imports it as well."""
+        pid = os.getpid()
+        threads = self._events()
+        spans = sorted((start_ns, duration_ns, phase, number)
+                       for number, (_name, _thread_id, thread_spans) in enumerate(threads, 1)
+                       for phase, start_ns, duration_ns in thread_spans)
+        trace_events: List[Dict[str, object]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": number, "args": {"name": name}}
+            for number, (name, _thread_id, _spans) in enumerate(threads, 1)
+        ]
+        for start_ns, duration_ns, phase, number in spans:
+            trace_events.append({"name": phase, "cat": phase.split(".", 1)[0], "ph": "X", "pid": pid, "tid": number,
+                                 "ts": (start_ns - self.origin_ns) / 1e3, "dur": duration_ns / 1e3})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def write_summary(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def format_summary(summary: Dict[str, object]) -> List[str]:
+    """Human-readable lines for a summary(): phases by total time, then counters."""
+    lines = []
+    for phase, stat in summary["phases"].items():
+        lines.append(f"  {phase:22s} {stat['count']:7d} x  total {stat['total_ms']:9.1f} ms  "
+                     f"mean {stat['mean_ms']:8.3f} ms  max {stat['max_ms']:8.1f} ms")
+    if summary["counters"]:
+        lines.append("  " + ", ".join(f"{name}={value}" for name, value in summary["counters"].items()))
+    return lines
+
+
+class _Span:
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.phase, self.start)
+
+
+# Process-wide aggregates; replaced for the duration of a capture()
+_tracer: Optional[Tracer] = Tracer() if config.TRACING_ENABLED else None
+
+
+def record(phase: str, start_ns: int):
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add(phase, start_ns, clock() - start_ns)
+
+
+def span(phase: str) -> _Span:
+    return _Span(phase)
+
+
+def count(name: str, amount: int = 1):
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, amount)
+
+
+def traced_iter(phase: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Yields from iterable, recording the time spent producing each item (e.g. a lazy neighbour generator)."""
+    iterator = iter(iterable)
+    while True:
+        start = clock()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            record(phase, start)
+            return
+        record(phase, start)
+        yield item
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def reset():
+    """Starts new process-wide aggregates (no-op when tracing is disabled)."""
+    global _tracer
+    if _tracer is not None:
+        _tracer = Tracer()
+
+
+@contextmanager
+def capture(record_events: bool = True, max_events: int = config.TRACE_MAX_EVENTS) -> Iterator[Tracer]:
+    """
+    Records everything traced inside the block, with individual spans when record_events, into a fresh
+    Tracer, whose aggregates are then added to the process-wide ones. Works even with TRACING_ENABLED=0.
+    """
+    global _tracer
+    previous = _tracer
+    tracer = Tracer(record_events=record_events, max_events=max_events)
+    _tracer = tracer
+    try:
+        yield tracer
+    finally:
+        tracer.end_ns = clock()
+        _tracer = previous
+        if previous is not None:
+            previous.merge(tracer)